@@ -0,0 +1,181 @@
+# backend/admission.py
+"""
+Admission control for expensive endpoints.
+
+Each guarded endpoint (by Flask endpoint name, e.g. "requests.list_requests")
+gets a policy with two limits, checked before the view runs:
+
+  - per-client rate   a token bucket per client (`rate` tokens/s, up to
+                      `burst`). An empty bucket answers 429 with Retry-After
+                      set to when the next token is due.
+  - concurrency       at most `concurrency` requests run at once. Others
+                      queue for up to `queue_timeout_s` and are then shed
+                      with 503 and Retry-After (`retry_after_s`).
+
+Unguarded endpoints never wait, so cheap reads stay fast while an
+expensive one is saturated. A request shed with 503 gets its token back.
+Limits are per process. Counters are served at /api/admin/admission/stats.
+
+Clients are keyed by request.remote_addr. Behind reverse proxies, set
+TRUSTED_PROXY_HOPS to their number: create_app() then wraps the app in
+werkzeug's ProxyFix, and remote_addr becomes the X-Forwarded-For entry the
+outermost trusted proxy added (entries further left are client-supplied and
+ignored). Without it every client behind the proxy shares one bucket, which
+is why ADMISSION_CONTROL is off by default.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, g, jsonify, request
+
+DEFAULT_POLICIES: Dict[str, Dict[str, float]] = {
+    # unpaginated list of every request
+    "requests.list_requests": {"concurrency": 8, "queue_timeout_s": 1.0, "rate": 10, "burst": 40},
+    # unpaginated list of every account
+    "accounts.list_accounts": {"concurrency": 4, "queue_timeout_s": 1.0, "rate": 5, "burst": 20},
+    # password hashing: CPU-bound by design
+    "accounts.create_account": {"concurrency": 2, "queue_timeout_s": 2.0, "rate": 1, "burst": 10},
+}
+MAX_CLIENTS = 10000
+COUNTERS = ("admitted", "rate_limited", "overloaded")
+
+
+class TokenBuckets:
+    """Per-client token buckets; the least recently seen clients are forgotten beyond max_clients."""
+
+    def __init__(self, rate: float, burst: float, max_clients: int = MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client: str) -> float:
+        """Take one token: 0.0 if admitted, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            admitted = tokens >= 1.0
+            if admitted:
+                tokens -= 1.0
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return 0.0 if admitted else (1.0 - tokens) / self.rate
+
+    def refund(self, client: str) -> None:
+        """Give back a token taken by a request that was not served."""
+        with self._lock:
+            if client in self._buckets:
+                tokens, last = self._buckets[client]
+                self._buckets[client] = (min(self.burst, tokens + 1.0), last)
+
+
+class Gate:
+    """One endpoint's limits and counters."""
+
+    def __init__(self, concurrency: int, queue_timeout_s: float = 1.0, rate: Optional[float] = None,
+                 burst: Optional[float] = None, retry_after_s: float = 1.0):
+        self.concurrency = int(concurrency)
+        self.queue_timeout_s = queue_timeout_s
+        self.retry_after_s = retry_after_s
+        self.buckets = TokenBuckets(rate, burst or rate) if rate else None
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.in_flight = self.waiting = 0
+        self.wait_s_total = self.wait_s_max = 0.0
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def admit(self, client: str) -> Tuple[Optional[int], float]:
+        """(None, 0) when admitted (call release() afterwards), else (HTTP status, Retry-After seconds)."""
+        if self.buckets is not None:
+            retry_after = self.buckets.take(client)
+            if retry_after:
+                self._count("rate_limited")
+                return 429, retry_after
+        with self._lock:
+            self.waiting += 1
+        started = time.monotonic()
+        acquired = self._slots.acquire(timeout=self.queue_timeout_s)
+        waited = time.monotonic() - started
+        with self._lock:
+            self.waiting -= 1
+            self.wait_s_total += waited
+            self.wait_s_max = max(self.wait_s_max, waited)
+            if acquired:
+                self.in_flight += 1
+        if not acquired:
+            if self.buckets is not None:
+                self.buckets.refund(client)
+            self._count("overloaded")
+            return 503, self.retry_after_s
+        self._count("admitted")
+        return None, 0.0
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queued = self.counters["admitted"] + self.counters["overloaded"]
+            return {
+                **self.counters,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "concurrency": self.concurrency,
+                "avg_wait_s": round(self.wait_s_total / queued, 4) if queued else None,
+                "max_wait_s": round(self.wait_s_max, 4),
+            }
+
+
+class AdmissionControl:
+    """Gates for the configured endpoints, enforced by before/teardown request hooks."""
+
+    def __init__(self, policies: Dict[str, Dict[str, float]]):
+        self.gates = {endpoint: Gate(**policy) for endpoint, policy in policies.items()}
+
+    @staticmethod
+    def _client() -> str:
+        # The proxy-verified address when TRUSTED_PROXY_HOPS is set (see module docstring)
+        return request.remote_addr or "unknown"
+
+    def _before(self):
+        gate = self.gates.get(request.endpoint)
+        if gate is None or request.method == "OPTIONS":
+            return None
+        status, retry_after = gate.admit(self._client())
+        if status is None:
+            g.admission_gate = gate
+            return None
+        message = "Too many requests" if status == 429 else "Server busy, try again later"
+        resp = jsonify({"error": message})
+        resp.status_code = status
+        resp.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return resp
+
+    @staticmethod
+    def _teardown(_e=None) -> None:
+        gate = g.pop("admission_gate", None)
+        if gate is not None:
+            gate.release()
+
+    def init_app(self, app: Flask) -> "AdmissionControl":
+        app.before_request(self._before)
+        app.teardown_request(self._teardown)
+        app.extensions["admission"] = self
+        return self
+
+    def stats(self) -> Dict[str, Any]:
+        return {endpoint: gate.stats() for endpoint, gate in self.gates.items()}
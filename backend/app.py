@@ -1,11 +1,12 @@
 # backend/app.py
 from __future__ import annotations
+import hashlib
+import os
 import sys
 import sqlite3
 from pathlib import Path
-from flask import Flask, jsonify, g
+from flask import Flask, jsonify
 from flask_cors import CORS
-from pydantic import ValidationError
 
 # -----------------------------
 # Paths & import wiring
@@ -23,17 +24,32 @@ if str(PROJECT_ROOT) not in sys.path:
 if SEED_DIR.exists() and str(SEED_DIR) not in sys.path:
     sys.path.insert(0, str(SEED_DIR))
 
-from seed import import_from_json as seeder  # after sys.path wiring
-from backend.db_session import close_db
+from backend.db_session import close_db, ReplicaRefresher
+from backend.admission import DEFAULT_POLICIES as DEFAULT_ADMISSION_POLICIES, AdmissionControl
 
 # -----------------------------
 # One-shot helpers (schema & seed)
 # -----------------------------
+def _split_sql(sql_text: str):
+    """
+    Split a script into complete statements. Splitting on every ';' would cut
+    CREATE TRIGGER ... BEGIN ...; ... END in pieces, so lines are accumulated
+    until sqlite3 reports a complete statement.
+    """
+    stmt = ""
+    for line in sql_text.splitlines(keepends=True):
+        stmt += line
+        if sqlite3.complete_statement(stmt):
+            if stmt.strip():
+                yield stmt.strip()
+            stmt = ""
+    if stmt.strip():
+        yield stmt.strip()
+
 def _apply_schema_idempotent(conn, sql_text: str):
     """Apply schema; ignore 'already exists' errors to be idempotent."""
     cur = conn.cursor()
-    stmts = [s.strip() for s in sql_text.split(";") if s.strip()]
-    for s in stmts:
+    for s in _split_sql(sql_text):
         try:
             cur.execute(s)
         except sqlite3.OperationalError as e:
@@ -44,33 +60,165 @@ def _apply_schema_idempotent(conn, sql_text: str):
             raise
     conn.commit()
 
+def _bootstrap_fingerprint(schema_path: Path = DB_SQL) -> str:
+    """Hash of the schema plus seed file sizes/mtimes: changes whenever schema or seeds do."""
+    h = hashlib.sha256(schema_path.read_bytes())
+    for path in sorted(SEED_DIR.glob("*.json")):
+        st = path.stat()
+        h.update(f"{path.name}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+def _bootstrap_is_current(conn, fingerprint: str) -> bool:
+    try:
+        row = conn.execute("SELECT value FROM app_meta WHERE key = 'bootstrap'").fetchone()
+    except sqlite3.OperationalError:  # fresh DB: no app_meta table yet
+        return False
+    return row is not None and row[0] == fingerprint
+
 def _ensure_schema_then_seed():
-    """Create/upgrade schema and seed using a single one-off connection."""
+    """
+    Create/upgrade schema and seed using a single one-off connection.
+    Skipped (one indexed lookup) when the DB was already bootstrapped from the
+    same db.sql and seed files, so warm starts do not re-run DDL and seeding.
+    """
     BACKEND_DIR.mkdir(parents=True, exist_ok=True)
     # One-off connection (not request-scoped)
     conn = sqlite3.connect(str(DB_PATH))
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+    # Must precede the WAL switch, which initialises a new file (see backend.maintenance)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+    # WAL: readers (get_read_db) never block the writer and vice versa (persistent per DB file)
+    conn.execute("PRAGMA journal_mode = WAL;")
+
+    fingerprint = _bootstrap_fingerprint()
+    if _bootstrap_is_current(conn, fingerprint):
+        conn.close()
+        return
 
     # 1) Schema
     with open(DB_SQL, "r", encoding="utf-8") as f:
         _apply_schema_idempotent(conn, f.read())
 
-    # 2) Seed (use same connection to avoid 'no such table')
+    # 2) Seed (use same connection to avoid 'no such table'); imported only when needed
+    from seed import import_from_json as seeder
     seeder.run_with_existing_conn(conn, SEED_DIR)
 
+    conn.execute("INSERT OR REPLACE INTO app_meta (key, value) VALUES ('bootstrap', ?)", (fingerprint,))
+    conn.commit()
     conn.close()
 
+def _json_safe_error(err: dict) -> dict:
+    """A pydantic error dict with JSON-safe ctx (a model validator's ctx holds the ValueError it raised)."""
+    if "ctx" not in err:
+        return err
+    ctx = {k: v if isinstance(v, (str, int, float, bool, type(None))) else str(v) for k, v in err["ctx"].items()}
+    return {**err, "ctx": ctx}
+
 # -----------------------------
 # Flask factory
 # -----------------------------
 def create_app():
     app = Flask(__name__)
+    # Idempotency-Key retention, how long a duplicate waits for the first attempt, and
+    # after how long an unfinished attempt (its worker died) may be taken over by a retry
+    app.config.setdefault("IDEMPOTENCY_TTL_SECONDS", 24 * 60 * 60)
+    app.config.setdefault("IDEMPOTENCY_WAIT_SECONDS", 10)
+    app.config.setdefault("IDEMPOTENCY_LEASE_SECONDS", 60)
+    # Operator endpoints (/api/admin/*) are disabled unless ADMIN_TOKEN is set
+    app.config.setdefault("ADMIN_TOKEN", os.environ.get("ADMIN_TOKEN"))
+    app.config.setdefault("EXPORT_DIR", os.environ.get("EXPORT_DIR", str(PROJECT_ROOT / "exports")))
+    # Completed/expired requests older than this move to requests_archive
+    app.config.setdefault("ARCHIVE_AFTER_DAYS", float(os.environ.get("ARCHIVE_AFTER_DAYS", 90)))
+    # Group commit for POST /api/requests/<id>/status: flush every N items or M ms
+    app.config.setdefault("STATUS_BATCH_MAX_ITEMS", 64)
+    app.config.setdefault("STATUS_BATCH_MAX_WAIT_MS", 5)
+    # Read-through cache for accounts/categories/request lists: "sqlite" (default: CACHE_PATH,
+    # shared by the workers on one host), "redis" (CACHE_URL, shared across hosts), "none",
+    # or "memory" (per process: only for single-process runs, other workers would serve stale data)
+    app.config.setdefault("CACHE_BACKEND", os.environ.get("CACHE_BACKEND", "sqlite"))
+    app.config.setdefault("CACHE_URL", os.environ.get("CACHE_URL"))
+    app.config.setdefault("CACHE_PATH", os.environ.get("CACHE_PATH"))
+    app.config.setdefault("CACHE_MAX_ENTRIES", int(os.environ.get("CACHE_MAX_ENTRIES", 1024)))
+    app.config.setdefault("CACHE_TTL_SECONDS", float(os.environ.get("CACHE_TTL_SECONDS", 30)))
+    # Optional read replica for GET endpoints, refreshed with the SQLite backup API
+    app.config.setdefault("READ_REPLICA_PATH", os.environ.get("READ_REPLICA_PATH"))
+    app.config.setdefault("READ_REPLICA_REFRESH_SECONDS", float(os.environ.get("READ_REPLICA_REFRESH_SECONDS", 5)))
+    # Run backend.maintenance in-process every N seconds (disabled when unset)
+    app.config.setdefault("MAINTENANCE_INTERVAL_SECONDS", float(os.environ.get("MAINTENANCE_INTERVAL_SECONDS", 0)) or None)
+    # Where accounts/categories/companies/requests live: "sqlite" (default) or "postgres"
+    app.config.setdefault("STORAGE_BACKEND", os.environ.get("STORAGE_BACKEND", "sqlite"))
+    app.config.setdefault("DATABASE_URL", os.environ.get("DATABASE_URL"))
+    app.config.setdefault("PG_POOL_MIN", int(os.environ.get("PG_POOL_MIN", 1)))
+    app.config.setdefault("PG_POOL_MAX", int(os.environ.get("PG_POOL_MAX", 10)))
+    # Requests partitioned into one SQLite file per region: "none" (default) or "region";
+    # SHARD_MAP ("1:north.db,2:north.db") groups regions into shared files
+    app.config.setdefault("REQUEST_SHARDS", os.environ.get("REQUEST_SHARDS", "none"))
+    app.config.setdefault("SHARD_DIR", os.environ.get("SHARD_DIR"))
+    app.config.setdefault("SHARD_MAP", os.environ.get("SHARD_MAP"))
+    # Reverse proxies in front of the app: remote_addr is then the client address in
+    # X-Forwarded-For as added by the outermost of them (werkzeug ProxyFix)
+    app.config.setdefault("TRUSTED_PROXY_HOPS", int(os.environ.get("TRUSTED_PROXY_HOPS", 0)))
+    # Admission control for expensive endpoints (backend.admission): per-client token
+    # buckets (429) and concurrency limits with a bounded queue wait (503). Clients are
+    # keyed by remote_addr: behind a proxy, set TRUSTED_PROXY_HOPS before turning it on
+    app.config.setdefault("ADMISSION_CONTROL", os.environ.get("ADMISSION_CONTROL", "off") == "on")
+    app.config.setdefault("ADMISSION_POLICIES", DEFAULT_ADMISSION_POLICIES)
+    # Background jobs (python -m backend.jobs): retries, lease, and where messages go:
+    # "file" (JSON lines in JOB_SINK_PATH) or "smtp" (SMTP_HOST:SMTP_PORT)
+    app.config.setdefault("JOB_MAX_ATTEMPTS", int(os.environ.get("JOB_MAX_ATTEMPTS", 5)))
+    app.config.setdefault("JOB_LEASE_SECONDS", int(os.environ.get("JOB_LEASE_SECONDS", 60)))
+    app.config.setdefault("JOB_SINK", os.environ.get("JOB_SINK", "file"))
+    app.config.setdefault("JOB_SINK_PATH", os.environ.get("JOB_SINK_PATH"))
+    app.config.setdefault("SMTP_HOST", os.environ.get("SMTP_HOST", "localhost"))
+    app.config.setdefault("SMTP_PORT", int(os.environ.get("SMTP_PORT", 25)))
+    app.config.setdefault("SMTP_FROM", os.environ.get("SMTP_FROM"))
+    # Near-duplicate detection on create (backend.dedupe): estimated Jaccard similarity
+    # of title + description, among open requests of the same PIN and district
+    app.config.setdefault("DUPLICATE_DETECTION", os.environ.get("DUPLICATE_DETECTION", "on") != "off")
+    app.config.setdefault("DUPLICATE_THRESHOLD", float(os.environ.get("DUPLICATE_THRESHOLD", 0.5)))
+    # Request profiling (backend.profiling): admin requests with X-Profile: 1, plus a
+    # random PROFILE_SAMPLE_RATE of all requests. Off: no hooks at all
+    app.config.setdefault("PROFILING", os.environ.get("PROFILING", "off") == "on")
+    app.config.setdefault("PROFILE_DIR", os.environ.get("PROFILE_DIR", str(PROJECT_ROOT / "profiles")))
+    app.config.setdefault("PROFILE_SAMPLE_RATE", float(os.environ.get("PROFILE_SAMPLE_RATE", 0)))
+    app.config.setdefault("PROFILE_KEEP", int(os.environ.get("PROFILE_KEEP", 50)))
     # CORS for all /api/* endpoints (adjust as needed)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
     # Boot: schema → seed (safe to call at every start)
     _ensure_schema_then_seed()
+    if app.config["STORAGE_BACKEND"] == "postgres":
+        from backend.storage import PG_SCHEMA_SQL, bootstrap_postgres
+        if not app.config["DATABASE_URL"]:
+            raise RuntimeError("STORAGE_BACKEND=postgres requires DATABASE_URL.")
+        bootstrap_postgres(app.config["DATABASE_URL"], _bootstrap_fingerprint(PG_SCHEMA_SQL), SEED_DIR)
+
+    # Per-region request shards: create/upgrade the files, move rows still in surething.db
+    from backend.sharding import bootstrap_shards
+    app.extensions["request_shards"] = bootstrap_shards(app.config, DB_PATH)
+
+    # Keep the read replica fresh (one refresher per process)
+    if app.config["READ_REPLICA_PATH"]:
+        app.extensions["replica_refresher"] = ReplicaRefresher(
+            app.config["READ_REPLICA_PATH"], interval=app.config["READ_REPLICA_REFRESH_SECONDS"]
+        ).start()
+
+    # Periodic ANALYZE/optimize, incremental vacuum and WAL checkpoint (one per process)
+    if app.config["MAINTENANCE_INTERVAL_SECONDS"]:
+        from backend.maintenance import MaintenanceScheduler
+        app.extensions["maintenance"] = MaintenanceScheduler(app.config["MAINTENANCE_INTERVAL_SECONDS"]).start()
+
+    if app.config["TRUSTED_PROXY_HOPS"]:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["TRUSTED_PROXY_HOPS"])
+
+    if app.config["ADMISSION_CONTROL"]:
+        AdmissionControl(app.config["ADMISSION_POLICIES"]).init_app(app)
+
+    if app.config["PROFILING"]:
+        from backend.profiling import Profiler
+        Profiler(app.config["PROFILE_DIR"], app.config["PROFILE_SAMPLE_RATE"], app.config["PROFILE_KEEP"]).init_app(app)
 
     # Close DB per request/app context
     app.teardown_appcontext(close_db)
@@ -79,17 +227,23 @@ def create_app():
     from backend.controllers.accounts_controller import accounts_bp
     from backend.controllers.categories_controller import categories_bp
     from backend.controllers.requests_controller import requests_bp
+    from backend.controllers.districts_controller import districts_bp
+    from backend.controllers.admin_controller import admin_bp
+    from backend.controllers.companies_controller import companies_bp
     app.register_blueprint(accounts_bp, url_prefix="/api/accounts")
     app.register_blueprint(categories_bp, url_prefix="/api/categories")
     app.register_blueprint(requests_bp, url_prefix="/api/requests")
+    app.register_blueprint(districts_bp, url_prefix="/api/districts")
+    app.register_blueprint(admin_bp, url_prefix="/api/admin")
+    app.register_blueprint(companies_bp, url_prefix="/api/companies")
 
     # Global error handlers
-    @app.errorhandler(ValidationError)
-    def handle_validation_error(e):
-        return jsonify({"error": e.errors()}), 400
-
     @app.errorhandler(ValueError)
     def handle_value_error(e):
+        # pydantic.ValidationError subclasses ValueError; matching it here keeps
+        # pydantic out of the import path until a service actually validates.
+        if hasattr(e, "errors") and callable(e.errors):
+            return jsonify({"error": [_json_safe_error(err) for err in e.errors()]}), 400
         return jsonify({"error": str(e)}), 400
 
     @app.errorhandler(404)
@@ -102,7 +256,12 @@ def create_app():
 
     return app
 
-app = create_app()
+def __getattr__(name):
+    """Build the module-level `app` (e.g. `gunicorn backend.app:app`) on first access only."""
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
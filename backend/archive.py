@@ -0,0 +1,85 @@
+# backend/archive.py
+"""
+Archive completed/expired requests into requests_archive.
+
+Runs in bounded batches (one short transaction each), so it can run next to
+the live app, e.g. from cron. With REQUEST_SHARDS=region (same settings as
+the app) every region shard file is archived too, one after the other.
+Whenever rows moved, the shared request-list cache (CACHE_BACKEND) is
+cleared, as the admin endpoint does.
+
+Usage:
+  python -m backend.archive                      # older than 90 days
+  python -m backend.archive --older-than-days 30 --batch-size 1000 --pause 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BACKEND_DIR.parent
+DB_PATH = BACKEND_DIR / "surething.db"
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.export import request_shards
+from backend.repositories.requests_repository import RequestsRepository
+from backend.services.archive_service import ArchiveService
+
+
+def clear_list_cache(config) -> int:
+    """
+    Drop the shared request-list cache (CACHE_BACKEND, as the app configures it),
+    like POST /api/admin/archive: cached lists would show moved rows as live.
+    """
+    from backend.cache import Cache, RequestListCache, make_backend
+
+    config = dict(config)
+    config["CACHE_MAX_ENTRIES"] = int(config.get("CACHE_MAX_ENTRIES", 1024))
+    backend = make_backend(config)
+    if backend is None or not backend.shared:  # none, or this process's own memory
+        return 0
+    return RequestListCache(Cache(backend)).clear()
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Move old completed/expired requests to requests_archive.")
+    p.add_argument("--db", type=Path, default=DB_PATH, help="SQLite DB (default: backend/surething.db)")
+    p.add_argument("--older-than-days", type=float, default=90)
+    p.add_argument("--batch-size", type=int, default=500)
+    p.add_argument("--max-batches", type=int, default=None)
+    p.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    args = p.parse_args(argv)
+
+    try:
+        paths = [args.db, *request_shards(os.environ, args.db)]
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    for path in paths:
+        conn = sqlite3.connect(str(path), isolation_level="IMMEDIATE", timeout=5.0)
+        if path == args.db:
+            conn.execute("PRAGMA foreign_keys = ON;")  # shard files have no parent tables to check
+        try:
+            result = ArchiveService(RequestsRepository(conn)).archive(
+                older_than_days=args.older_than_days,
+                batch_size=args.batch_size,
+                max_batches=args.max_batches,
+                pause_s=args.pause,
+            )
+        finally:
+            conn.close()
+        print(f"✅ {path.name}: archived {result['archived']} request(s) created before {result['cutoff']} "
+              f"in {result['batches']} batch(es), {result['duration_s']}s")
+        if result["archived"]:
+            print(f"🧹 dropped {clear_list_cache(os.environ)} cached request list(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
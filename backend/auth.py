@@ -0,0 +1,38 @@
+# backend/auth.py
+"""
+Minimal gate for operator-only endpoints.
+
+There are no user sessions yet, so admin endpoints require a shared secret in
+the `X-Admin-Token` header that matches app.config["ADMIN_TOKEN"] (taken from
+the ADMIN_TOKEN environment variable). If no token is configured, admin
+endpoints are disabled.
+"""
+from __future__ import annotations
+
+import hmac
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+ADMIN_HEADER = "X-Admin-Token"
+
+
+def is_admin_request() -> bool:
+    """True when the current request carries the configured admin token."""
+    expected = current_app.config.get("ADMIN_TOKEN")
+    given = request.headers.get(ADMIN_HEADER)
+    return bool(expected) and given is not None and hmac.compare_digest(given, expected)
+
+
+def admin_required(view):
+    """Decorator: 403 unless the request carries a valid admin token."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_app.config.get("ADMIN_TOKEN"):
+            return jsonify({"error": "Admin endpoints are disabled (ADMIN_TOKEN not set)"}), 403
+        if not is_admin_request():
+            return jsonify({"error": "Admin token required"}), 403
+        return view(*args, **kwargs)
+
+    return wrapper
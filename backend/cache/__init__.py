@@ -0,0 +1,23 @@
+"""Read-through cache with pluggable backends (memory, SQLite file, Redis)."""
+from backend.cache.backends import MemoryBackend, RedisBackend, SQLiteBackend, make_backend
+from backend.cache.core import (
+    Cache,
+    RequestListCache,
+    app_cache,
+    filter_key,
+    request_list_cache,
+    row_matches,
+)
+
+__all__ = [
+    "Cache",
+    "MemoryBackend",
+    "RedisBackend",
+    "RequestListCache",
+    "SQLiteBackend",
+    "app_cache",
+    "filter_key",
+    "make_backend",
+    "request_list_cache",
+    "row_matches",
+]
@@ -0,0 +1,302 @@
+# backend/cache/backends.py
+"""
+Storage backends for backend.cache.Cache.
+
+All backends store values under (namespace, key) with a TTL, can list and
+delete a namespace's keys (for precise invalidation), keep a per-namespace
+generation counter and offer a short-lived named lock (cross-process
+single-flight):
+
+  - SQLiteBackend  shared by every worker on one host through a small
+                   separate WAL file (CACHE_PATH); no extra service needed.
+                   The default.
+  - RedisBackend   shared across hosts (CACHE_URL); requires redis-py.
+  - MemoryBackend  per process; bounded LRU. Only for single-process runs
+                   (dev server, tests, benchmarks): another worker's writes
+                   cannot invalidate it, so it serves stale data until the TTL.
+
+Shared backends hold JSON, so cached values must be JSON-serialisable
+(API payloads already are).
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_PATH = BACKEND_DIR / "cache.db"
+
+
+class MemoryBackend:
+    """Bounded, thread-safe LRU with per-entry TTL (max_entries=0 stores nothing)."""
+
+    # Other processes' writes never invalidate it
+    shared = False
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.evictions = self.expirations = 0
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get((namespace, key))
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[(namespace, key)]
+                self.expirations += 1
+                return False, None
+            self._data.move_to_end((namespace, key))
+            return True, value
+
+    def set(self, namespace: str, key: str, value: Any, ttl_s: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[(namespace, key)] = (time.monotonic() + ttl_s, value)
+            self._data.move_to_end((namespace, key))
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def keys(self, namespace: str) -> List[str]:
+        with self._lock:
+            return [k for ns, k in self._data if ns == namespace]
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> int:
+        n = 0
+        with self._lock:
+            for k in keys:
+                if self._data.pop((namespace, k), None) is not None:
+                    n += 1
+        return n
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str) -> int:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            return self._generations[namespace]
+
+    # In-process single-flight already covers a single process
+    def try_lock(self, name: str, ttl_s: float) -> Optional[str]:
+        return "local"
+
+    def unlock(self, name: str, token: str) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._data), "max_entries": self.max_entries,
+                    "evictions": self.evictions, "expirations": self.expirations}
+
+
+class SQLiteBackend:
+    """
+    Host-wide shared cache in its own SQLite file (never the main DB, so
+    cache writes do not compete for surething.db's write lock). Expired rows
+    are pruned, and the oldest dropped beyond max_entries, every
+    `prune_every` writes.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        namespace  TEXT NOT NULL,
+        key        TEXT NOT NULL,
+        value      TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries(expires_at);
+    CREATE TABLE IF NOT EXISTS cache_generations (namespace TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    CREATE TABLE IF NOT EXISTS cache_locks (name TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL);
+    """
+
+    shared = True
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries: int = 10000, prune_every: int = 200):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._writes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.executescript(self.SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit; one connection per thread
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous = NORMAL;")  # a cache may lose its last writes on power loss
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        row = self._conn().execute(
+            "SELECT value FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return (True, json.loads(row[0])) if row else (False, None)
+
+    def set(self, namespace: str, key: str, value: Any, ttl_s: float) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value, separators=(",", ":")), time.time() + ttl_s),
+        )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cache_entries WHERE (namespace, key) IN "
+            "(SELECT namespace, key FROM cache_entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def keys(self, namespace: str) -> List[str]:
+        return [r[0] for r in self._conn().execute("SELECT key FROM cache_entries WHERE namespace = ?", (namespace,))]
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        if not keys:
+            return 0
+        cur = self._conn().executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                                       [(namespace, k) for k in keys])
+        return cur.rowcount
+
+    def generation(self, namespace: str) -> int:
+        row = self._conn().execute("SELECT value FROM cache_generations WHERE namespace = ?", (namespace,)).fetchone()
+        return row[0] if row else 0
+
+    def bump_generation(self, namespace: str) -> int:
+        return self._conn().execute(
+            "INSERT INTO cache_generations (namespace, value) VALUES (?, 1) "
+            "ON CONFLICT (namespace) DO UPDATE SET value = value + 1 RETURNING value",
+            (namespace,),
+        ).fetchone()[0]
+
+    def try_lock(self, name: str, ttl_s: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        conn = self._conn()
+        now = time.time()
+        conn.execute("DELETE FROM cache_locks WHERE name = ? AND expires_at <= ?", (name, now))
+        cur = conn.execute("INSERT OR IGNORE INTO cache_locks (name, token, expires_at) VALUES (?, ?, ?)",
+                           (name, token, now + ttl_s))
+        return token if cur.rowcount == 1 else None
+
+    def unlock(self, name: str, token: str) -> None:
+        self._conn().execute("DELETE FROM cache_locks WHERE name = ? AND token = ?", (name, token))
+
+    def stats(self) -> Dict[str, Any]:
+        n = self._conn().execute("SELECT COUNT(*) FROM cache_entries WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+        return {"backend": "sqlite", "path": str(self.path), "entries": n, "max_entries": self.max_entries}
+
+
+class RedisBackend:
+    """
+    Shared cache on Redis. Keys are `<prefix><namespace>:<key>`. Each
+    namespace keeps an index of its keys (for invalidation) and a generation
+    counter. The index is a sorted set scored by expiry time, so members
+    whose value has expired are trimmed on every write and listing instead
+    of piling up. Locks are SET NX PX with a token, released only by their
+    owner.
+    """
+
+    _UNLOCK = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "surething:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires redis-py (pip install redis).") from e
+        self.r = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _k(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}{namespace}:{key}"
+
+    def _index(self, namespace: str) -> str:
+        return f"{self.prefix}{namespace}::expiry"
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        raw = self.r.get(self._k(namespace, key))
+        return (True, json.loads(raw)) if raw is not None else (False, None)
+
+    def set(self, namespace: str, key: str, value: Any, ttl_s: float) -> None:
+        now = time.time()
+        index = self._index(namespace)
+        pipe = self.r.pipeline()
+        pipe.set(self._k(namespace, key), json.dumps(value, separators=(",", ":")), px=int(ttl_s * 1000))
+        pipe.zadd(index, {key: now + ttl_s})
+        pipe.zremrangebyscore(index, "-inf", now)
+        pipe.execute()
+
+    def keys(self, namespace: str) -> List[str]:
+        index = self._index(namespace)
+        pipe = self.r.pipeline()
+        pipe.zremrangebyscore(index, "-inf", time.time())
+        pipe.zrange(index, 0, -1)
+        return [k.decode() for k in pipe.execute()[1]]
+
+    def delete(self, namespace: str, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        if not keys:
+            return 0
+        pipe = self.r.pipeline()
+        pipe.delete(*[self._k(namespace, k) for k in keys])
+        pipe.zrem(self._index(namespace), *keys)
+        return pipe.execute()[0]
+
+    def generation(self, namespace: str) -> int:
+        return int(self.r.get(f"{self.prefix}{namespace}::gen") or 0)
+
+    def bump_generation(self, namespace: str) -> int:
+        return self.r.incr(f"{self.prefix}{namespace}::gen")
+
+    def try_lock(self, name: str, ttl_s: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        ok = self.r.set(f"{self.prefix}lock:{name}", token, nx=True, px=int(ttl_s * 1000))
+        return token if ok else None
+
+    def unlock(self, name: str, token: str) -> None:
+        self.r.eval(self._UNLOCK, 1, f"{self.prefix}lock:{name}", token)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+
+def make_backend(config: Dict[str, Any]):
+    """Build the backend named by CACHE_BACKEND (sqlite | redis | memory | none)."""
+    name = config.get("CACHE_BACKEND", "sqlite")
+    if name == "none":
+        return None
+    if name == "memory":
+        return MemoryBackend(max_entries=config.get("CACHE_MAX_ENTRIES", 1024))
+    if name == "sqlite":
+        return SQLiteBackend(config.get("CACHE_PATH") or DEFAULT_CACHE_PATH,
+                             max_entries=config.get("CACHE_MAX_ENTRIES", 1024))
+    if name == "redis":
+        if not config.get("CACHE_URL"):
+            raise RuntimeError("CACHE_BACKEND=redis requires CACHE_URL (e.g. redis://localhost:6379/0).")
+        return RedisBackend(config["CACHE_URL"])
+    raise RuntimeError(f"Unknown CACHE_BACKEND {name!r} (expected sqlite, redis, memory or none)")
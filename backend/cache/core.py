@@ -0,0 +1,213 @@
+# backend/cache/core.py
+"""
+Read-through cache shared by the accounts, categories and requests services.
+
+- Cache:            get_or_load(namespace, key, load) on top of a backend
+                    (backends.py: memory, SQLite file or Redis). Misses are
+                    single-flight: concurrent misses for one key in a process
+                    wait for a single load, and with a shared backend a named
+                    lock makes workers in other processes wait for (and then
+                    read) the value the lock holder stores, instead of all
+                    running the same expensive query.
+- RequestListCache: list_requests() results keyed by the normalised filter
+                    set. Writers report the rows they changed (old and new
+                    version). Only entries whose filters match one of those
+                    rows are dropped. A list for status=pending&district_id=7
+                    is untouched by a write to a request in district 9.
+
+Races: a value computed from a snapshot taken before a write must not be
+stored after that write's invalidation. Every invalidation bumps the
+namespace's generation before deleting keys, and a load only keeps its
+result if the generation did not move while it ran (re-checked after the
+store, so an invalidation that slips in between is still honoured).
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from flask import current_app
+
+from backend.cache.backends import make_backend
+
+# Filters that select rows (include_archived only widens the source)
+ROW_FILTERS = ("status", "pin_id", "csr_id", "category_id", "district_id", "region_id")
+# Part of the key, but not matched against changed rows: a write to any
+# row invalidates every windowed list with otherwise matching filters
+WINDOW_FILTERS = ("start_after", "start_before", "active_at")
+
+FilterKey = Tuple[Tuple[str, Any], ...]
+
+COUNTERS = ("hits", "misses", "loads", "coalesced", "invalidations")
+
+
+class _Flight:
+    """One in-progress load; followers wait on `done` and share its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Cache:
+    """
+    Namespaced read-through cache. Values must be JSON-serialisable when the
+    backend is shared. Counters are per process and per namespace.
+    """
+
+    def __init__(self, backend, ttl_s: float = 30.0, lock_ttl_s: float = 10.0,
+                 wait_s: float = 5.0, poll_s: float = 0.02):
+        self.backend = backend
+        self.ttl_s = ttl_s
+        self.lock_ttl_s = lock_ttl_s  # a crashed loader blocks others at most this long
+        self.wait_s = wait_s          # followers give up waiting and load themselves
+        self.poll_s = poll_s
+        self._flights: Dict[Tuple[str, str], _Flight] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, name: str, n: int = 1) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(namespace, dict.fromkeys(COUNTERS, 0))
+            counters[name] += n
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        found, value = self.backend.get(namespace, key)
+        self._count(namespace, "hits" if found else "misses")
+        return found, value
+
+    def get_or_load(self, namespace: str, key: str, load: Callable[[], Any], ttl_s: Optional[float] = None) -> Any:
+        found, value = self.get(namespace, key)
+        if found:
+            return value
+        with self._lock:
+            flight = self._flights.get((namespace, key))
+            leader = flight is None
+            if leader:
+                flight = self._flights[(namespace, key)] = _Flight()
+        if not leader:
+            self._count(namespace, "coalesced")
+            if not flight.done.wait(self.wait_s):
+                return load()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = self._load_shared(namespace, key, load, self.ttl_s if ttl_s is None else ttl_s)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            flight.done.set()
+            with self._lock:
+                self._flights.pop((namespace, key), None)
+
+    def _load_shared(self, namespace: str, key: str, load: Callable[[], Any], ttl_s: float) -> Any:
+        """Load under the backend's named lock, or wait for whoever holds it."""
+        lock_name = f"{namespace}:{key}"
+        token = self.backend.try_lock(lock_name, self.lock_ttl_s)
+        deadline = time.monotonic() + self.wait_s
+        while token is None and time.monotonic() < deadline:
+            time.sleep(self.poll_s)
+            found, value = self.backend.get(namespace, key)
+            if found:
+                self._count(namespace, "coalesced")
+                return value
+            # The holder finished without storing (invalidated meanwhile) or died
+            token = self.backend.try_lock(lock_name, self.lock_ttl_s)
+        try:
+            generation = self.backend.generation(namespace)
+            value = load()
+            self._count(namespace, "loads")
+            if self.backend.generation(namespace) == generation:
+                self.backend.set(namespace, key, value, ttl_s)
+                if self.backend.generation(namespace) != generation:
+                    self.backend.delete(namespace, [key])
+            return value
+        finally:
+            if token is not None:
+                self.backend.unlock(lock_name, token)
+
+    def invalidate(self, namespace: str, predicate: Optional[Callable[[str], bool]] = None) -> int:
+        """Drop the namespace's keys (those satisfying predicate, if given); return how many."""
+        self.backend.bump_generation(namespace)
+        keys = self.backend.keys(namespace)
+        if predicate is not None:
+            keys = [k for k in keys if predicate(k)]
+        n = self.backend.delete(namespace, keys)
+        self._count(namespace, "invalidations", n)
+        return n
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {ns: dict(c) for ns, c in self._counters.items()}
+        for c in namespaces.values():
+            lookups = c["hits"] + c["misses"]
+            c["hit_ratio"] = round(c["hits"] / lookups, 4) if lookups else None
+        return {**self.backend.stats(), "ttl_s": self.ttl_s, "namespaces": namespaces}
+
+
+def filter_key(filters: Dict[str, Any]) -> FilterKey:
+    """Canonical, hashable form of a list_requests() filter dict."""
+    key = [(k, filters[k]) for k in ROW_FILTERS + WINDOW_FILTERS if filters.get(k) is not None]
+    if filters.get("include_archived"):
+        key.append(("include_archived", True))
+    return tuple(key)
+
+
+def row_matches(key: Iterable[Tuple[str, Any]], row: Dict[str, Any]) -> bool:
+    """Would `row` appear in the list cached under `key`?"""
+    return all(row.get(k) == v for k, v in key if k in ROW_FILTERS)
+
+
+class RequestListCache:
+    """list_requests() results keyed by filter set, with row-precise invalidation."""
+
+    NAMESPACE = "requests:list"
+
+    def __init__(self, cache: Cache):
+        self.cache = cache
+
+    @staticmethod
+    def _key(filters: Dict[str, Any]) -> str:
+        return json.dumps(filter_key(filters), separators=(",", ":"))
+
+    def get_or_load(self, filters: Dict[str, Any], load: Callable[[], Any]) -> Any:
+        return self.cache.get_or_load(self.NAMESPACE, self._key(filters), load)
+
+    def invalidate_rows(self, *rows: Optional[Dict[str, Any]]) -> int:
+        """Drop lists that contain (or would now contain) any of the given row versions."""
+        rows = [r for r in rows if r]
+        if not rows:
+            return 0
+        return self.cache.invalidate(
+            self.NAMESPACE, lambda key: any(row_matches(json.loads(key), r) for r in rows)
+        )
+
+    def invalidate_changes(self, changes: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]) -> int:
+        """(before, after) pairs, e.g. from StatusBatcher after a group commit."""
+        rows = [r for pair in changes for r in pair]
+        return self.invalidate_rows(*rows)
+
+    def clear(self) -> int:
+        return self.cache.invalidate(self.NAMESPACE)
+
+
+def app_cache() -> Optional[Cache]:
+    """The app's Cache (one per process, over CACHE_BACKEND), or None when CACHE_BACKEND=none."""
+    if "cache" not in current_app.extensions:
+        backend = make_backend(current_app.config)
+        current_app.extensions.setdefault("cache", Cache(
+            backend, ttl_s=current_app.config.get("CACHE_TTL_SECONDS", 30),
+        ) if backend is not None else None)
+    return current_app.extensions["cache"]
+
+
+def request_list_cache() -> Optional[RequestListCache]:
+    """RequestListCache over app_cache(), or None when caching is disabled."""
+    cache = app_cache()
+    return RequestListCache(cache) if cache is not None else None
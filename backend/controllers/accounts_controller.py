@@ -1,17 +1,25 @@
 from flask import Blueprint, request, jsonify
-from backend.services.accounts_service import AccountService
-from backend.repositories.accounts_repository import AccountsRepository
-from backend.db_session import get_db
+from backend import storage
+from backend.idempotency import idempotent
+from backend.cache import app_cache
+from backend.formats import list_response
 
 # Blueprint for accounts endpoints
 accounts_bp = Blueprint("accounts", __name__)
 
-def _service():
-    repo = AccountsRepository(get_db())
-    return AccountService(repo)
+def _service(read_only: bool = False):
+    # GET endpoints read through the read-only (possibly replica) connection;
+    # with a cache they fill it, so they read the primary instead
+    cache = app_cache()
+    repo = storage.repository("accounts", read_only=read_only, replica=cache is None)
+    # Imported on first use: the service pulls in pydantic/email-validator and
+    # werkzeug.security, which dominate cold start
+    from backend.services.accounts_service import AccountService
+    return AccountService(repo, cache=cache)
 
 # Create account
 @accounts_bp.post("/")
+@idempotent
 def create_account():
     service = _service()
     data = request.get_json()
@@ -21,7 +29,7 @@ def create_account():
 # Get single account by ID
 @accounts_bp.get("/<int:account_id>")
 def get_account(account_id: int):
-    service = _service()
+    service = _service(read_only=True)
     account = service.get_account_by_id(account_id)
     if not account:
         # Return 404 when repository has no such record
@@ -31,9 +39,9 @@ def get_account(account_id: int):
 # List all accounts
 @accounts_bp.get("/")
 def list_accounts():
-    service = _service()
+    service = _service(read_only=True)
     accounts = service.list_accounts()
-    return jsonify(accounts), 200
+    return list_response(accounts)
 
 # Update account
 @accounts_bp.put("/<int:account_id>")
@@ -57,7 +65,7 @@ def delete_account(account_id):
 # Search account
 @accounts_bp.get("/search")
 def search_accounts():
-    service = _service()
+    service = _service(read_only=True)
     """
     Simple search:
       - GET /api/accounts/search?email=foo@example.com
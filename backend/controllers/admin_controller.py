@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from flask import Blueprint, Response, current_app, jsonify, request, send_file, stream_with_context
+
+from backend.auth import admin_required
+from backend.cache import app_cache, request_list_cache
+from backend import storage
+from backend.services.archive_service import ArchiveService
+
+admin_bp = Blueprint("admin", __name__)
+
+@admin_bp.post("/export")
+@admin_required
+def export_snapshot():
+    """
+    Export every table from a DB snapshot into EXPORT_DIR/<timestamp>/.
+      POST /api/admin/export?format=jsonl|parquet|both
+    """
+    # export, maintenance and profiling (pstats) are imported on first use, off the startup path
+    from backend import export
+
+    fmt = request.args.get("format", "jsonl")
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out_dir = Path(current_app.config["EXPORT_DIR"]) / stamp
+    manifest = export.export_all(out_dir, fmt=fmt, shards=export.request_shards(current_app.config))
+    return jsonify({"path": str(out_dir), **manifest}), 201
+
+@admin_bp.get("/export/<table>.jsonl.gz")
+@admin_required
+def stream_table(table: str):
+    """Stream one table as gzip JSON Lines from a fresh snapshot (constant memory)."""
+    from backend import export
+
+    if table not in export.EXPORT_QUERIES:
+        return jsonify({"error": "Unknown table"}), 404
+    shards = export.request_shards(current_app.config)
+
+    def generate():
+        with export.snapshot(shards=shards) as conn:
+            yield from export.iter_jsonl_gz(conn, table)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/gzip",
+        headers={"Content-Disposition": f"attachment; filename={table}.jsonl.gz"},
+    )
+
+@admin_bp.post("/archive")
+@admin_required
+def archive_requests():
+    """
+    Move completed/expired requests older than N days into requests_archive.
+      POST /api/admin/archive?older_than_days=90&batch_size=500&max_batches=20
+    """
+    service = ArchiveService(storage.repository("requests"))
+    result = service.archive(
+        older_than_days=request.args.get("older_than_days", current_app.config["ARCHIVE_AFTER_DAYS"], type=float),
+        batch_size=request.args.get("batch_size", 500, type=int),
+        max_batches=request.args.get("max_batches", type=int),
+    )
+    cache = request_list_cache()
+    if cache is not None and result["archived"]:
+        cache.clear()  # rows moved in bulk: cheaper to start over than to match them
+    return jsonify(result), 200
+
+@admin_bp.post("/maintenance")
+@admin_required
+def run_maintenance():
+    """
+    Run online maintenance (quick_check, optimize/ANALYZE, incremental vacuum,
+    WAL checkpoint) and return the report:
+      POST /api/admin/maintenance?analyze=true
+    """
+    from backend import maintenance
+
+    report = maintenance.run_maintenance(
+        full_analyze=request.args.get("analyze", "false").lower() in ("1", "true", "yes"),
+        step_pages=request.args.get("step_pages", maintenance.DEFAULT_STEP_PAGES, type=int),
+    )
+    return jsonify(report), 200 if report["ok"] else 500
+
+@admin_bp.get("/cache/stats")
+@admin_required
+def cache_stats():
+    """Backend size plus per-namespace hit/miss/load/coalesced counters (counters are per process)."""
+    cache = app_cache()
+    return jsonify({"cache": cache.stats() if cache is not None else None}), 200
+
+@admin_bp.get("/admission/stats")
+@admin_required
+def admission_stats():
+    """Per-endpoint admitted/rate_limited/overloaded counters, in-flight and queue wait (per process)."""
+    admission = current_app.extensions.get("admission")
+    return jsonify({"admission": admission.stats() if admission is not None else None}), 200
+
+@admin_bp.get("/profiles")
+@admin_required
+def profiles_summary():
+    """
+    Profiled requests (PROFILING=on): saved profile ids and the hottest
+    functions across all samples of this process.
+      GET /api/admin/profiles?sort=tottime|cumtime&limit=25
+    """
+    profiler = current_app.extensions.get("profiler")
+    if profiler is None:
+        return jsonify({"profiles": None}), 200
+    sort = request.args.get("sort", "tottime")
+    limit = request.args.get("limit", 25, type=int)
+    return jsonify({"profiles": profiler.summary(sort, limit)}), 200
+
+@admin_bp.get("/profiles/<profile_id>")
+@admin_required
+def profile_detail(profile_id: str):
+    """
+    One profiled request (id from its X-Profile-Id header).
+      GET /api/admin/profiles/<id>?sort=tottime|cumtime&limit=25
+      GET /api/admin/profiles/<id>?format=pstats   (for snakeviz, gprof2dot, flameprof)
+    """
+    profiler = current_app.extensions.get("profiler")
+    path = profiler.path_for(profile_id) if profiler is not None else None
+    if path is None:
+        return jsonify({"error": "Profile not found"}), 404
+    if request.args.get("format") == "pstats":
+        return send_file(path, mimetype="application/octet-stream", as_attachment=True, download_name=path.name)
+    import pstats
+    from backend import profiling
+
+    stats = pstats.Stats(str(path))
+    sort = request.args.get("sort", "tottime")
+    limit = request.args.get("limit", 25, type=int)
+    return jsonify({"id": profile_id, "total_s": round(stats.total_tt, 6),
+                    "hot_functions": profiling.top_functions(stats, sort, limit)}), 200
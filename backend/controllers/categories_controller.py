@@ -1,13 +1,18 @@
 from flask import Blueprint, request, jsonify
-from backend.services.categories_service import CategoriesService
-from backend.repositories.categories_repository import CategoriesRepository
-from backend.db_session import get_db
+from backend import storage
+from backend.cache import app_cache
+from backend.formats import list_response
 
 categories_bp = Blueprint("categories", __name__)
 
-def _service():
-    repo = CategoriesRepository(get_db())
-    return CategoriesService(repo)
+def _service(read_only: bool = False):
+    # GET endpoints read through the read-only (possibly replica) connection;
+    # with a cache they fill it, so they read the primary instead
+    cache = app_cache()
+    repo = storage.repository("categories", read_only=read_only, replica=cache is None)
+    # Imported on first use: the service pulls in pydantic (cold start)
+    from backend.services.categories_service import CategoriesService
+    return CategoriesService(repo, cache=cache)
 
 @categories_bp.post("/")
 def create_category():
@@ -20,7 +25,7 @@ def create_category():
 @categories_bp.get("/<int:category_id>")
 def get_category(category_id: int):
     """Retrieve a single category by ID."""
-    service = _service()
+    service = _service(read_only=True)
     cat = service.get_category_by_id(category_id)
     if not cat:
         return jsonify({"error": "Category not found"}), 404
@@ -29,9 +34,9 @@ def get_category(category_id: int):
 @categories_bp.get("/")
 def list_categories():
     """List all categories."""
-    service = _service()
+    service = _service(read_only=True)
     items = service.list_categories()
-    return jsonify(items), 200
+    return list_response(items)
 
 @categories_bp.put("/<int:category_id>")
 def update_category(category_id: int):
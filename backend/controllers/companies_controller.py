@@ -0,0 +1,39 @@
+from flask import Blueprint, request, jsonify
+from backend import storage
+from backend.services.companies_service import CompaniesService
+
+companies_bp = Blueprint("companies", __name__)
+
+def _service():
+    # Read-only endpoints: everything goes through the read (possibly replica) connection
+    return CompaniesService(*(storage.repository(kind, read_only=True) for kind in ("companies", "accounts", "requests")))
+
+def _found(items):
+    if items is None:
+        return jsonify({"error": "Company not found"}), 404
+    return jsonify(items), 200
+
+@companies_bp.get("/<int:company_id>/requests")
+def list_company_requests(company_id: int):
+    """
+    Requests handled by this company's CSRs, newest first.
+      GET /api/companies/3/requests?status=accepted&district_id=11
+    """
+    filters = {
+        "status": request.args.get("status"),
+        "category_id": request.args.get("category_id", type=int),
+        "district_id": request.args.get("district_id", type=int),
+        "include_archived": request.args.get("include_archived", "false").lower() in ("1", "true", "yes") or None,
+    }
+    items = _service().list_requests(company_id, {k: v for k, v in filters.items() if v is not None})
+    return _found(items)
+
+@companies_bp.get("/<int:company_id>/volunteers")
+def list_company_volunteers(company_id: int):
+    """Volunteers belonging to this company."""
+    return _found(_service().list_volunteers(company_id))
+
+@companies_bp.get("/<int:company_id>/accounts")
+def list_company_accounts(company_id: int):
+    """CSR accounts of this company (without passwords)."""
+    return _found(_service().list_accounts(company_id))
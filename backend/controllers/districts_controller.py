@@ -0,0 +1,49 @@
+from flask import Blueprint, request, jsonify
+from backend.services.districts_service import DistrictsService
+from backend.repositories.districts_repository import DistrictsRepository
+from backend.db_session import get_db, get_read_db
+
+districts_bp = Blueprint("districts", __name__)
+
+def _service(read_only: bool = False):
+    # GET endpoints read through the read-only (possibly replica) connection
+    repo = DistrictsRepository(get_read_db() if read_only else get_db())
+    return DistrictsService(repo)
+
+@districts_bp.get("/")
+def list_districts():
+    """List all districts with their centroids."""
+    service = _service(read_only=True)
+    return jsonify(service.list_districts()), 200
+
+@districts_bp.get("/<int:district_id>")
+def get_district(district_id: int):
+    """Retrieve a single district by ID."""
+    service = _service(read_only=True)
+    item = service.get_district_by_id(district_id)
+    if not item:
+        return jsonify({"error": "District not found"}), 404
+    return jsonify(item), 200
+
+@districts_bp.get("/nearest")
+def nearest_district():
+    """
+    Resolve a location to a district:
+      - GET /api/districts/nearest?lat=1.3521&lng=103.8198
+      - GET /api/districts/nearest?postal_code=560123
+    """
+    service = _service(read_only=True)
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    postal_code = request.args.get("postal_code")
+
+    if lat is not None and lng is not None:
+        found = service.nearest_district(lat, lng)
+    elif postal_code:
+        found = service.district_for_postal_code(postal_code)
+    else:
+        return jsonify({"error": "Provide 'lat' and 'lng', or 'postal_code'"}), 400
+
+    if not found:
+        return jsonify({"error": "No district found for this location"}), 404
+    return jsonify(found), 200
@@ -1,40 +1,152 @@
-from flask import Blueprint, request, jsonify
-from backend.services.requests_service import RequestsService
-from backend.repositories.requests_repository import RequestsRepository
-from backend.db_session import get_db
+from flask import Blueprint, current_app, request, jsonify
+from backend import storage
+from backend.repositories.districts_repository import DistrictsRepository
+from backend.repositories.jobs_repository import JobsRepository
+from backend.repositories.minhash_repository import MinHashRepository
+from backend.services.districts_service import DistrictsService
+from backend.services.reference_validator import ReferenceValidator
+from backend.services.status_batcher import StatusBatcher
+from backend.cache import app_cache, request_list_cache
+from backend.db_session import DB_PATH, get_db, get_read_db
+from backend.formats import list_response
+from backend.idempotency import idempotent
+from backend.dedupe import DuplicateDetector
+from backend.jobs import JobQueue
 
 requests_bp = Blueprint("requests", __name__)
 
-def _service():
-    repo = RequestsRepository(get_db())
-    return RequestsService(repo)
+def _service(read_only: bool = False, replica: bool = True):
+    # GET endpoints read through the read-only (possibly replica) connection;
+    # replica=False for reads that fill the cache (see backend.db_session)
+    repo = storage.repository("requests", read_only=read_only, replica=replica)
+    # District geometry is local reference data (SQLite) on every storage backend
+    districts = DistrictsService(DistrictsRepository(get_read_db() if read_only else get_db()))
+    # Imported on first use: the service pulls in pydantic (cold start)
+    from backend.services.requests_service import RequestsService
+    # Group commit is a SQLite write-lock optimisation; PostgreSQL applies transitions directly,
+    # and so do region shards (each has its own write lock)
+    batcher = _status_batcher() if storage.is_sqlite() and not storage.is_sharded() else None
+    # Side effects of writes (notifications) are queued for the job worker; without
+    # PostgreSQL or shards the jobs table is in the requests' database (one transaction)
+    jobs = None if read_only else JobQueue(JobsRepository(get_db()), current_app.config.get("JOB_MAX_ATTEMPTS", 5))
+    # Near-duplicate index: local SQLite, like the job queue
+    duplicates = None
+    if current_app.config.get("DUPLICATE_DETECTION", True):
+        duplicates = DuplicateDetector(MinHashRepository(get_read_db() if read_only else get_db()),
+                                       current_app.config.get("DUPLICATE_THRESHOLD", 0.5))
+    # Referenced ids (pin_id, csr_id, category_id, district_id, volunteers) are checked before writes
+    references = None if read_only else ReferenceValidator(storage.repository("references"), app_cache())
+    return RequestsService(repo, districts=districts, status_batcher=batcher, list_cache=request_list_cache(),
+                           jobs=jobs, duplicates=duplicates, references=references,
+                           jobs_share_db=storage.is_sqlite() and not storage.is_sharded())
+
+def _status_batcher():
+    """One batched status writer per app/process, started on first use."""
+    batcher = current_app.extensions.get("status_batcher")
+    if batcher is None:
+        cache = request_list_cache()
+        batcher = current_app.extensions.setdefault("status_batcher", StatusBatcher(
+            DB_PATH,
+            max_items=current_app.config.get("STATUS_BATCH_MAX_ITEMS", 64),
+            max_wait_ms=current_app.config.get("STATUS_BATCH_MAX_WAIT_MS", 5),
+            on_commit=cache.invalidate_changes if cache is not None else None,
+            job_attempts=current_app.config.get("JOB_MAX_ATTEMPTS", 5),
+        ))
+    return batcher
+
+def _flag(name: str) -> bool:
+    return request.args.get(name, "false").lower() in ("1", "true", "yes")
 
 @requests_bp.get("/")
 def list_requests():
-    # Simple filters: status, pin_id, csr_id, category_id, district_id
-    service = _service()
+    # Simple filters: status, pin_id, csr_id, category_id, district_id, region_id
+    # (+ include_archived=true to also search requests_archive)
+    # Time filters (ISO-8601 or epoch seconds): start_after, start_before, active_at
+    # facets=true returns {"requests": [...], "facets": {"regions": [...], "districts": [...]}}
+    service = _service(read_only=True, replica=app_cache() is None)
+    filters = {
+        **_row_filters(),
+        "start_after": request.args.get("start_after"),
+        "start_before": request.args.get("start_before"),
+        "active_at": request.args.get("active_at"),
+        "include_archived": _flag("include_archived") or None,
+    }
+    data = service.list_requests({k: v for k, v in filters.items() if v is not None})
+    if _flag("facets"):
+        return jsonify({"requests": data, "facets": service.facets(data)}), 200
+    return list_response(data)
+
+def _row_filters():
     filters = {
         "status": request.args.get("status"),
         "pin_id": request.args.get("pin_id", type=int),
         "csr_id": request.args.get("csr_id", type=int),
         "category_id": request.args.get("category_id", type=int),
         "district_id": request.args.get("district_id", type=int),
+        "region_id": request.args.get("region_id", type=int),
     }
-    data = service.list_requests({k: v for k, v in filters.items() if v is not None})
+    return {k: v for k, v in filters.items() if v is not None}
+
+@requests_bp.get("/calendar")
+def calendar():
+    """
+    Requests starting in [from, to), grouped by day:
+      GET /api/requests/calendar?from=2025-11-01&to=2025-12-01&tz=Asia/Singapore&district_id=101
+    Accepts the list filters (status, pin_id, csr_id, category_id, district_id, region_id,
+    include_archived).
+    """
+    start, end = request.args.get("from"), request.args.get("to")
+    if not start or not end:
+        return jsonify({"error": "Provide 'from' and 'to'"}), 400
+    service = _service(read_only=True, replica=app_cache() is None)  # cached via list_requests()
+    filters = _row_filters()
+    if _flag("include_archived"):
+        filters["include_archived"] = True
+    data = service.calendar(start, end, tz=request.args.get("tz", "UTC"), filters=filters)
+    return jsonify(data), 200
+
+@requests_bp.get("/nearby")
+def list_nearby_requests():
+    """
+    Proximity-ranked requests for CSRs:
+      GET /api/requests/nearby?district_id=101&radius=5&status=pending&page=1&page_size=20
+    radius is in km between district centroids; results carry distance_km.
+    """
+    service = _service(read_only=True)
+    district_id = request.args.get("district_id", type=int)
+    if district_id is None:
+        return jsonify({"error": "Provide 'district_id'"}), 400
+    data = service.list_nearby(
+        district_id,
+        radius_km=request.args.get("radius", 5.0, type=float),
+        status=request.args.get("status", "pending"),
+        page=request.args.get("page", 1, type=int),
+        page_size=request.args.get("page_size", 20, type=int),
+    )
     return jsonify(data), 200
 
 @requests_bp.get("/<int:req_id>")
 def get_request(req_id: int):
     """Get a single request by ID."""
-    service = _service()
-    item = service.get_request_by_id(req_id)
+    service = _service(read_only=True)
+    item = service.get_request_by_id(req_id, include_archived=_flag("include_archived"))
     if not item:
         return jsonify({"error": "Request not found"}), 404
     return jsonify(item), 200
 
+@requests_bp.get("/<int:req_id>/duplicates")
+def list_duplicates(req_id: int):
+    """Open requests of the same PIN and district with near-identical title/description."""
+    service = _service(read_only=True)
+    item = service.get_request_by_id(req_id)
+    if not item:
+        return jsonify({"error": "Request not found"}), 404
+    return jsonify(service.possible_duplicates(item)), 200
+
 @requests_bp.post("/")
+@idempotent
 def create_request():
-    """Create a new request."""
+    """Create a new request (district_id, or lat/lng, or postal_code)."""
     service = _service()
     payload = request.get_json() or {}
     created = service.create_request(payload)
@@ -50,6 +162,19 @@ def update_request(req_id: int):
         return jsonify({"error": "Request not found"}), 404
     return jsonify(updated), 200
 
+@requests_bp.post("/<int:req_id>/status")
+def transition_status(req_id: int):
+    """
+    Change only the status (group-committed with other transitions):
+      POST /api/requests/<id>/status  {"status": "accepted", "csr_id": 4, "volunteers": [1, 2]}
+    """
+    service = _service()
+    payload = request.get_json() or {}
+    updated = service.transition_status(req_id, payload)
+    if not updated:
+        return jsonify({"error": "Request not found"}), 404
+    return jsonify(updated), 200
+
 @requests_bp.delete("/<int:req_id>")
 def delete_request(req_id: int):
     """Delete a request."""
@@ -1,4 +1,7 @@
 PRAGMA foreign_keys = ON;
+-- Free pages can be returned to the OS online (python -m backend.maintenance).
+-- Only takes effect on a new, empty DB (existing DBs: --enable-incremental-vacuum).
+PRAGMA auto_vacuum = INCREMENTAL;
 
 
 CREATE TABLE IF NOT EXISTS companies (
@@ -93,6 +96,22 @@ CREATE TABLE IF NOT EXISTS requests (
     FOREIGN KEY (district_id) REFERENCES districts(id)  ON DELETE RESTRICT
 );
 
+-- start_at/end_at/created_at are ISO-8601 TEXT in mixed forms (the seed's
+-- 'T...Z', Python's 'YYYY-MM-DD HH:MM:SS.ffffff', datetime('now')), which do
+-- not compare correctly as strings. The *_ts columns hold the same instants
+-- as UTC epoch seconds and are what queries filter and sort on. Triggers at
+-- the end of this file set them for every writer and backfill existing rows.
+-- Added with ALTER so existing DBs get them too (re-runs hit 'duplicate
+-- column name', which is ignored).
+ALTER TABLE requests ADD COLUMN start_ts   INTEGER;
+ALTER TABLE requests ADD COLUMN end_ts     INTEGER;
+ALTER TABLE requests ADD COLUMN created_ts INTEGER;
+
+-- region_id is districts.region_id copied onto each request (kept in step
+-- by triggers at the end of this file), so region filters and region
+-- dashboards are one indexed query instead of requests -> districts -> regions.
+ALTER TABLE requests ADD COLUMN region_id  INTEGER;
+
 CREATE VIEW IF NOT EXISTS v_requests AS
 SELECT
     r.id,
@@ -109,10 +128,318 @@ JOIN regions   rg ON d.region_id = rg.id;
 
 
 CREATE INDEX IF NOT EXISTS idx_districts_region     ON districts(region_id);
-CREATE INDEX IF NOT EXISTS idx_requests_district    ON requests(district_id);
-CREATE INDEX IF NOT EXISTS idx_requests_category    ON requests(category_id);
-CREATE INDEX IF NOT EXISTS idx_requests_status      ON requests(status);
-CREATE INDEX IF NOT EXISTS idx_requests_pin         ON requests(pin_id);
-CREATE INDEX IF NOT EXISTS idx_requests_csr         ON requests(csr_id);
-CREATE INDEX IF NOT EXISTS idx_requests_start_at    ON requests(start_at);
-CREATE INDEX IF NOT EXISTS idx_requests_end_at      ON requests(end_at);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_accounts_name_nocase ON accounts(name COLLATE NOCASE);
+DROP INDEX IF EXISTS idx_requests_start_at;
+DROP INDEX IF EXISTS idx_requests_end_at;
+
+-- list_requests filters on any mix of status/pin/csr/category/district/region and
+-- always sorts by created_ts DESC, id DESC. Every filter column gets a
+-- (column, created_ts) index (the rowid is the implicit last key, so the id
+-- tie-break comes for free) so whichever one the planner picks also yields
+-- the sort order (no temp B-tree). The leading column doubles as the FK index.
+-- The common browsing combinations (status with district, category or
+-- region) get their own index.
+DROP INDEX IF EXISTS idx_requests_district;
+DROP INDEX IF EXISTS idx_requests_category;
+DROP INDEX IF EXISTS idx_requests_status;
+DROP INDEX IF EXISTS idx_requests_pin;
+DROP INDEX IF EXISTS idx_requests_csr;
+DROP INDEX IF EXISTS idx_requests_created;
+DROP INDEX IF EXISTS idx_requests_status_created;
+DROP INDEX IF EXISTS idx_requests_pin_created;
+DROP INDEX IF EXISTS idx_requests_csr_created;
+DROP INDEX IF EXISTS idx_requests_category_created;
+DROP INDEX IF EXISTS idx_requests_district_created;
+DROP INDEX IF EXISTS idx_requests_status_district;
+DROP INDEX IF EXISTS idx_requests_status_category;
+CREATE INDEX IF NOT EXISTS idx_requests_created_ts           ON requests(created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_status_created_ts    ON requests(status, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_pin_created_ts       ON requests(pin_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_csr_created_ts       ON requests(csr_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_category_created_ts  ON requests(category_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_district_created_ts  ON requests(district_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_status_district_ts   ON requests(status, district_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_status_category_ts   ON requests(status, category_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_region_created_ts    ON requests(region_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_status_region_ts     ON requests(status, region_id, created_ts);
+
+-- Time windows (start_after/start_before, the calendar) are ranges over
+-- start_ts, returned in start order: on their own, per status, per region
+-- (with or without status), and per status and district (also the nearby
+-- search order).
+CREATE INDEX IF NOT EXISTS idx_requests_start_ts             ON requests(start_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_status_start_ts      ON requests(status, start_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_region_start_ts      ON requests(region_id, start_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_status_region_start_ts ON requests(status, region_id, start_ts);
+
+-- Idempotency-Key support for retried POSTs: one row per (scope, key).
+-- status is 'in_progress' while the first request runs, then 'completed'
+-- with the stored response. Rows older than the TTL are pruned by created_at.
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    scope           TEXT    NOT NULL,   -- "<client address> <METHOD> <path>"
+    key             TEXT    NOT NULL,
+    fingerprint     TEXT    NOT NULL,   -- sha256 of the request body
+    status          TEXT    NOT NULL CHECK (status IN ('in_progress','completed')),
+    response_status INTEGER,
+    response_body   TEXT,
+    created_at      INTEGER NOT NULL,   -- unix epoch seconds of the (latest) claim
+    PRIMARY KEY (scope, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_created ON idempotency_keys(created_at);
+
+-- Background jobs (backend.jobs): side effects such as notifications run in
+-- a worker process, off the request path. run_at is the earliest next
+-- attempt while 'queued' and the lease expiry while 'running' (a crashed
+-- worker's jobs are claimed again once it passes), so one (status, run_at)
+-- index serves both. Finished jobs are deleted, jobs out of attempts stay
+-- as 'dead' letters until requeued or purged. Jobs are queued in the
+-- transaction of the write they belong to; with no worker running they
+-- accumulate until `python -m backend.jobs --purge-stale DAYS`.
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind         TEXT    NOT NULL,
+    payload      TEXT    NOT NULL,   -- JSON
+    status       TEXT    NOT NULL DEFAULT 'queued' CHECK (status IN ('queued','running','dead')),
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at       INTEGER NOT NULL,   -- unix epoch seconds
+    locked_by    TEXT,
+    last_error   TEXT,
+    created_at   INTEGER NOT NULL    -- unix epoch seconds
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_run_at ON jobs(status, run_at);
+
+-- Near-duplicate index (backend.dedupe): each request's MinHash signature
+-- over title + description, and its LSH band buckets. A bucket is a hash of
+-- (pin_id, district_id, band, band values), so only requests of the same PIN
+-- and district collide. No foreign key: requests may live in region shards
+-- or PostgreSQL, so RequestsService keeps the index in step.
+CREATE TABLE IF NOT EXISTS request_minhash (
+    request_id INTEGER PRIMARY KEY,
+    signature  BLOB    NOT NULL      -- NUM_PERM little-endian uint32
+);
+
+CREATE TABLE IF NOT EXISTS request_lsh (
+    bucket     INTEGER NOT NULL,
+    request_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, request_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_request_lsh_request ON request_lsh(request_id);
+
+
+-- District geometry (seed/district_geometry.json): centroid per district,
+-- an R-tree over each district's bounding box for point lookups, and the
+-- Singapore postal sector (first two digits of a postal code) -> district map.
+CREATE TABLE IF NOT EXISTS district_geo (
+    district_id INTEGER PRIMARY KEY,
+    lat         REAL NOT NULL,
+    lng         REAL NOT NULL,
+    FOREIGN KEY (district_id) REFERENCES districts(id) ON DELETE CASCADE
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS district_rtree USING rtree(
+    id,                 -- districts.id
+    min_lat, max_lat,
+    min_lng, max_lng
+);
+
+CREATE TABLE IF NOT EXISTS postal_sectors (
+    sector      TEXT PRIMARY KEY,   -- e.g. '56'
+    district_id INTEGER NOT NULL,
+    FOREIGN KEY (district_id) REFERENCES districts(id) ON DELETE CASCADE
+);
+
+
+-- District distance matrix: great-circle km between district centroids,
+-- rebuilt by the seeder from district_geo. same_region marks districts of
+-- the same region (coarse adjacency). Includes the (d, d, 0) diagonal.
+CREATE TABLE IF NOT EXISTS district_distances (
+    from_id     INTEGER NOT NULL,
+    to_id       INTEGER NOT NULL,
+    km          REAL    NOT NULL,
+    same_region INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (from_id, to_id),
+    FOREIGN KEY (from_id) REFERENCES districts(id) ON DELETE CASCADE,
+    FOREIGN KEY (to_id)   REFERENCES districts(id) ON DELETE CASCADE
+);
+
+-- nearby search walks distances in (km, to_id) order, then each district's
+-- pending requests by start time
+CREATE UNIQUE INDEX IF NOT EXISTS idx_district_distances_km ON district_distances(from_id, km, to_id);
+DROP INDEX IF EXISTS idx_requests_status_district_start;
+CREATE INDEX IF NOT EXISTS idx_requests_status_district_start_ts ON requests(status, district_id, start_ts);
+
+
+-- Key/value metadata for the app itself (e.g. bootstrap fingerprint)
+CREATE TABLE IF NOT EXISTS app_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+
+-- Archive partition: completed/expired requests older than ARCHIVE_AFTER_DAYS
+-- are moved here in bounded batches (python -m backend.archive), so hot-path
+-- queries on `requests` only touch the active working set. Same columns as
+-- requests plus archived_at (list_requests(include_archived=...) merges both).
+CREATE TABLE IF NOT EXISTS requests_archive (
+    id              INTEGER PRIMARY KEY,
+    pin_id          INTEGER NOT NULL,
+    csr_id          INTEGER,
+    category_id     INTEGER NOT NULL,
+    district_id     INTEGER NOT NULL,
+    title           TEXT    NOT NULL,
+    description     TEXT,
+    status          TEXT    NOT NULL,
+    start_at        TEXT,
+    end_at          TEXT,
+    created_at      TEXT    NOT NULL,
+    volunteers      TEXT,
+    archived_at     TEXT    NOT NULL DEFAULT (datetime('now'))
+);
+
+ALTER TABLE requests_archive ADD COLUMN start_ts   INTEGER;
+ALTER TABLE requests_archive ADD COLUMN end_ts     INTEGER;
+ALTER TABLE requests_archive ADD COLUMN created_ts INTEGER;
+ALTER TABLE requests_archive ADD COLUMN region_id  INTEGER;
+
+DROP INDEX IF EXISTS idx_requests_archive_created;
+DROP INDEX IF EXISTS idx_requests_archive_status_created;
+DROP INDEX IF EXISTS idx_requests_archive_pin_created;
+DROP INDEX IF EXISTS idx_requests_archive_csr_created;
+DROP INDEX IF EXISTS idx_requests_archive_category_created;
+DROP INDEX IF EXISTS idx_requests_archive_district_created;
+CREATE INDEX IF NOT EXISTS idx_requests_archive_created_ts           ON requests_archive(created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_status_created_ts    ON requests_archive(status, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_pin_created_ts       ON requests_archive(pin_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_csr_created_ts       ON requests_archive(csr_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_category_created_ts  ON requests_archive(category_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_district_created_ts  ON requests_archive(district_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_region_created_ts    ON requests_archive(region_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_start_ts             ON requests_archive(start_ts);
+
+
+-- Tenant (company) scoped paths for CSR dashboards. CSR accounts are the only
+-- accounts with a company_id (see the CHECK on accounts), so accounts(company_id)
+-- also resolves a company's CSRs. Their requests then come from one
+-- csr_id IN (...) query on idx_requests_csr_created_ts, sorted once.
+CREATE INDEX IF NOT EXISTS idx_accounts_company   ON accounts(company_id);
+CREATE INDEX IF NOT EXISTS idx_volunteers_company ON volunteers(company_id);
+
+
+-- Epoch timestamps (see the *_ts columns on requests). SQLite's date
+-- functions read every ISO-8601 form above (a 'Z' or +HH:MM suffix is
+-- converted to UTC, no suffix means UTC already). Unparseable text gives NULL.
+--
+-- request_windows indexes each request's [start_ts, end_ts] interval (end
+-- defaults to start) so active_at=T is an R-tree stabbing query instead of a
+-- scan over every request that started before T. R-tree coordinates are
+-- 32-bit floats rounded outwards, so queries re-check the exact bounds.
+CREATE VIRTUAL TABLE IF NOT EXISTS request_windows USING rtree(
+    id,                 -- requests.id
+    min_ts, max_ts
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_requests_ts_insert
+AFTER INSERT ON requests
+BEGIN
+    UPDATE requests SET
+        start_ts   = CAST(strftime('%s', NEW.start_at) AS INTEGER),
+        end_ts     = CAST(strftime('%s', NEW.end_at) AS INTEGER),
+        created_ts = CAST(strftime('%s', NEW.created_at) AS INTEGER)
+    WHERE id = NEW.id;
+    INSERT OR REPLACE INTO request_windows (id, min_ts, max_ts)
+        SELECT id, start_ts, MAX(COALESCE(end_ts, start_ts), start_ts)
+        FROM requests WHERE id = NEW.id AND start_ts IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_requests_ts_update
+AFTER UPDATE OF start_at, end_at, created_at ON requests
+BEGIN
+    UPDATE requests SET
+        start_ts   = CAST(strftime('%s', NEW.start_at) AS INTEGER),
+        end_ts     = CAST(strftime('%s', NEW.end_at) AS INTEGER),
+        created_ts = CAST(strftime('%s', NEW.created_at) AS INTEGER)
+    WHERE id = NEW.id;
+    DELETE FROM request_windows WHERE id = NEW.id;
+    INSERT INTO request_windows (id, min_ts, max_ts)
+        SELECT id, start_ts, MAX(COALESCE(end_ts, start_ts), start_ts)
+        FROM requests WHERE id = NEW.id AND start_ts IS NOT NULL;
+END;
+
+-- Also covers archive_batch, which moves rows out with DELETE
+CREATE TRIGGER IF NOT EXISTS trg_requests_windows_delete
+AFTER DELETE ON requests
+BEGIN
+    DELETE FROM request_windows WHERE id = OLD.id;
+END;
+
+-- archive_batch copies the *_ts columns, other writers get them computed
+CREATE TRIGGER IF NOT EXISTS trg_requests_archive_ts_insert
+AFTER INSERT ON requests_archive WHEN NEW.created_ts IS NULL
+BEGIN
+    UPDATE requests_archive SET
+        start_ts   = CAST(strftime('%s', NEW.start_at) AS INTEGER),
+        end_ts     = CAST(strftime('%s', NEW.end_at) AS INTEGER),
+        created_ts = CAST(strftime('%s', NEW.created_at) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+-- One-off backfill for rows written before the *_ts columns and
+-- request_windows existed (nothing left to do on later runs)
+UPDATE requests SET
+    start_ts   = CAST(strftime('%s', start_at) AS INTEGER),
+    end_ts     = CAST(strftime('%s', end_at) AS INTEGER),
+    created_ts = CAST(strftime('%s', created_at) AS INTEGER)
+WHERE created_ts IS NULL;
+UPDATE requests_archive SET
+    start_ts   = CAST(strftime('%s', start_at) AS INTEGER),
+    end_ts     = CAST(strftime('%s', end_at) AS INTEGER),
+    created_ts = CAST(strftime('%s', created_at) AS INTEGER)
+WHERE created_ts IS NULL;
+INSERT INTO request_windows (id, min_ts, max_ts)
+    SELECT r.id, r.start_ts, MAX(COALESCE(r.end_ts, r.start_ts), r.start_ts)
+    FROM requests r
+    WHERE r.start_ts IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM request_windows w WHERE w.id = r.id);
+
+
+-- Denormalised region_id: set from the request's district on insert and
+-- when district_id changes, and rewritten when a district moves to another
+-- region (idx_requests_district_created_ts finds its requests).
+CREATE TRIGGER IF NOT EXISTS trg_requests_region_insert
+AFTER INSERT ON requests
+BEGIN
+    UPDATE requests SET region_id = (SELECT region_id FROM districts WHERE id = NEW.district_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_requests_region_update
+AFTER UPDATE OF district_id ON requests
+BEGIN
+    UPDATE requests SET region_id = (SELECT region_id FROM districts WHERE id = NEW.district_id)
+    WHERE id = NEW.id;
+END;
+
+-- archive_batch copies region_id, other writers get it looked up
+CREATE TRIGGER IF NOT EXISTS trg_requests_archive_region_insert
+AFTER INSERT ON requests_archive WHEN NEW.region_id IS NULL
+BEGIN
+    UPDATE requests_archive SET region_id = (SELECT region_id FROM districts WHERE id = NEW.district_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_districts_region_update
+AFTER UPDATE OF region_id ON districts
+BEGIN
+    UPDATE requests SET region_id = NEW.region_id WHERE district_id = NEW.id;
+    UPDATE requests_archive SET region_id = NEW.region_id WHERE district_id = NEW.id;
+END;
+
+-- One-off backfill for rows written before region_id existed
+UPDATE requests SET region_id = (SELECT region_id FROM districts WHERE id = requests.district_id)
+WHERE region_id IS NULL;
+UPDATE requests_archive SET region_id = (SELECT region_id FROM districts WHERE id = requests_archive.district_id)
+WHERE region_id IS NULL;
@@ -1,23 +1,178 @@
 # backend/db_session.py
+"""
+Per-request SQLite connections, split into a writer and a reader.
+
+- get_db():      the read/write connection, used by mutating endpoints. Its
+                 transactions start with BEGIN IMMEDIATE and the DB runs in WAL
+                 mode, so writers queue on SQLite's write lock (busy_timeout)
+                 instead of failing, and never block readers.
+- get_read_db(): a read-only (`mode=ro`) connection for GET endpoints. When
+                 READ_REPLICA_PATH is configured and the replica file exists,
+                 reads go to that periodically refreshed copy instead of the
+                 primary file (see ReplicaRefresher).
+
+Mutating requests read back through get_db(), so they always see their own
+writes; only pure reads may see a replica that lags by up to one refresh.
+Reads that fill the shared cache (backend.cache) pass replica=False and read
+the primary: a value loaded from a replica that predates a write would be
+cached again after that write's invalidation, and outlive the replica lag.
+
+- get_shard_db(): with REQUEST_SHARDS=region, a per-request connection to
+                 one shard file (backend.sharding), read/write or read-only.
+
+- get_pg():      with STORAGE_BACKEND=postgres, a connection borrowed from a
+                 per-app psycopg pool (DATABASE_URL, PG_POOL_MIN/MAX) and
+                 returned to it by close_db().
+"""
 from __future__ import annotations
+import os
 import sqlite3
+import threading
+import uuid
 from pathlib import Path
-from flask import g
+from flask import current_app, g, has_app_context
 
 BACKEND_DIR = Path(__file__).resolve().parent
 DB_PATH = BACKEND_DIR / "surething.db"
+BUSY_TIMEOUT_MS = 5000
 
 def get_db():
-    """Return a per-request SQLite connection stored on Flask 'g'."""
+    """Return a per-request read/write SQLite connection stored on Flask 'g'."""
     if "db" not in g:
-        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+        conn = sqlite3.connect(
+            str(DB_PATH), check_same_thread=False, isolation_level="IMMEDIATE", timeout=BUSY_TIMEOUT_MS / 1000
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON;")
         g.db = conn
     return g.db
 
+def _read_path() -> Path:
+    replica = current_app.config.get("READ_REPLICA_PATH") if has_app_context() else None
+    if replica and Path(replica).exists():
+        return Path(replica)
+    return DB_PATH
+
+def get_read_db(replica: bool = True):
+    """Return a per-request read-only connection (the replica if configured and `replica`, else the primary)."""
+    path = _read_path() if replica else DB_PATH
+    read_dbs = g.setdefault("read_dbs", {})
+    if path not in read_dbs:
+        conn = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000
+        )
+        conn.row_factory = sqlite3.Row
+        read_dbs[path] = conn
+    return read_dbs[path]
+
+def get_shard_db(path, read_only: bool = False):
+    """Return a per-request connection to a shard file (one per file and mode)."""
+    shard_dbs = g.setdefault("shard_dbs", {})
+    key = (str(path), read_only)
+    if key not in shard_dbs:
+        if read_only:
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False,
+                                   timeout=BUSY_TIMEOUT_MS / 1000)
+        else:
+            conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level="IMMEDIATE",
+                                   timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.row_factory = sqlite3.Row
+        shard_dbs[key] = conn
+    return shard_dbs[key]
+
+_pg_pool_lock = threading.Lock()
+
+def _pg_pool():
+    """The app's PostgreSQL connection pool, opened on first use."""
+    pool = current_app.extensions.get("pg_pool")
+    if pool is not None:
+        return pool
+    try:
+        from psycopg.rows import dict_row
+        from psycopg_pool import ConnectionPool
+    except ImportError as e:
+        raise RuntimeError("STORAGE_BACKEND=postgres requires psycopg (pip install \"psycopg[binary,pool]\").") from e
+    with _pg_pool_lock:
+        pool = current_app.extensions.get("pg_pool")
+        if pool is None:
+            pool = ConnectionPool(
+                current_app.config["DATABASE_URL"],
+                min_size=current_app.config.get("PG_POOL_MIN", 1),
+                max_size=current_app.config.get("PG_POOL_MAX", 10),
+                kwargs={"row_factory": dict_row},
+                open=True,
+            )
+            current_app.extensions["pg_pool"] = pool
+    return pool
+
+def get_pg():
+    """Return a per-request PostgreSQL connection borrowed from the pool."""
+    if "pg" not in g:
+        g.pg = _pg_pool().getconn()
+    return g.pg
+
 def close_db(_e=None):
-    """Close the connection at the end of the request/app context."""
+    """Close the connections at the end of the request/app context."""
     db = g.pop("db", None)
     if db is not None:
         db.close()
+    for key in ("read_dbs", "shard_dbs"):
+        for db in g.pop(key, {}).values():
+            db.close()
+    pg = g.pop("pg", None)
+    if pg is not None:
+        pg.rollback()  # end the implicit read transaction (writes have committed already)
+        current_app.extensions["pg_pool"].putconn(pg)
+
+
+class ReplicaRefresher:
+    """
+    Background thread that copies the primary DB into a replica file every
+    `interval` seconds with the SQLite online backup API. The copy is written
+    next to the replica and renamed over it atomically, so readers opening a
+    connection always get a complete, consistent file. Every web worker runs
+    one: each writes its own temp file (pid + random suffix), so concurrent
+    refreshes never share a file and the last rename wins with a full copy.
+    """
+
+    def __init__(self, replica_path, interval: float = 5.0, primary_path=DB_PATH):
+        self.replica_path = Path(replica_path)
+        self.primary_path = Path(primary_path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self) -> None:
+        tmp = self.replica_path.with_name(f"{self.replica_path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            src = sqlite3.connect(str(self.primary_path), timeout=BUSY_TIMEOUT_MS / 1000)
+            dst = sqlite3.connect(str(tmp))
+            try:
+                src.backup(dst, pages=256)
+                dst.execute("PRAGMA journal_mode = DELETE;")  # replica is a plain single file
+            finally:
+                dst.close()
+                src.close()
+            os.replace(tmp, self.replica_path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                print(f"⚠️  replica refresh failed: {e}")
+
+    def start(self) -> "ReplicaRefresher":
+        self.replica_path.parent.mkdir(parents=True, exist_ok=True)
+        self.refresh()  # replica exists before the first read
+        self._thread = threading.Thread(target=self._run, name="replica-refresher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,233 @@
+# backend/dedupe.py
+"""
+Near-duplicate request detection with MinHash and LSH.
+
+A request's title + description is normalised (lowercase, runs of anything
+but letters and digits become one space) and cut into character SHINGLE-grams.
+A MinHash signature of NUM_PERM values estimates the Jaccard similarity of
+two shingle sets: the fraction of positions where the signatures agree.
+
+The signature is split into BANDS bands of ROWS values. Each band is hashed,
+together with the request's pin_id and district_id, into one LSH bucket
+(table request_lsh). Candidates for a new request are the requests sharing a
+bucket with it: one indexed lookup per band, whatever the table size. Only
+candidates whose estimated similarity reaches the threshold (default 0.5,
+DUPLICATE_THRESHOLD) are reported. With 16 bands of 4 rows, a pair at
+similarity 0.5 shares a bucket with probability ~0.65, a pair at 0.8 ~1.0,
+and a pair at 0.2 ~0.03.
+
+The index lives in the local SQLite database, like the jobs table.
+RequestsService updates it on create, update and delete, and create answers
+with "possible_duplicates": open requests (pending or accepted) of the same
+PIN and district.
+
+Usage:
+  python -m backend.dedupe                # index open requests not yet indexed, then report
+  python -m backend.dedupe --rebuild      # re-index every open request first
+  python -m backend.dedupe --threshold 0.7 --json
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BACKEND_DIR.parent
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 4
+DEFAULT_THRESHOLD = 0.5
+MAX_CANDIDATES = 50
+OPEN_STATUSES = ("pending", "accepted")
+
+_MERSENNE = (1 << 61) - 1
+_MAX32 = (1 << 32) - 1
+# Fixed seed: signatures must be comparable across processes and restarts
+_rng = random.Random(20240607)
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def shingles(text: str) -> set:
+    """crc32 of every SHINGLE-character window of the normalised text."""
+    norm = _NON_WORD.sub(" ", text.lower()).strip()
+    if len(norm) <= SHINGLE:
+        return {zlib.crc32(norm.encode())}
+    data = norm.encode()
+    return {zlib.crc32(data[i:i + SHINGLE]) for i in range(len(data) - SHINGLE + 1)}
+
+
+def signature(title: str, description: Optional[str] = None) -> array:
+    """MinHash signature (NUM_PERM uint32) of title + description."""
+    hashes = shingles(f"{title} {description or ''}")
+    return array("I", (min(((a * x + b) % _MERSENNE) & _MAX32 for x in hashes) for a, b in _PERMS))
+
+
+def similarity(sig_a, sig_b) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def buckets(sig, pin_id: int, district_id: int) -> List[int]:
+    """One LSH bucket (signed 64-bit, for an SQLite INTEGER) per band, scoped to the PIN and district."""
+    out = []
+    for band in range(BANDS):
+        key = struct.pack(f"<qqi{ROWS}I", pin_id, district_id, band, *sig[band * ROWS:(band + 1) * ROWS])
+        out.append(int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little", signed=True))
+    return out
+
+
+def to_blob(sig: array) -> bytes:
+    le = array("I", sig)
+    if sys.byteorder != "little":
+        le.byteswap()
+    return le.tobytes()
+
+
+def from_blob(blob: bytes) -> array:
+    sig = array("I")
+    sig.frombytes(blob)
+    if sys.byteorder != "little":
+        sig.byteswap()
+    return sig
+
+
+class DuplicateDetector:
+    """Keeps the MinHash/LSH index of requests and finds near-duplicates through it."""
+
+    def __init__(self, repository, threshold: float = DEFAULT_THRESHOLD):
+        if not 0 < threshold <= 1:
+            raise ValueError("Duplicate threshold must be in (0, 1].")
+        self.repository = repository
+        self.threshold = threshold
+
+    @staticmethod
+    def _key(row: Dict[str, Any]) -> Tuple[array, List[int]]:
+        sig = signature(row["title"], row.get("description"))
+        return sig, buckets(sig, row["pin_id"], row["district_id"])
+
+    def index(self, row: Dict[str, Any]) -> None:
+        sig, keys = self._key(row)
+        self.repository.replace(row["id"], to_blob(sig), keys)
+
+    def remove(self, *request_ids: int) -> None:
+        self.repository.remove(list(request_ids))
+
+    def find(self, row: Dict[str, Any], limit: int = MAX_CANDIDATES) -> List[Tuple[int, float]]:
+        """(request id, similarity) of indexed requests similar to row, most similar first."""
+        sig, keys = self._key(row)
+        ids = self.repository.candidates(keys, row.get("id") or 0, limit)
+        scored = [(rid, similarity(sig, from_blob(blob))) for rid, blob in self.repository.signatures(ids).items()]
+        hits = [(rid, round(s, 3)) for rid, s in scored if s >= self.threshold]
+        return sorted(hits, key=lambda h: (-h[1], -h[0]))
+
+    def clusters(self) -> List[List[int]]:
+        """
+        Groups of indexed request ids that are near-duplicates of each other
+        (threshold-similar pairs, joined transitively), largest first. Only
+        pairs sharing an LSH bucket are compared.
+        """
+        parent: Dict[int, int] = {}
+
+        def root(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        sigs: Dict[int, array] = {}
+        seen = set()
+        for members in self.repository.colliding_buckets():
+            missing = [m for m in members if m not in sigs]
+            sigs.update({rid: from_blob(blob) for rid, blob in self.repository.signatures(missing).items()})
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    pair = (min(a, b), max(a, b))
+                    if pair in seen or a not in sigs or b not in sigs:
+                        continue
+                    seen.add(pair)
+                    if similarity(sigs[a], sigs[b]) >= self.threshold:
+                        parent.setdefault(a, a)
+                        parent.setdefault(b, b)
+                        parent[root(pair[1])] = root(pair[0])
+        groups: Dict[int, List[int]] = {}
+        for rid in parent:
+            groups.setdefault(root(rid), []).append(rid)
+        return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), g[0]))
+
+
+def open_requests() -> Iterable[Dict[str, Any]]:
+    """Every open request, from the configured storage (run inside an app context)."""
+    from backend import storage
+
+    repo = storage.repository("requests")
+    for status in OPEN_STATUSES:
+        yield from repo.list_requests({"status": status})
+
+
+def backfill(detector: DuplicateDetector, rebuild: bool = False) -> Tuple[int, Dict[int, Dict[str, Any]]]:
+    """Index the open requests not yet indexed (all of them with rebuild); returns (indexed, rows by id)."""
+    if rebuild:
+        detector.repository.clear()
+    indexed = detector.repository.indexed_ids()
+    rows = {row["id"]: row for row in open_requests()}
+    added = 0
+    for rid, row in rows.items():
+        if rid not in indexed:
+            detector.index(row)
+            added += 1
+    stale = [rid for rid in indexed if rid not in rows]
+    detector.remove(*stale)
+    return added, rows
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Report near-duplicate open requests (MinHash/LSH).")
+    p.add_argument("--rebuild", action="store_true", help="Re-index every open request first")
+    p.add_argument("--threshold", type=float, default=None, help="Estimated Jaccard similarity (default: config)")
+    p.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = p.parse_args(argv)
+
+    from backend.app import create_app
+    from backend.db_session import get_db
+    from backend.repositories.minhash_repository import MinHashRepository
+
+    app = create_app()
+    with app.app_context():
+        threshold = args.threshold if args.threshold is not None else app.config["DUPLICATE_THRESHOLD"]
+        detector = DuplicateDetector(MinHashRepository(get_db()), threshold)
+        added, rows = backfill(detector, rebuild=args.rebuild)
+        report = [[{k: rows[rid][k] for k in ("id", "pin_id", "district_id", "status", "title")} for rid in group]
+                  for group in detector.clusters() if all(rid in rows for rid in group)]
+
+    if args.json:
+        print(json.dumps({"indexed": added, "open_requests": len(rows), "groups": report}, indent=2))
+        return 0
+    print(f"🔎 {len(rows)} open request(s), {added} newly indexed, {len(report)} duplicate group(s) "
+          f"at similarity >= {threshold}")
+    for group in report:
+        print(f"👥 PIN {group[0]['pin_id']}, district {group[0]['district_id']}:")
+        for row in group:
+            print(f"    #{row['id']} [{row['status']}] {row['title']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+# backend/export.py
+"""
+Database-wide export to compressed snapshot files for analytics.
+
+Instead of copying surething.db while the app is live, the exporter first
+takes a consistent snapshot with SQLite's online backup API. The copy is done
+a few pages at a time, so writers are only blocked for one small step. Every
+table is then streamed out of the snapshot in fixed-size chunks (fetchmany),
+so memory use stays flat however many rows there are:
+
+  - <table>.jsonl.gz   always (one JSON object per line, gzip)
+  - <table>.parquet    when --format parquet/both and pyarrow is installed
+  - manifest.json      tables, row counts, files and snapshot time
+
+accounts are exported without passwords. For requests and requests_archive
+(the finished requests moved out by backend.archive, with archived_at), the
+volunteers JSON ids are expanded to volunteer records inside SQLite (json_each).
+
+With REQUEST_SHARDS=region the requests live in the shard files: each is
+read in one transaction and merged into the snapshot copy, so exports cover
+every region. STORAGE_BACKEND=postgres is refused: its data is not in
+surething.db (use pg_dump there).
+
+Usage:
+  python -m backend.export --out exports/
+  python -m backend.export --out exports/ --format both --chunk-size 10000
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+BACKEND_DIR = Path(__file__).resolve().parent
+DB_PATH = BACKEND_DIR / "surething.db"
+
+DEFAULT_CHUNK_SIZE = 5000
+BACKUP_PAGES_PER_STEP = 256
+
+# Requests (live or archived) with the volunteers JSON ids expanded to records
+_REQUESTS_QUERY = """
+    SELECT r.id, r.pin_id, r.csr_id, r.category_id, r.district_id, r.title, r.description,
+           r.status, r.start_at, r.end_at, r.created_at,{extra}
+           (SELECT json_group_array(json_object('id', v.id, 'name', v.name, 'company_id', v.company_id))
+              FROM json_each(COALESCE(r.volunteers, '[]')) j
+              JOIN volunteers v ON v.id = j.value) AS volunteers
+    FROM {table} r
+    ORDER BY r.id
+"""
+
+# table -> SELECT used to export it (never include accounts.password)
+EXPORT_QUERIES: Dict[str, str] = {
+    "companies": "SELECT id, name FROM companies ORDER BY id",
+    "regions": "SELECT id, name FROM regions ORDER BY id",
+    "districts": "SELECT id, region_id, name FROM districts ORDER BY id",
+    "categories": "SELECT id, name, description FROM categories ORDER BY id",
+    "volunteers": "SELECT id, name, email, phone, company_id FROM volunteers ORDER BY id",
+    "accounts": "SELECT id, email, name, phone, role, status, company_id FROM accounts ORDER BY id",
+    "requests": _REQUESTS_QUERY.format(table="requests", extra=""),
+    # Finished requests moved out by backend.archive, with the time they were moved
+    "requests_archive": _REQUESTS_QUERY.format(table="requests_archive", extra=" r.archived_at,"),
+}
+JSON_COLUMNS = {"requests": ("volunteers",), "requests_archive": ("volunteers",)}
+
+
+def _pyarrow():
+    """Return (pyarrow, pyarrow.parquet) or (None, None) when not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None, None
+    return pyarrow, pq
+
+
+# -----------------------------
+# Snapshot
+# -----------------------------
+def request_shards(config: Mapping[str, Any], db_path: Path = DB_PATH) -> List[Path]:
+    """
+    The request shard files that go with db_path (snapshots, archiving), per the app
+    settings in `config` (app.config or os.environ): none unless
+    REQUEST_SHARDS=region. Raises ValueError for a non-SQLite STORAGE_BACKEND.
+    """
+    backend = config.get("STORAGE_BACKEND") or "sqlite"
+    if backend != "sqlite":
+        raise ValueError(f"With STORAGE_BACKEND={backend} the data is not in {db_path.name}.")
+    if (config.get("REQUEST_SHARDS") or "none") == "none":
+        return []
+    from backend.sharding import DEFAULT_SHARD_DIR, ShardMap, parse_shard_map
+    shards = ShardMap(db_path, config.get("SHARD_DIR") or DEFAULT_SHARD_DIR, parse_shard_map(config.get("SHARD_MAP")))
+    with closing(sqlite3.connect(str(db_path))) as main:
+        return shards.paths(main)
+
+
+def _merge_shards(snap_path: Path, shards: Sequence[Path]) -> None:
+    """Copy each shard's requests and requests_archive rows into the snapshot copy."""
+    conn = sqlite3.connect(f"file:{snap_path}", uri=True)
+    try:
+        # The copy is throwaway: no region lookups or R-tree upkeep on insert
+        triggers = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name IN ('requests', 'requests_archive')"
+        ).fetchall()
+        for (name,) in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+        for path in shards:
+            # One attach at a time (SQLite allows 10); one transaction per shard, so its two tables agree
+            conn.execute("ATTACH DATABASE ? AS shard", (f"file:{path}?mode=ro",))
+            try:
+                with conn:
+                    for table in ("requests", "requests_archive"):
+                        cols = ", ".join(r[1] for r in conn.execute(f"PRAGMA main.table_info({table})"))
+                        conn.execute(f"INSERT OR IGNORE INTO main.{table} ({cols}) SELECT {cols} FROM shard.{table}")
+            finally:
+                conn.execute("DETACH DATABASE shard")
+    finally:
+        conn.close()
+
+
+@contextmanager
+def snapshot(db_path: Path = DB_PATH, pages: int = BACKUP_PAGES_PER_STEP,
+             shards: Sequence[Path] = ()) -> Iterator[sqlite3.Connection]:
+    """
+    Yield a read-only connection to a point-in-time copy of db_path (backup
+    API), with the rows of the request shard files (see request_shards())
+    merged in. Each shard is consistent in itself, read right after the copy.
+    """
+    with tempfile.TemporaryDirectory(prefix="surething-export-") as tmp:
+        snap_path = Path(tmp) / "snapshot.db"
+        src = sqlite3.connect(str(db_path))
+        dst = sqlite3.connect(str(snap_path))
+        try:
+            # Copy `pages` pages per step; the source lock is released between steps.
+            src.backup(dst, pages=pages)
+        finally:
+            dst.close()
+            src.close()
+        if shards:
+            _merge_shards(snap_path, shards)
+        conn = sqlite3.connect(f"file:{snap_path}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+# -----------------------------
+# Row streaming
+# -----------------------------
+def iter_batches(conn: sqlite3.Connection, table: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Yield lists of row dicts for one export table, chunk_size rows at a time."""
+    json_cols = JSON_COLUMNS.get(table, ())
+    cur = conn.execute(EXPORT_QUERIES[table])
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            return
+        batch = []
+        for row in rows:
+            d = dict(row)
+            for col in json_cols:
+                d[col] = json.loads(d[col]) if d[col] else []
+            batch.append(d)
+        yield batch
+
+
+def iter_jsonl_gz(conn: sqlite3.Connection, table: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield gzip-compressed JSON Lines for a table, chunk by chunk (for HTTP streaming)."""
+    comp = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for batch in iter_batches(conn, table, chunk_size):
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch).encode("utf-8")
+        out = comp.compress(data)
+        if out:
+            yield out
+    yield comp.flush()
+
+
+# -----------------------------
+# Writers
+# -----------------------------
+def _write_jsonl(conn, table: str, out_dir: Path, chunk_size: int) -> int:
+    count = 0
+    with gzip.open(out_dir / f"{table}.jsonl.gz", "wt", encoding="utf-8") as f:
+        for batch in iter_batches(conn, table, chunk_size):
+            for r in batch:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            count += len(batch)
+    return count
+
+
+def _write_parquet(conn, table: str, out_dir: Path, chunk_size: int) -> int:
+    pa, pq = _pyarrow()
+    count = 0
+    writer = None
+    try:
+        for batch in iter_batches(conn, table, chunk_size):
+            for col in JSON_COLUMNS.get(table, ()):
+                # nested lists of objects are kept as JSON text for portability
+                for r in batch:
+                    r[col] = json.dumps(r[col], ensure_ascii=False)
+            if writer is None:
+                # explicit schema: a column that is all NULL in the first chunk must not become type null
+                schema = pa.schema([(c, pa.int64() if c == "id" or c.endswith("_id") else pa.string())
+                                    for c in batch[0]])
+                writer = pq.ParquetWriter(str(out_dir / f"{table}.parquet"), schema, compression="zstd")
+            record_batch = pa.RecordBatch.from_pylist(batch, schema=writer.schema)
+            writer.write_batch(record_batch)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def export_all(
+    out_dir: Path,
+    db_path: Path = DB_PATH,
+    fmt: str = "jsonl",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    tables: Optional[List[str]] = None,
+    shards: Sequence[Path] = (),
+) -> Dict[str, Any]:
+    """Export tables from a snapshot of db_path (plus request shards) into out_dir; return the manifest."""
+    if fmt not in ("jsonl", "parquet", "both"):
+        raise ValueError("format must be one of: jsonl, parquet, both")
+    if fmt in ("parquet", "both") and _pyarrow()[0] is None:
+        raise ValueError("Parquet export requires pyarrow (pip install pyarrow).")
+    tables = tables or list(EXPORT_QUERIES)
+    unknown = [t for t in tables if t not in EXPORT_QUERIES]
+    if unknown:
+        raise ValueError(f"Unknown export table(s): {', '.join(unknown)}")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    manifest: Dict[str, Any] = {
+        "snapshot_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tables": {},
+    }
+    with snapshot(db_path, shards=shards) as conn:
+        for table in tables:
+            entry: Dict[str, Any] = {"files": []}
+            if fmt in ("jsonl", "both"):
+                entry["rows"] = _write_jsonl(conn, table, out_dir, chunk_size)
+                entry["files"].append(f"{table}.jsonl.gz")
+            if fmt in ("parquet", "both"):
+                entry["rows"] = _write_parquet(conn, table, out_dir, chunk_size)
+                entry["files"].append(f"{table}.parquet")
+            manifest["tables"][table] = entry
+    manifest["duration_s"] = round(time.perf_counter() - started, 3)
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Export a snapshot of the database to compressed files.")
+    p.add_argument("--db", type=Path, default=DB_PATH, help="SQLite DB (default: backend/surething.db)")
+    p.add_argument("--out", type=Path, required=True, help="Output directory")
+    p.add_argument("--format", choices=("jsonl", "parquet", "both"), default="jsonl")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    p.add_argument("--table", action="append", dest="tables", help="Only export this table (repeatable)")
+    args = p.parse_args(argv)
+
+    try:
+        shards = request_shards(os.environ, args.db)
+        manifest = export_all(args.out, args.db, args.format, args.chunk_size, args.tables, shards)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    for table, entry in manifest["tables"].items():
+        print(f"✅ {table}: {entry['rows']} rows -> {', '.join(entry['files'])}")
+    print(f"🎉 Export finished in {manifest['duration_s']}s -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
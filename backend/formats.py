@@ -0,0 +1,103 @@
+# backend/formats.py
+"""
+Response formats for list endpoints, chosen by the Accept header.
+
+  application/json                      default (also for */* or no Accept)
+  application/msgpack                   MessagePack array of maps (pip install msgpack)
+  application/vnd.apache.arrow.stream   Arrow IPC stream, one column per field (pip install pyarrow)
+
+A format whose library is not installed is simply not offered, so its
+clients get JSON (Content-Type says which). Responses carry Vary: Accept.
+
+Arrow is columnar: the rows are transposed into one array per field (types
+inferred over the whole column, so a field that is NULL in the first rows
+still gets its real type) and written as record batches of BATCH_ROWS rows.
+Nested values (a request's volunteer ids) become list columns.
+
+Decoding, e.g. with requests:
+  msgpack.unpackb(resp.content)
+  pyarrow.ipc.open_stream(resp.content).read_all()        # -> pyarrow.Table
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from flask import Response, jsonify, request
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_LEGACY = "application/x-msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+BATCH_ROWS = 4096
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def offered() -> List[str]:
+    """Media types this process can produce, JSON first (it wins ties such as */*)."""
+    types = [JSON]
+    if _msgpack() is not None:
+        types += [MSGPACK, MSGPACK_LEGACY]
+    if _pyarrow() is not None:
+        types.append(ARROW)
+    return types
+
+
+def negotiate() -> str:
+    """The best format for the current request's Accept header; JSON when nothing else matches."""
+    if not request.accept_mimetypes:
+        return JSON
+    return request.accept_mimetypes.best_match(offered(), default=JSON)
+
+
+def _isoformat(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def to_msgpack(rows: List[Dict[str, Any]]) -> bytes:
+    return _msgpack().packb(rows, use_bin_type=True, default=_isoformat)
+
+
+def to_arrow(rows: List[Dict[str, Any]], batch_rows: int = BATCH_ROWS) -> bytes:
+    """
+    Arrow IPC stream of rows, written in batches of batch_rows. The columns
+    are the union of the rows' keys (first-seen order); a row without a key
+    gets NULL there.
+    """
+    pa = _pyarrow()
+    columns = list(dict.fromkeys(c for r in rows for c in r))
+    table = pa.table({c: [r.get(c) for r in rows] for c in columns})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=batch_rows)
+    return sink.getvalue().to_pybytes()
+
+
+def list_response(rows: List[Dict[str, Any]], status: int = 200, fmt: Optional[str] = None) -> Response:
+    """rows as JSON, MessagePack or Arrow, per the Accept header (or fmt)."""
+    fmt = fmt or negotiate()
+    if fmt == JSON:
+        resp = jsonify(rows)
+    elif fmt in (MSGPACK, MSGPACK_LEGACY):
+        resp = Response(to_msgpack(rows), mimetype=fmt)
+    else:
+        resp = Response(to_arrow(rows), mimetype=ARROW)
+    resp.status_code = status
+    resp.vary.add("Accept")
+    return resp
@@ -0,0 +1,119 @@
+# backend/idempotency.py
+"""
+Idempotency-Key support for non-idempotent endpoints (POST).
+
+A client that retries a POST with the same `Idempotency-Key` header gets the
+stored response of the first attempt instead of re-running validation,
+password hashing and inserts. Keys are persisted in `idempotency_keys`, so
+they work across workers, and are scoped per client (remote address, see
+TRUSTED_PROXY_HOPS), method and path:
+
+  - first request:  claims the key (INSERT on the primary key), runs the view,
+                    stores status + body, marks the key 'completed'.
+  - retry:          replays the stored response (header `Idempotent-Replayed`).
+  - concurrent dup: waits for the first request to finish, then replays.
+  - failure:        if the view raises or returns 5xx the claim is released,
+                    so the client can retry for real.
+  - crash:          a claim still in progress after IDEMPOTENCY_LEASE_SECONDS
+                    (its worker died before completing or releasing it) is
+                    taken over by the next retry.
+
+Reusing a key with a different body is rejected with 422.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from flask import Response, current_app, jsonify, request
+
+from backend.db_session import get_db
+from backend.repositories.idempotency_repository import IdempotencyRepository
+
+HEADER = "Idempotency-Key"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_WAIT_SECONDS = 10.0
+DEFAULT_LEASE_SECONDS = 60
+POLL_INTERVAL = 0.05
+PRUNE_EVERY = 60  # seconds between TTL prunes per process
+
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+def _maybe_prune(repo: IdempotencyRepository, now: int, ttl: int) -> None:
+    global _last_prune
+    # One thread per process prunes; the others skip rather than wait
+    if now - _last_prune < PRUNE_EVERY or not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        if now - _last_prune >= PRUNE_EVERY:
+            _last_prune = now
+            repo.prune(now - ttl)
+    finally:
+        _prune_lock.release()
+
+
+def _replay(row) -> Response:
+    resp = Response(row["response_body"], status=row["response_status"], mimetype="application/json")
+    resp.headers["Idempotent-Replayed"] = "true"
+    return resp
+
+
+def _wait_for_completion(repo: IdempotencyRepository, scope: str, key: str, timeout: float):
+    """Block until the request owning the key finishes; None on timeout or release."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        row = repo.get(scope, key)
+        if row is None or row["status"] == "completed":
+            return row
+        time.sleep(POLL_INTERVAL)
+    return None
+
+
+def idempotent(view):
+    """Decorator: honour the Idempotency-Key header on a view."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+
+        ttl = int(current_app.config.get("IDEMPOTENCY_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        wait = float(current_app.config.get("IDEMPOTENCY_WAIT_SECONDS", DEFAULT_WAIT_SECONDS))
+        lease = int(current_app.config.get("IDEMPOTENCY_LEASE_SECONDS", DEFAULT_LEASE_SECONDS))
+        scope = f"{request.remote_addr} {request.method} {request.path}"
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        repo = IdempotencyRepository(get_db())
+        now = int(time.time())
+        _maybe_prune(repo, now, ttl)
+
+        owner = repo.claim(scope, key, fingerprint, now) or repo.take_over(scope, key, fingerprint, now, now - lease)
+        if not owner:
+            row = repo.get(scope, key)
+            if row and row["fingerprint"] != fingerprint:
+                return jsonify({"error": f"{HEADER} was already used with a different request body"}), 422
+            if row and row["status"] == "in_progress":
+                row = _wait_for_completion(repo, scope, key, wait)
+            if row is None:
+                # The first attempt failed and released the key, or is still running.
+                return jsonify({"error": f"A request with this {HEADER} is still in progress"}), 409
+            return _replay(row)
+
+        # `now` identifies this claim: a late owner whose claim was taken over changes nothing
+        try:
+            resp = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            repo.release(scope, key, now)
+            raise
+
+        if resp.status_code >= 500:
+            repo.release(scope, key, now)
+        else:
+            repo.complete(scope, key, now, resp.status_code, resp.get_data(as_text=True))
+        return resp
+
+    return wrapper
@@ -0,0 +1,312 @@
+# backend/jobs.py
+"""
+Durable background jobs: side effects (notifications) run in a worker
+process instead of on the request path.
+
+Services queue a job, one small INSERT into the local `jobs` table, in the
+same transaction as the write it belongs to, so a crash cannot keep the
+write and lose its job. That needs the write to go to the same SQLite
+database: the status batcher and request creation on plain SQLite. Where
+the write goes elsewhere (PostgreSQL, a region shard) or commits on its
+own, the job is queued *held* (due only after JobQueue.hold_s), released
+once the write commits and cancelled if it fails; after a crash in between
+it runs when the hold ends, and the handler checks the row's current state.
+A request created as accepted on PostgreSQL or shards is the exception: it
+is queued right after its commit. The worker leases due jobs in batches,
+runs the handler registered for each job's kind, and then:
+
+  - success   the job is deleted
+  - failure   it is retried after an exponential backoff (with jitter)
+  - attempts  used up: it stays as a 'dead' letter (--dead lists them,
+              --requeue-dead gives them a fresh set of attempts)
+
+A lease expires after JOB_LEASE_SECONDS, so the jobs of a crashed worker run
+again. Delivery is at least once: handlers must tolerate a re-run.
+
+Jobs are only deleted by a worker: without one running they accumulate
+(--stats shows the backlog). --purge-stale DAYS drops queued jobs that have
+been due for longer than that, e.g. on a deployment without notifications.
+
+Messages go to a pluggable sink (JOB_SINK): "file" appends JSON lines to
+JOB_SINK_PATH (the default, for development and tests), "smtp" sends mail
+through SMTP_HOST:SMTP_PORT (e.g. a local SMTP stand-in).
+
+Usage:
+  python -m backend.jobs                 # run a worker until interrupted
+  python -m backend.jobs --once          # run every due job, then exit
+  python -m backend.jobs --stats | --dead | --requeue-dead | --purge-dead
+  python -m backend.jobs --purge-stale 30  # queued jobs due for over 30 days
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BACKEND_DIR.parent
+DEFAULT_SINK_PATH = BACKEND_DIR / "outbox.jsonl"
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_HOLD_SECONDS = 60
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 3600
+
+
+class JobQueue:
+    """Enqueue side of the queue, used by services (on the request's SQLite connection)."""
+
+    def __init__(self, repository, max_attempts: int = DEFAULT_MAX_ATTEMPTS, hold_s: int = DEFAULT_HOLD_SECONDS):
+        self.repository = repository
+        self.max_attempts = max_attempts
+        self.hold_s = hold_s
+
+    def add(self, kind: str, payload: Dict[str, Any], delay_s: int = 0) -> int:
+        """Queue a job in the connection's open transaction; it commits with the caller's write."""
+        if kind not in HANDLERS:
+            raise ValueError(f"Unknown job kind {kind!r}.")
+        now = int(time.time())
+        return self.repository.add(kind, payload, now + delay_s, self.max_attempts, now)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], delay_s: int = 0) -> int:
+        if kind not in HANDLERS:
+            raise ValueError(f"Unknown job kind {kind!r}.")
+        now = int(time.time())
+        return self.repository.enqueue(kind, payload, now + delay_s, self.max_attempts, now)
+
+    def hold(self, kind: str, payload: Dict[str, Any]) -> int:
+        """Queue a job for a write committed elsewhere: due after hold_s unless released first."""
+        return self.enqueue(kind, payload, self.hold_s)
+
+    def release(self, job_ids: List[int]) -> None:
+        self.repository.release(job_ids, int(time.time()))
+
+    def cancel(self, job_ids: List[int]) -> None:
+        self.repository.cancel(job_ids)
+
+
+# -----------------------------
+# Sinks
+# -----------------------------
+class FileSink:
+    """Appends each message as one JSON line (development and tests)."""
+
+    def __init__(self, path=DEFAULT_SINK_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def send(self, message: Dict[str, Any]) -> None:
+        line = json.dumps(message, separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class SMTPSink:
+    """Sends each message as an email (one connection per message)."""
+
+    def __init__(self, host: str, port: int = 25, sender: str = "noreply@surething.local", timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.timeout = timeout
+
+    def send(self, message: Dict[str, Any]) -> None:
+        import smtplib
+        from email.message import EmailMessage
+
+        mail = EmailMessage()
+        mail["From"] = self.sender
+        mail["To"] = message["to"]
+        mail["Subject"] = message["subject"]
+        mail.set_content(message["body"])
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(mail)
+
+
+def make_sink(config: Dict[str, Any]):
+    """Build the sink named by JOB_SINK (file | smtp)."""
+    name = config.get("JOB_SINK", "file")
+    if name == "file":
+        return FileSink(config.get("JOB_SINK_PATH") or DEFAULT_SINK_PATH)
+    if name == "smtp":
+        return SMTPSink(config.get("SMTP_HOST", "localhost"), int(config.get("SMTP_PORT", 25)),
+                        config.get("SMTP_FROM") or "noreply@surething.local")
+    raise RuntimeError(f"Unknown JOB_SINK {name!r} (expected file or smtp)")
+
+
+# -----------------------------
+# Handlers: kind -> fn(payload, sink), run inside an app context
+# -----------------------------
+HANDLERS: Dict[str, Callable[[Dict[str, Any], Any], None]] = {}
+
+
+def handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def status_jobs(req_id: int, old_status: Optional[str], new_status: Optional[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """The (kind, payload) jobs of a request's status change."""
+    if new_status == "accepted" and old_status != new_status:
+        return [("request.accepted", {"request_id": req_id})]
+    return []
+
+
+@handler("request.accepted")
+def notify_request_accepted(payload: Dict[str, Any], sink) -> None:
+    """Tell the PIN and the assigned volunteers that a request was accepted."""
+    from backend import storage
+
+    req = storage.repository("requests").get_request_by_id(payload["request_id"])
+    if req is None or req["status"] != "accepted":
+        return  # deleted or moved on since: nothing left to announce
+    subject = f"Request #{req['id']} accepted: {req['title']}"
+    pin = storage.repository("accounts").get_account_by_id(req["pin_id"])
+    if pin and pin.get("email"):
+        sink.send({"to": pin["email"], "subject": subject, "kind": "request.accepted", "request_id": req["id"],
+                   "body": f"Your request \"{req['title']}\" was accepted; volunteers are on their way."})
+    for volunteer in storage.repository("companies").list_volunteers_by_ids(req.get("volunteers") or []):
+        if volunteer.get("email"):
+            sink.send({"to": volunteer["email"], "subject": subject, "kind": "request.accepted",
+                       "request_id": req["id"],
+                       "body": f"You were assigned to request \"{req['title']}\" starting {req.get('start_at')}."})
+
+
+# -----------------------------
+# Worker
+# -----------------------------
+def backoff_s(attempts: int, base: float = BACKOFF_BASE_SECONDS, cap: float = BACKOFF_MAX_SECONDS) -> int:
+    """Delay before the next attempt: base * 2^(attempts-1), capped, with +-20% jitter."""
+    delay = min(cap, base * 2 ** max(0, attempts - 1))
+    return max(1, int(delay * random.uniform(0.8, 1.2)))
+
+
+class JobWorker:
+    """Leases due jobs and runs their handlers; one per worker process (or thread)."""
+
+    def __init__(self, app, sink=None, name: Optional[str] = None, batch_size: int = 10,
+                 lease_s: int = DEFAULT_LEASE_SECONDS, poll_s: float = 1.0):
+        self.app = app
+        self.sink = sink or make_sink(app.config)
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.batch_size = batch_size
+        self.lease_s = lease_s
+        self.poll_s = poll_s
+        self.stats = {"done": 0, "retried": 0, "dead": 0}
+
+    def _repo(self):
+        from backend.db_session import get_db
+        from backend.repositories.jobs_repository import JobsRepository
+        return JobsRepository(get_db())
+
+    def run_once(self) -> int:
+        """Run one batch of due jobs; return how many were claimed."""
+        with self.app.app_context():
+            repo = self._repo()
+            jobs = repo.claim(self.name, int(time.time()), self.lease_s, self.batch_size)
+            for job in jobs:
+                self._run(repo, job)
+            return len(jobs)
+
+    def _run(self, repo, job: Dict[str, Any]) -> None:
+        try:
+            if job["attempts"] > job["max_attempts"]:
+                raise RuntimeError("lease expired on the last attempt")
+            fn = HANDLERS.get(job["kind"])
+            if fn is None:
+                raise RuntimeError(f"no handler for job kind {job['kind']!r}")
+            fn(job["payload"], self.sink)
+        except Exception as e:
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            if job["attempts"] >= job["max_attempts"]:
+                repo.fail(job["id"], self.name, error, None)
+                self.stats["dead"] += 1
+                print(f"☠️  job {job['id']} ({job['kind']}) dead after {job['attempts']} attempt(s): {error}")
+            else:
+                repo.fail(job["id"], self.name, error, int(time.time()) + backoff_s(job["attempts"]))
+                self.stats["retried"] += 1
+            return
+        repo.complete(job["id"], self.name)
+        self.stats["done"] += 1
+
+    def drain(self) -> int:
+        """Run batches until no job is due; return how many were claimed."""
+        total = 0
+        while True:
+            n = self.run_once()
+            if n == 0:
+                return total
+            total += n
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if self.run_once() == 0:
+                stop.wait(self.poll_s)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Run background jobs (notifications) off the request path.")
+    p.add_argument("--once", action="store_true", help="Run every due job, then exit")
+    p.add_argument("--batch-size", type=int, default=10)
+    p.add_argument("--poll", type=float, default=1.0, help="Seconds between polls when idle")
+    p.add_argument("--stats", action="store_true", help="Print job counts per status")
+    p.add_argument("--dead", action="store_true", help="List dead letters")
+    p.add_argument("--requeue-dead", action="store_true", help="Retry every dead letter")
+    p.add_argument("--purge-dead", action="store_true", help="Delete every dead letter")
+    p.add_argument("--purge-stale", type=float, metavar="DAYS",
+                   help="Delete queued jobs that have been due for more than DAYS (no worker ran them)")
+    args = p.parse_args(argv)
+
+    from backend.app import create_app
+    app = create_app()
+    worker = JobWorker(app, batch_size=args.batch_size, lease_s=app.config["JOB_LEASE_SECONDS"], poll_s=args.poll)
+
+    if args.stats or args.dead or args.requeue_dead or args.purge_dead or args.purge_stale is not None:
+        with app.app_context():
+            repo = worker._repo()
+            if args.requeue_dead:
+                print(f"🔁 requeued {repo.requeue_dead(int(time.time()))} dead job(s)")
+            if args.purge_dead:
+                print(f"🗑️  purged {repo.purge_dead()} dead job(s)")
+            if args.purge_stale is not None:
+                before = int(time.time() - args.purge_stale * 86400)
+                print(f"🗑️  purged {repo.purge_stale(before)} stale queued job(s)")
+            if args.dead:
+                for job in repo.list_dead():
+                    print(f"☠️  {job['id']} {job['kind']} {json.dumps(job['payload'])}: {job['last_error']}")
+            if args.stats:
+                print(json.dumps(repo.counts()))
+        return 0
+
+    if args.once:
+        n = worker.drain()
+        print(f"✅ ran {n} job(s): {worker.stats}")
+        return 0
+    print(f"👷 job worker {worker.name} polling every {args.poll}s (Ctrl+C to stop)")
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        print(f"👋 stopped: {worker.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
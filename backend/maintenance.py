@@ -0,0 +1,239 @@
+# backend/maintenance.py
+"""
+Online maintenance for the SQLite database.
+
+Every step is short and runs on its own autocommit connection (with a busy
+timeout), so it can run next to the live app:
+
+  1. quick_check          PRAGMA quick_check; later steps are skipped if it fails
+  2. optimize             PRAGMA optimize, or a full ANALYZE when the DB has no
+                          statistics yet (or with --analyze)
+  3. incremental vacuum   return free pages to the OS, --step-pages at a time,
+                          each chunk its own write transaction (needs
+                          auto_vacuum=INCREMENTAL, set by db.sql on new DBs)
+  4. checkpoint           PRAGMA wal_checkpoint(TRUNCATE) to shrink the -wal file
+
+Durations and file sizes before/after are reported. Existing databases
+created before auto_vacuum=INCREMENTAL can be converted once with
+--enable-incremental-vacuum (a full VACUUM: writers wait until it finishes).
+
+Usage:
+  python -m backend.maintenance
+  python -m backend.maintenance --analyze --step-pages 500 --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent
+DB_PATH = BACKEND_DIR / "surething.db"
+
+BUSY_TIMEOUT_S = 5.0
+DEFAULT_STEP_PAGES = 1000
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    # autocommit: each PRAGMA is its own short transaction
+    return sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT_S, isolation_level=None)
+
+
+def file_sizes(conn: sqlite3.Connection, db_path: Path) -> Dict[str, int]:
+    """DB/WAL file sizes plus page accounting."""
+    wal = Path(f"{db_path}-wal")
+    return {
+        "db_bytes": db_path.stat().st_size if db_path.exists() else 0,
+        "wal_bytes": wal.stat().st_size if wal.exists() else 0,
+        "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+        "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+        "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+    }
+
+
+# -----------------------------
+# Steps
+# -----------------------------
+def quick_check(conn: sqlite3.Connection) -> Dict[str, Any]:
+    rows = [r[0] for r in conn.execute("PRAGMA quick_check").fetchall()]
+    return {"ok": rows == ["ok"], "messages": rows[:20]}
+
+
+def optimize(conn: sqlite3.Connection, full_analyze: bool = False) -> Dict[str, Any]:
+    """
+    PRAGMA optimize only re-analyzes tables it considers stale, and (before
+    SQLite 3.46) never analyzes a DB that has no statistics at all, so the
+    first run does a full ANALYZE.
+    """
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    ).fetchone() and conn.execute("SELECT 1 FROM sqlite_stat1 LIMIT 1").fetchone()
+    if full_analyze or not has_stats:
+        conn.execute("ANALYZE")
+        return {"mode": "analyze"}
+    conn.execute("PRAGMA analysis_limit = 1000")
+    conn.execute("PRAGMA optimize")
+    return {"mode": "optimize"}
+
+
+def incremental_vacuum(conn: sqlite3.Connection, step_pages: int = DEFAULT_STEP_PAGES,
+                       max_pages: Optional[int] = None, pause_s: float = 0.0) -> Dict[str, Any]:
+    """Free up to max_pages (default: all) free pages, step_pages per write transaction."""
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode != AUTO_VACUUM_INCREMENTAL:
+        return {"skipped": "auto_vacuum is not INCREMENTAL (run once with --enable-incremental-vacuum)"}
+    freed = steps = 0
+    while max_pages is None or freed < max_pages:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free == 0:
+            break
+        n = min(step_pages, free) if max_pages is None else min(step_pages, free, max_pages - freed)
+        # executescript steps the pragma to completion; execute() would free one page only
+        conn.executescript(f"PRAGMA incremental_vacuum({int(n)});")
+        freed += free - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        steps += 1
+        if pause_s:
+            time.sleep(pause_s)
+    return {"freed_pages": freed, "steps": steps}
+
+
+def checkpoint(conn: sqlite3.Connection) -> Dict[str, Any]:
+    busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    # busy=1: a reader still needed old frames; the next run will finish the job
+    return {"busy": bool(busy), "log_frames": log_frames, "checkpointed": checkpointed}
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Switch an existing DB to auto_vacuum=INCREMENTAL (rewrites the file with VACUUM)."""
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return {"auto_vacuum": conn.execute("PRAGMA auto_vacuum").fetchone()[0]}
+
+
+# -----------------------------
+# Orchestration
+# -----------------------------
+def _timed(report: Dict[str, Any], name: str, fn, *args, **kwargs) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    result["duration_s"] = round(time.perf_counter() - started, 3)
+    report["steps"][name] = result
+    return result
+
+
+def run_maintenance(
+    db_path: Path = DB_PATH,
+    full_analyze: bool = False,
+    step_pages: int = DEFAULT_STEP_PAGES,
+    max_vacuum_pages: Optional[int] = None,
+    pause_s: float = 0.0,
+    enable_incremental: bool = False,
+) -> Dict[str, Any]:
+    """Run all maintenance steps on db_path; return a report with durations and sizes."""
+    if step_pages < 1:
+        raise ValueError("step_pages must be >= 1.")
+    if not Path(db_path).exists():
+        raise ValueError(f"Database not found: {db_path}")
+    db_path = Path(db_path)
+    started = time.perf_counter()
+    conn = _connect(db_path)
+    try:
+        report: Dict[str, Any] = {"db": str(db_path), "before": file_sizes(conn, db_path), "steps": {}}
+        check = _timed(report, "quick_check", quick_check, conn)
+        if check["ok"]:
+            if enable_incremental:
+                _timed(report, "enable_incremental_vacuum", enable_incremental_vacuum, conn)
+            _timed(report, "optimize", optimize, conn, full_analyze)
+            _timed(report, "incremental_vacuum", incremental_vacuum, conn, step_pages, max_vacuum_pages, pause_s)
+            _timed(report, "checkpoint", checkpoint, conn)
+        report["after"] = file_sizes(conn, db_path)
+    finally:
+        conn.close()
+    report["ok"] = check["ok"]
+    report["duration_s"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+class MaintenanceScheduler:
+    """
+    Background thread that runs run_maintenance() every `interval` seconds
+    (MAINTENANCE_INTERVAL_SECONDS). With several worker processes, prefer one
+    cron entry for `python -m backend.maintenance` instead.
+    """
+
+    def __init__(self, interval: float, db_path=DB_PATH, **options):
+        self.interval = interval
+        self.db_path = Path(db_path)
+        self.options = options
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.last_report = run_maintenance(self.db_path, **self.options)
+                if not self.last_report["ok"]:
+                    print(f"⚠️  maintenance: quick_check failed: {self.last_report['steps']['quick_check']['messages']}")
+            except (sqlite3.Error, ValueError) as e:
+                print(f"⚠️  maintenance failed: {e}")
+
+    def start(self) -> "MaintenanceScheduler":
+        self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.2f} MB"
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Online SQLite maintenance: quick_check, optimize, vacuum, checkpoint.")
+    p.add_argument("--db", type=Path, default=DB_PATH, help="SQLite DB (default: backend/surething.db)")
+    p.add_argument("--analyze", action="store_true", help="Full ANALYZE instead of PRAGMA optimize")
+    p.add_argument("--step-pages", type=int, default=DEFAULT_STEP_PAGES, help="Pages freed per vacuum transaction")
+    p.add_argument("--max-vacuum-pages", type=int, default=None, help="Stop after freeing this many pages")
+    p.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between vacuum steps")
+    p.add_argument("--enable-incremental-vacuum", action="store_true",
+                   help="One-off: convert an existing DB to auto_vacuum=INCREMENTAL (full VACUUM)")
+    p.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = p.parse_args(argv)
+
+    try:
+        report = run_maintenance(args.db, args.analyze, args.step_pages, args.max_vacuum_pages,
+                                 args.pause, args.enable_incremental_vacuum)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0 if report["ok"] else 1
+
+    for name, step in report["steps"].items():
+        details = ", ".join(f"{k}={v}" for k, v in step.items() if k != "duration_s")
+        print(f"{'✅' if step.get('ok', True) else '❌'} {name}: {details} ({step['duration_s']}s)")
+    before, after = report["before"], report["after"]
+    print(f"📦 db {_mb(before['db_bytes'])} -> {_mb(after['db_bytes'])}, "
+          f"wal {_mb(before['wal_bytes'])} -> {_mb(after['wal_bytes'])}, "
+          f"free pages {before['freelist_count']} -> {after['freelist_count']}")
+    print(f"{'🎉' if report['ok'] else '❌'} Maintenance finished in {report['duration_s']}s")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# backend/profiling.py
+"""
+On-demand request profiling (PROFILING=on).
+
+An admin request (X-Admin-Token) with `X-Profile: 1` or `?profile=1` runs
+under cProfile. Requests can also be sampled: PROFILE_SAMPLE_RATE=0.01
+profiles about 1% of all requests, whoever sends them. Each profiled
+request:
+
+  - is saved as PROFILE_DIR/<id>.pstats (the last PROFILE_KEEP are kept).
+    Open it with pstats, snakeviz, or gprof2dot/flameprof for a flame graph.
+  - answers with X-Profile-Id: <id> and Server-Timing: profile;dur=<ms>.
+  - is added to a per-process aggregate of hot functions across samples.
+
+One request per process is profiled at a time (since Python 3.12 cProfile
+allows only one active profiler): a request that would be profiled while
+another one is runs unprofiled instead of waiting.
+
+GET /api/admin/profiles lists the saved profiles and the aggregate, and
+GET /api/admin/profiles/<id> returns one profile's top functions (or the
+.pstats file with ?format=pstats).
+
+With PROFILING=off (the default) no hooks are installed, so requests pay
+nothing.
+"""
+from __future__ import annotations
+
+import cProfile
+import pstats
+import random
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, g, request
+
+from backend.auth import is_admin_request
+
+PROFILE_HEADER = "X-Profile"
+DEFAULT_KEEP = 50
+TOP_N = 25
+SORT_KEYS = ("tottime", "cumtime")
+
+
+def top_functions(stats: pstats.Stats, sort: str = "tottime", limit: int = TOP_N) -> List[Dict[str, Any]]:
+    """The hottest functions of a pstats.Stats as JSON-friendly rows."""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_KEYS)}.")
+    index = 2 if sort == "tottime" else 3
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][index], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": ncalls,
+            "tottime_s": round(tottime, 6),
+            "cumtime_s": round(cumtime, 6),
+        }
+        for (filename, line, name), (_, ncalls, tottime, cumtime, _) in rows
+    ]
+
+
+class Profiler:
+    """Profiles flagged or sampled requests and keeps their .pstats files and an aggregate."""
+
+    def __init__(self, profile_dir, sample_rate: float = 0.0, keep: int = DEFAULT_KEEP):
+        self.profile_dir = Path(profile_dir)
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self._lock = threading.Lock()
+        # Held while a request is being profiled
+        self._active = threading.Lock()
+        self._aggregate: Optional[pstats.Stats] = None
+        self.samples = 0
+        self.by_endpoint: Dict[str, int] = {}
+
+    def _wanted(self) -> bool:
+        flagged = request.headers.get(PROFILE_HEADER) or request.args.get("profile")
+        if flagged and flagged.lower() in ("1", "true", "yes") and is_admin_request():
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _before(self) -> None:
+        if self._wanted() and self._active.acquire(blocking=False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # another profiler (not ours) is active
+                self._active.release()
+                return
+            g.profile = (profile, time.perf_counter())
+
+    def _stop(self):
+        """Disable this request's profiler, if any, and let the next request be profiled."""
+        started = g.pop("profile", None)
+        if started is not None:
+            started[0].disable()
+            self._active.release()
+        return started
+
+    def _after(self, response):
+        started = self._stop()
+        if started is None:
+            return response
+        profile, t0 = started
+        duration_ms = (time.perf_counter() - t0) * 1000
+        now = time.time()
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}{int(now * 1000) % 1000:03d}-{uuid.uuid4().hex[:8]}"
+        self._record(profile, profile_id, request.endpoint or "unknown")
+        response.headers["X-Profile-Id"] = profile_id
+        response.headers["Server-Timing"] = f"profile;dur={duration_ms:.1f}"
+        return response
+
+    def _teardown(self, exc) -> None:
+        # after_request is skipped when a request fails with an unhandled exception
+        self._stop()
+
+    def _record(self, profile: cProfile.Profile, profile_id: str, endpoint: str) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(self.profile_dir / f"{profile_id}.pstats"))
+        with self._lock:
+            if self._aggregate is None:
+                self._aggregate = pstats.Stats(profile)
+            else:
+                self._aggregate.add(profile)
+            self.samples += 1
+            self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + 1
+        for old in self.saved()[self.keep:]:
+            old.unlink(missing_ok=True)
+
+    def saved(self) -> List[Path]:
+        """Saved profiles, newest first."""
+        if not self.profile_dir.exists():
+            return []
+        return sorted(self.profile_dir.glob("*.pstats"), key=lambda p: p.name, reverse=True)
+
+    def path_for(self, profile_id: str) -> Optional[Path]:
+        path = self.profile_dir / f"{Path(profile_id).name}.pstats"
+        return path if path.exists() else None
+
+    def summary(self, sort: str = "tottime", limit: int = TOP_N) -> Dict[str, Any]:
+        with self._lock:
+            hot = top_functions(self._aggregate, sort, limit) if self._aggregate is not None else []
+            return {"samples": self.samples, "by_endpoint": dict(self.by_endpoint),
+                    "profiles": [p.stem for p in self.saved()], "hot_functions": hot}
+
+    def init_app(self, app: Flask) -> "Profiler":
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+        app.extensions["profiler"] = self
+        return self
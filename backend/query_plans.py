@@ -0,0 +1,370 @@
+# backend/query_plans.py
+"""
+EXPLAIN QUERY PLAN regression check for every repository query.
+
+Builds a throw-away SQLite database from db.sql, fills it with a large
+synthetic data set, then drives each repository method while capturing the
+SQL it runs (via sqlite3's trace callback). Every captured SELECT/UPDATE/DELETE
+is re-run under EXPLAIN QUERY PLAN, both before and after ANALYZE, and the
+check fails when a plan contains:
+
+  - "USE TEMP B-TREE"  (a sort or DISTINCT the indexes should have provided)
+  - "SCAN <table>"     (a full table scan), unless the call is declared as an
+                        inherently full listing (e.g. list_accounts()).
+                        R-tree lookups ("VIRTUAL TABLE INDEX") are index searches.
+                        Likewise a sort, for calls declared to sort a bounded
+                        set of index lookups (several CSRs' requests).
+
+Usage:
+  python -m backend.query_plans               # default size
+  python -m backend.query_plans --requests 200000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BACKEND_DIR.parent
+DB_SQL = BACKEND_DIR / "db.sql"
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.repositories.accounts_repository import AccountsRepository
+from backend.repositories.categories_repository import CategoriesRepository
+from backend.repositories.companies_repository import CompaniesRepository
+from backend.repositories.districts_repository import DistrictsRepository
+from backend.repositories.idempotency_repository import IdempotencyRepository
+from backend.repositories.jobs_repository import JobsRepository
+from backend.repositories.minhash_repository import MinHashRepository
+from backend.repositories.references_repository import ReferencesRepository
+from backend.repositories.requests_repository import RequestsRepository
+
+STATUSES = ("pending", "accepted", "completed", "expired")
+REQUEST_FILTERS = ("status", "pin_id", "csr_id", "category_id", "district_id", "region_id")
+
+
+@dataclass
+class Probe:
+    """
+    One repository call to trace; allow_scan marks inherently full listings,
+    allow_sort a sort of rows found through an index (one range per key).
+    """
+    label: str
+    call: Callable[[], Any]
+    allow_scan: bool = False
+    allow_sort: bool = False
+
+
+@dataclass
+class Finding:
+    label: str
+    sql: str
+    plan: List[str] = field(default_factory=list)
+    reason: str = ""
+
+
+# -----------------------------
+# Synthetic database
+# -----------------------------
+def build_synthetic_db(path: Path, n_requests: int, seed: int = 314) -> sqlite3.Connection:
+    """Create schema from db.sql and bulk-load a realistic-looking data set."""
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(DB_SQL.read_text(encoding="utf-8"))
+    conn.execute("PRAGMA foreign_keys = OFF;")  # bulk load; ids are generated consistently
+
+    n_companies, n_regions, n_districts, n_categories = 20, 5, 60, 12
+    n_pins = max(100, n_requests // 20)
+    n_csrs = max(20, n_requests // 200)
+    n_volunteers = max(100, n_requests // 50)
+
+    conn.executemany("INSERT INTO companies (id, name) VALUES (?, ?)",
+                     [(i, f"Company {i}") for i in range(1, n_companies + 1)])
+    conn.executemany("INSERT INTO regions (id, name) VALUES (?, ?)",
+                     [(i, f"Region {i}") for i in range(1, n_regions + 1)])
+    conn.executemany("INSERT INTO districts (id, region_id, name) VALUES (?, ?, ?)",
+                     [(i, (i % n_regions) + 1, f"District {i}") for i in range(1, n_districts + 1)])
+    geo = [(i, 1.25 + (i % 10) * 0.02, 103.65 + (i // 10) * 0.05) for i in range(1, n_districts + 1)]
+    conn.executemany("INSERT INTO district_geo (district_id, lat, lng) VALUES (?, ?, ?)", geo)
+    conn.executemany("INSERT INTO district_rtree (id, min_lat, max_lat, min_lng, max_lng) VALUES (?, ?, ?, ?, ?)",
+                     [(i, lat - 0.015, lat + 0.015, lng - 0.03, lng + 0.03) for i, lat, lng in geo])
+    conn.executemany(
+        "INSERT INTO district_distances (from_id, to_id, km, same_region) VALUES (?, ?, ?, ?)",
+        [(a, b, round(((la - lb) ** 2 + (ga - gb) ** 2) ** 0.5 * 111.32, 3), int(a % n_regions == b % n_regions))
+         for a, la, ga in geo for b, lb, gb in geo],
+    )
+    conn.executemany("INSERT INTO postal_sectors (sector, district_id) VALUES (?, ?)",
+                     [(f"{i:02d}", i) for i in range(1, 83)])
+    conn.executemany("INSERT INTO categories (id, name, description) VALUES (?, ?, ?)",
+                     [(i, f"Category {i}", None) for i in range(1, n_categories + 1)])
+
+    accounts = []
+    for i in range(1, n_pins + 1):
+        accounts.append((i, f"pin{i}@example.com", "x", f"Pin {i}", None, "PIN", "active", None))
+    for j in range(1, n_csrs + 1):
+        i = n_pins + j
+        accounts.append((i, f"csr{j}@example.com", "x", f"Csr {j}", None, "CSR", "active",
+                         rnd.randint(1, n_companies)))
+    conn.executemany(
+        "INSERT INTO accounts (id, email, password, name, phone, role, status, company_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        accounts,
+    )
+    conn.executemany(
+        "INSERT INTO volunteers (id, name, email, phone, company_id) VALUES (?, ?, ?, ?, ?)",
+        [(i, f"Volunteer {i}", None, None, rnd.randint(1, n_companies)) for i in range(1, n_volunteers + 1)],
+    )
+
+    def _rows():
+        for i in range(1, n_requests + 1):
+            status = rnd.choices(STATUSES, weights=(5, 2, 6, 1))[0]
+            day = rnd.randint(1, 28)
+            month = rnd.randint(1, 12)
+            created = f"2025-{month:02d}-{day:02d}T{rnd.randint(0, 23):02d}:00:00Z"
+            hour = rnd.randint(8, 17)
+            start = f"2025-{month:02d}-{day:02d}T{hour:02d}:00:00Z"
+            end = f"2025-{month:02d}-{day:02d}T{hour + rnd.randint(1, 5):02d}:00:00Z"
+            if status in ("accepted", "completed"):
+                csr = n_pins + rnd.randint(1, n_csrs)
+                vols = "[" + ",".join(str(rnd.randint(1, n_volunteers)) for _ in range(rnd.randint(1, 3))) + "]"
+            else:
+                csr, vols = None, "[]"
+            yield (i, rnd.randint(1, n_pins), csr, rnd.randint(1, n_categories),
+                   rnd.randint(1, n_districts), f"Request {i}", None, status, start, end, created, vols)
+
+    conn.executemany(
+        "INSERT INTO requests (id, pin_id, csr_id, category_id, district_id, title, description, "
+        "status, start_at, end_at, created_at, volunteers) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _rows(),
+    )
+
+    def _archived_rows():
+        # a year of history already moved out by the archiver
+        for i in range(n_requests + 1, 2 * n_requests + 1):
+            status = rnd.choices(("completed", "expired"), weights=(6, 1))[0]
+            day, month = rnd.randint(1, 28), rnd.randint(1, 12)
+            created = f"2024-{month:02d}-{day:02d}T{rnd.randint(0, 23):02d}:00:00Z"
+            csr = n_pins + rnd.randint(1, n_csrs) if status == "completed" else None
+            yield (i, rnd.randint(1, n_pins), csr, rnd.randint(1, n_categories),
+                   rnd.randint(1, n_districts), f"Request {i}", None, status, created, created, created, "[]")
+
+    conn.executemany(
+        "INSERT INTO requests_archive (id, pin_id, csr_id, category_id, district_id, title, description, "
+        "status, start_at, end_at, created_at, volunteers) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _archived_rows(),
+    )
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+# -----------------------------
+# Probes: every repository query shape
+# -----------------------------
+def build_probes(conn: sqlite3.Connection) -> List[Probe]:
+    accounts = AccountsRepository(conn)
+    categories = CategoriesRepository(conn)
+    requests = RequestsRepository(conn)
+    idempotency = IdempotencyRepository(conn)
+    jobs = JobsRepository(conn)
+    minhash = MinHashRepository(conn)
+    references = ReferencesRepository(conn)
+    districts = DistrictsRepository(conn)
+    companies = CompaniesRepository(conn)
+
+    sample = {
+        "status": "pending",
+        "pin_id": 7,
+        "csr_id": conn.execute("SELECT MIN(id) FROM accounts WHERE role = 'CSR'").fetchone()[0],
+        "category_id": 3,
+        "district_id": 11,
+        "region_id": 2,
+    }
+
+    probes = [
+        Probe("accounts.get_account_by_id", lambda: accounts.get_account_by_id(5)),
+        Probe("accounts.get_account_by_email", lambda: accounts.get_account_by_email("pin5@example.com")),
+        Probe("accounts.list_accounts", accounts.list_accounts, allow_scan=True),
+        Probe("accounts.search_accounts_by_name(exact)",
+              lambda: accounts.search_accounts_by_name("Pin 5", partial=False)),
+        # LIKE '%x%' cannot use a B-tree index by definition.
+        Probe("accounts.search_accounts_by_name(partial)",
+              lambda: accounts.search_accounts_by_name("Pin", partial=True), allow_scan=True),
+        Probe("accounts.update_account", lambda: accounts.update_account(5, name="Pin Five")),
+        Probe("accounts.list_accounts_for_company", lambda: accounts.list_accounts_for_company(4)),
+        Probe("accounts.list_csr_ids_for_company", lambda: accounts.list_csr_ids_for_company(4)),
+        Probe("companies.get_company_by_id", lambda: companies.get_company_by_id(4)),
+        Probe("companies.list_volunteers_for_company", lambda: companies.list_volunteers_for_company(4)),
+        Probe("requests.list_requests_for_csrs", lambda: requests.list_requests_for_csrs(
+            accounts.list_csr_ids_for_company(4), {}), allow_sort=True),
+        Probe("requests.list_requests_for_csrs(status)", lambda: requests.list_requests_for_csrs(
+            accounts.list_csr_ids_for_company(4), {"status": "accepted"}), allow_sort=True),
+        Probe("requests.list_requests_for_csrs(include_archived)", lambda: requests.list_requests_for_csrs(
+            accounts.list_csr_ids_for_company(4), {"district_id": 11, "include_archived": True}), allow_sort=True),
+        Probe("categories.get_category_by_id", lambda: categories.get_category_by_id(3)),
+        Probe("categories.list_categories", categories.list_categories, allow_scan=True),
+        Probe("categories.update_category", lambda: categories.update_category(3, description="d")),
+        Probe("requests.get_request_by_id", lambda: requests.get_request_by_id(42)),
+        Probe("requests.update_request", lambda: requests.update_request(42, title="Updated")),
+        Probe("requests.apply_status_transitions", lambda: requests.apply_status_transitions(
+            [{"id": 44, "status": "expired"}], lambda cur, item: ("expired", None, []))),
+        Probe("requests.list_nearby", lambda: requests.list_nearby(11, 8.0, "pending", 20, 40)),
+        Probe("requests.get_archived_request_by_id", lambda: requests.get_archived_request_by_id(42)),
+        Probe("requests.archive_batch", lambda: requests.archive_batch(1740787200, ("completed", "expired"), 200)),
+        Probe("requests.delete_request",
+              lambda: requests.delete_request(conn.execute("SELECT MAX(id) FROM requests").fetchone()[0])),
+        Probe("districts.list_districts", districts.list_districts, allow_scan=True),
+        Probe("districts.get_district_by_id", lambda: districts.get_district_by_id(11)),
+        Probe("districts.find_in_window(point)", lambda: districts.find_in_window(1.31, 103.80)),
+        Probe("districts.find_in_window(window)", lambda: districts.find_in_window(1.31, 103.80, 0.05, 0.05)),
+        Probe("districts.get_district_by_postal_sector", lambda: districts.get_district_by_postal_sector("56")),
+        Probe("idempotency.get", lambda: idempotency.get("POST /api/requests/", "k-1")),
+        Probe("idempotency.take_over", lambda: idempotency.take_over("POST /api/requests/", "k-1", "f", 0, 0)),
+        Probe("idempotency.complete", lambda: idempotency.complete("POST /api/requests/", "k-1", 0, 201, "{}")),
+        Probe("idempotency.release", lambda: idempotency.release("POST /api/requests/", "k-1", 0)),
+        Probe("idempotency.prune", lambda: idempotency.prune(0)),
+        Probe("companies.list_volunteers_by_ids", lambda: companies.list_volunteers_by_ids([3, 9, 27])),
+        Probe("jobs.enqueue", lambda: jobs.enqueue("request.accepted", {"request_id": 42}, 0, 5, 0)),
+        Probe("jobs.claim", lambda: jobs.claim("probe", 10, 60, 10)),
+        Probe("jobs.complete", lambda: jobs.complete(1, "probe")),
+        Probe("jobs.fail", lambda: jobs.fail(1, "probe", "boom", 100)),
+        Probe("jobs.list_dead", jobs.list_dead),
+        Probe("jobs.requeue_dead", lambda: jobs.requeue_dead(0)),
+        Probe("jobs.release", lambda: jobs.release([1], 10)),
+        Probe("jobs.cancel", lambda: jobs.cancel([1])),
+        Probe("jobs.purge_stale", lambda: jobs.purge_stale(0)),
+        Probe("jobs.counts", jobs.counts),
+        Probe("minhash.replace", lambda: minhash.replace(42, b"\0" * 256, [11, 12, 13])),
+        Probe("minhash.candidates", lambda: minhash.candidates([11, 12, 13], 42, 50)),
+        Probe("minhash.signatures", lambda: minhash.signatures([42, 43])),
+        Probe("minhash.remove", lambda: minhash.remove([42])),
+        Probe("references.accounts", lambda: references.accounts([1, 7, 42])),
+        Probe("references.volunteers", lambda: references.volunteers([3, 9, 27])),
+    ]
+
+    # Time windows (epoch seconds): one week of starts, a moment in time
+    week = {"start_after": 1761955200, "start_before": 1762560000}  # 2025-11-01 .. 2025-11-08
+    active_at = 1762534800  # 2025-11-07T17:00:00Z
+    probes += [
+        Probe("requests.list_requests(start window)", lambda: requests.list_requests(week)),
+        Probe("requests.list_requests(start_before)",
+              lambda: requests.list_requests({"start_before": week["start_after"]})),
+        Probe("requests.list_requests(status, start window)",
+              lambda: requests.list_requests({**week, "status": "pending"})),
+        Probe("requests.list_requests(status, district_id, start window)",
+              lambda: requests.list_requests({**week, "status": "pending", "district_id": 11})),
+        Probe("requests.list_requests(region_id, start window)",
+              lambda: requests.list_requests({**week, "region_id": 2})),
+        Probe("requests.list_requests(status, region_id, start window)",
+              lambda: requests.list_requests({**week, "status": "pending", "region_id": 2})),
+        Probe("requests.list_requests(start window, include_archived)",
+              lambda: requests.list_requests({**week, "include_archived": True})),
+        Probe("requests.list_requests(active_at)", lambda: requests.list_requests({"active_at": active_at})),
+        Probe("requests.list_requests(active_at, status, district_id)",
+              lambda: requests.list_requests({"active_at": active_at, "status": "pending", "district_id": 11})),
+    ]
+
+    # list_requests: every combination of the six equality filters
+    for n in range(len(REQUEST_FILTERS) + 1):
+        for combo in combinations(REQUEST_FILTERS, n):
+            filters = {k: sample[k] for k in combo}
+            probes.append(Probe(
+                f"requests.list_requests({', '.join(combo) or 'no filters'})",
+                lambda f=filters: requests.list_requests(f),
+                allow_scan=not combo,
+            ))
+            probes.append(Probe(
+                f"requests.list_requests({', '.join(combo + ('include_archived',))})",
+                lambda f=filters: requests.list_requests({**f, "include_archived": True}),
+                allow_scan=not combo,
+            ))
+    return probes
+
+
+# -----------------------------
+# Plan inspection
+# -----------------------------
+def _explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()]
+
+
+def _check_plan(probe: Probe, sql: str, plan: List[str]) -> List[Finding]:
+    found = []
+    for line in plan:
+        if "USE TEMP B-TREE" in line:
+            if not probe.allow_sort:
+                found.append(Finding(probe.label, sql, plan, "temp B-tree"))
+        elif line.startswith("SCAN ") and "VIRTUAL TABLE INDEX" not in line and not probe.allow_scan:
+            found.append(Finding(probe.label, sql, plan, "full scan"))
+    return found
+
+
+def run_probes(conn: sqlite3.Connection, probes: List[Probe]) -> List[Finding]:
+    findings: List[Finding] = []
+    for probe in probes:
+        captured: List[str] = []
+        conn.set_trace_callback(captured.append)
+        try:
+            probe.call()
+        finally:
+            conn.set_trace_callback(None)
+        for sql in captured:
+            head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+            if head not in ("SELECT", "UPDATE", "DELETE", "WITH"):
+                continue
+            findings.extend(_check_plan(probe, sql, _explain(conn, sql)))
+    return findings
+
+
+def check(n_requests: int = 50000, verbose: bool = False) -> Dict[str, List[Finding]]:
+    """Run all probes without and with ANALYZE statistics; return findings per phase."""
+    results: Dict[str, List[Finding]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_synthetic_db(Path(tmp) / "plans.db", n_requests)
+        try:
+            results["no-stats"] = run_probes(conn, build_probes(conn))
+            conn.execute("ANALYZE;")
+            conn.commit()
+            results["analyzed"] = run_probes(conn, build_probes(conn))
+            if verbose:
+                for probe in build_probes(conn):
+                    print(f"- {probe.label}")
+        finally:
+            conn.close()
+    return results
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Fail if any repository query plan scans or sorts.")
+    p.add_argument("--requests", type=int, default=50000, help="Synthetic request rows (default: 50000)")
+    p.add_argument("--verbose", action="store_true", help="List every probed repository call")
+    args = p.parse_args(argv)
+
+    results = check(args.requests, verbose=args.verbose)
+    failed = False
+    for phase, findings in results.items():
+        if not findings:
+            print(f"✅ {phase}: all query plans use indexes")
+            continue
+        failed = True
+        print(f"❌ {phase}: {len(findings)} plan regression(s)")
+        for f in findings:
+            print(f"   [{f.reason}] {f.label}")
+            print(f"      sql:  {f.sql.strip()}")
+            for line in f.plan:
+                print(f"      plan: {line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
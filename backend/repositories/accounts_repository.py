@@ -35,6 +35,17 @@ class AccountsRepository:
         cur.execute("SELECT * FROM accounts ORDER BY id ASC")
         rows = cur.fetchall()
         return [dict(r) for r in rows]
+
+    def list_accounts_for_company(self, company_id):
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM accounts WHERE company_id = ? ORDER BY id ASC", (company_id,))
+        rows = cur.fetchall()
+        return [dict(r) for r in rows]
+
+    def list_csr_ids_for_company(self, company_id):
+        cur = self.conn.cursor()
+        cur.execute("SELECT id FROM accounts WHERE company_id = ? AND role = 'CSR' ORDER BY id ASC", (company_id,))
+        return [r[0] for r in cur.fetchall()]
     
 
     # Update
@@ -0,0 +1,30 @@
+from typing import Any, Dict, List, Optional
+
+
+class CompaniesRepository:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # Retrieve one
+    def get_company_by_id(self, company_id: int) -> Optional[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM companies WHERE id = ?", (company_id,))
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+    # Retrieve the company's volunteers
+    def list_volunteers_for_company(self, company_id: int) -> List[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM volunteers WHERE company_id = ? ORDER BY id ASC", (company_id,))
+        return [dict(r) for r in cur.fetchall()]
+
+    # Retrieve volunteers by id (one query for the whole set)
+    def list_volunteers_by_ids(self, volunteer_ids: List[int]) -> List[Dict[str, Any]]:
+        ids = list(dict.fromkeys(volunteer_ids))
+        if not ids:
+            return []
+        marks = ", ".join("?" for _ in ids)
+        cur = self.conn.cursor()
+        cur.execute(f"SELECT * FROM volunteers WHERE id IN ({marks}) ORDER BY id ASC", ids)
+        return [dict(r) for r in cur.fetchall()]
@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional
+
+
+class DistrictsRepository:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # Retrieve all
+    def list_districts(self) -> List[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT d.id, d.region_id, d.name, g.lat, g.lng
+            FROM districts d
+            LEFT JOIN district_geo g ON g.district_id = d.id
+            ORDER BY d.id ASC
+            """
+        )
+        return [dict(r) for r in cur.fetchall()]
+
+    # Retrieve one
+    def get_district_by_id(self, district_id: int) -> Optional[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT d.id, d.region_id, d.name, g.lat, g.lng
+            FROM districts d
+            LEFT JOIN district_geo g ON g.district_id = d.id
+            WHERE d.id = ?
+            """,
+            (district_id,),
+        )
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+    # Spatial: districts whose bounding box intersects [lat±d_lat, lng±d_lng]
+    def find_in_window(self, lat: float, lng: float, d_lat: float = 0.0, d_lng: float = 0.0) -> List[Dict[str, Any]]:
+        """R-tree lookup; with d_lat = d_lng = 0 this is 'boxes containing the point'."""
+        cur = self.conn.cursor()
+        # CROSS JOIN pins the R-tree as the outer loop (SQLite never reorders it)
+        cur.execute(
+            """
+            SELECT d.id, d.region_id, d.name, g.lat, g.lng
+            FROM district_rtree t
+            CROSS JOIN districts d    ON d.id = t.id
+            CROSS JOIN district_geo g ON g.district_id = t.id
+            WHERE t.min_lat <= ? AND t.max_lat >= ?
+              AND t.min_lng <= ? AND t.max_lng >= ?
+            """,
+            (lat + d_lat, lat - d_lat, lng + d_lng, lng - d_lng),
+        )
+        return [dict(r) for r in cur.fetchall()]
+
+    # Postal sector (first two digits of a Singapore postal code)
+    def get_district_by_postal_sector(self, sector: str) -> Optional[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT d.id, d.region_id, d.name, g.lat, g.lng
+            FROM postal_sectors p
+            JOIN districts d         ON d.id = p.district_id
+            LEFT JOIN district_geo g ON g.district_id = d.id
+            WHERE p.sector = ?
+            """,
+            (sector,),
+        )
+        row = cur.fetchone()
+        return dict(row) if row else None
@@ -0,0 +1,67 @@
+import sqlite3
+from typing import Any, Dict, Optional
+
+
+class IdempotencyRepository:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # Claim a key (True if this caller owns it, False if it already exists)
+    def claim(self, scope: str, key: str, fingerprint: str, now: int) -> bool:
+        cur = self.conn.cursor()
+        try:
+            cur.execute(
+                "INSERT INTO idempotency_keys (scope, key, fingerprint, status, created_at) "
+                "VALUES (?, ?, ?, 'in_progress', ?)",
+                (scope, key, fingerprint, now),
+            )
+        except sqlite3.IntegrityError:
+            self.conn.rollback()
+            return False
+        self.conn.commit()
+        return True
+
+    # Take over an in-progress claim made before stale_before (its owner crashed)
+    def take_over(self, scope: str, key: str, fingerprint: str, now: int, stale_before: int) -> bool:
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE idempotency_keys SET created_at = ? "
+            "WHERE scope = ? AND key = ? AND fingerprint = ? AND status = 'in_progress' AND created_at < ?",
+            (now, scope, key, fingerprint, stale_before),
+        )
+        self.conn.commit()
+        return cur.rowcount == 1
+
+    # Retrieve one
+    def get(self, scope: str, key: str) -> Optional[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM idempotency_keys WHERE scope = ? AND key = ?", (scope, key))
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+    # Store the response of the request that owns the key (claimed at claimed_at)
+    def complete(self, scope: str, key: str, claimed_at: int, response_status: int, response_body: str) -> None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "UPDATE idempotency_keys SET status = 'completed', response_status = ?, response_body = ? "
+            "WHERE scope = ? AND key = ? AND status = 'in_progress' AND created_at = ?",
+            (response_status, response_body, scope, key, claimed_at),
+        )
+        self.conn.commit()
+
+    # Release a claim so the client may retry (the write path failed)
+    def release(self, scope: str, key: str, claimed_at: int) -> None:
+        cur = self.conn.cursor()
+        cur.execute(
+            "DELETE FROM idempotency_keys WHERE scope = ? AND key = ? AND status = 'in_progress' AND created_at = ?",
+            (scope, key, claimed_at),
+        )
+        self.conn.commit()
+
+    # TTL pruning
+    def prune(self, older_than: int) -> int:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM idempotency_keys WHERE created_at < ?", (older_than,))
+        self.conn.commit()
+        return cur.rowcount
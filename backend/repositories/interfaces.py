@@ -0,0 +1,58 @@
+"""
+Storage interface shared by the repository implementations.
+
+Services only depend on these methods, so the SQLite repositories in this
+package and the PostgreSQL ones in backend.repositories.postgres are
+interchangeable (selected by STORAGE_BACKEND, see backend.storage).
+Rows are plain dicts. requests.volunteers is always a list[int] on read.
+Methods that write commit their own transaction. A missing row raises
+ValueError on update/delete and yields None on lookup.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol
+
+
+class AccountsStore(Protocol):
+    def create_account(self, email, password, name, phone, role, status, company_id=None) -> Dict[str, Any]: ...
+    def get_account_by_id(self, account_id) -> Optional[Dict[str, Any]]: ...
+    def get_account_by_email(self, email) -> Optional[Dict[str, Any]]: ...
+    def list_accounts(self) -> List[Dict[str, Any]]: ...
+    def list_accounts_for_company(self, company_id) -> List[Dict[str, Any]]: ...
+    def list_csr_ids_for_company(self, company_id) -> List[int]: ...
+    def update_account(self, account_id, **updates) -> Dict[str, Any]: ...
+    def delete_account(self, account_id) -> Dict[str, Any]: ...
+    def search_accounts_by_name(self, name, partial=True) -> List[Dict[str, Any]]: ...
+
+
+class CategoriesStore(Protocol):
+    def create_category(self, name, description=None) -> Dict[str, Any]: ...
+    def list_categories(self) -> List[Dict[str, Any]]: ...
+    def get_category_by_id(self, category_id) -> Optional[Dict[str, Any]]: ...
+    def update_category(self, category_id, **updates) -> Dict[str, Any]: ...
+    def delete_category(self, category_id) -> Dict[str, Any]: ...
+
+
+class CompaniesStore(Protocol):
+    def get_company_by_id(self, company_id: int) -> Optional[Dict[str, Any]]: ...
+    def list_volunteers_for_company(self, company_id: int) -> List[Dict[str, Any]]: ...
+    def list_volunteers_by_ids(self, volunteer_ids: List[int]) -> List[Dict[str, Any]]: ...
+
+
+class ReferencesStore(Protocol):
+    def accounts(self, ids: Iterable[int]) -> Dict[int, Dict[str, Any]]: ...
+    def volunteers(self, ids: Iterable[int]) -> Dict[int, Optional[int]]: ...
+    def category_ids(self) -> List[int]: ...
+    def district_ids(self) -> List[int]: ...
+
+
+class RequestsStore(Protocol):
+    def list_requests(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]: ...
+    def list_requests_for_csrs(self, csr_ids: List[int], filters: Dict[str, Any]) -> List[Dict[str, Any]]: ...
+    def list_nearby(self, district_id: int, radius_km: float, status: str, limit: int, offset: int) -> List[Dict[str, Any]]: ...
+    def get_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]: ...
+    def get_archived_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]: ...
+    def archive_batch(self, cutoff: int, statuses: Iterable[str], batch_size: int) -> int: ...
+    def create_request(self, *, pin_id, csr_id, category_id, district_id, title, description,
+                       status, start_at, end_at, created_at, volunteers: str) -> Dict[str, Any]: ...
+    def update_request(self, req_id: int, **data) -> Dict[str, Any]: ...
+    def apply_status_transitions(self, transitions: List[Dict[str, Any]], check: Callable) -> List[Any]: ...
+    def delete_request(self, req_id: int) -> None: ...
@@ -0,0 +1,125 @@
+import json
+from typing import Any, Dict, List, Optional
+
+
+class JobsRepository:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @staticmethod
+    def _row_to_dict(row) -> Dict[str, Any]:
+        d = dict(row)
+        d["payload"] = json.loads(d["payload"])
+        return d
+
+    # Add a job inside the caller's open transaction (no commit)
+    def add(self, kind: str, payload: Dict[str, Any], run_at: int, max_attempts: int, now: int) -> int:
+        cur = self.conn.cursor()
+        cur.execute(
+            "INSERT INTO jobs (kind, payload, run_at, max_attempts, created_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload, separators=(",", ":")), run_at, max_attempts, now),
+        )
+        return cur.lastrowid
+
+    # Add a job (run_at: earliest attempt, epoch seconds)
+    def enqueue(self, kind: str, payload: Dict[str, Any], run_at: int, max_attempts: int, now: int) -> int:
+        job_id = self.add(kind, payload, run_at, max_attempts, now)
+        self.conn.commit()
+        return job_id
+
+    # Make held (queued, future run_at) jobs due now
+    def release(self, job_ids: List[int], now: int) -> int:
+        cur = self.conn.cursor()
+        cur.executemany("UPDATE jobs SET run_at = ? WHERE id = ? AND status = 'queued'",
+                        [(now, job_id) for job_id in job_ids])
+        self.conn.commit()
+        return cur.rowcount
+
+    # Drop held jobs whose write did not happen
+    def cancel(self, job_ids: List[int]) -> int:
+        cur = self.conn.cursor()
+        cur.executemany("DELETE FROM jobs WHERE id = ? AND status = 'queued'", [(job_id,) for job_id in job_ids])
+        self.conn.commit()
+        return cur.rowcount
+
+    # Lease up to `limit` due jobs to `worker` until now + lease_s; jobs whose
+    # lease ran out (their worker died) are due again
+    def claim(self, worker: str, now: int, lease_s: int, limit: int) -> List[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            UPDATE jobs SET status = 'running', run_at = ?, locked_by = ?, attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM jobs WHERE status = 'queued' AND run_at <= ?
+                UNION ALL
+                SELECT id FROM jobs WHERE status = 'running' AND run_at <= ?
+                LIMIT ?
+            )
+            RETURNING *
+            """,
+            (now + lease_s, worker, now, now, limit),
+        )
+        rows = [self._row_to_dict(r) for r in cur.fetchall()]
+        self.conn.commit()
+        return rows
+
+    # Done: remove the job, if this worker still holds its lease
+    def complete(self, job_id: int, worker: str) -> bool:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM jobs WHERE id = ? AND status = 'running' AND locked_by = ?", (job_id, worker))
+        self.conn.commit()
+        return cur.rowcount == 1
+
+    # Failed: retry at retry_at, or dead-letter it when retry_at is None
+    def fail(self, job_id: int, worker: str, error: str, retry_at: Optional[int]) -> bool:
+        cur = self.conn.cursor()
+        if retry_at is None:
+            cur.execute(
+                "UPDATE jobs SET status = 'dead', locked_by = NULL, last_error = ? "
+                "WHERE id = ? AND status = 'running' AND locked_by = ?",
+                (error, job_id, worker),
+            )
+        else:
+            cur.execute(
+                "UPDATE jobs SET status = 'queued', run_at = ?, locked_by = NULL, last_error = ? "
+                "WHERE id = ? AND status = 'running' AND locked_by = ?",
+                (retry_at, error, job_id, worker),
+            )
+        self.conn.commit()
+        return cur.rowcount == 1
+
+    # Dead letters, oldest first
+    def list_dead(self, limit: int = 100) -> List[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM jobs WHERE status = 'dead' ORDER BY run_at LIMIT ?", (limit,))
+        return [self._row_to_dict(r) for r in cur.fetchall()]
+
+    # Give dead letters a fresh set of attempts
+    def requeue_dead(self, now: int) -> int:
+        cur = self.conn.cursor()
+        cur.execute("UPDATE jobs SET status = 'queued', attempts = 0, run_at = ? WHERE status = 'dead'", (now,))
+        self.conn.commit()
+        return cur.rowcount
+
+    def purge_dead(self) -> int:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM jobs WHERE status = 'dead'")
+        self.conn.commit()
+        return cur.rowcount
+
+    # Queued jobs due before `before` that no worker picked up
+    def purge_stale(self, before: int) -> int:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM jobs WHERE status = 'queued' AND run_at < ?", (before,))
+        self.conn.commit()
+        return cur.rowcount
+
+    # Jobs per status
+    def counts(self) -> Dict[str, int]:
+        cur = self.conn.cursor()
+        counts = {"queued": 0, "running": 0, "dead": 0}
+        for status in counts:
+            cur.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,))
+            counts[status] = cur.fetchone()[0]
+        return counts
@@ -0,0 +1,78 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+
+class MinHashRepository:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # (Re)index a request: its signature and LSH buckets replace the old ones
+    def replace(self, request_id: int, signature: bytes, buckets: Iterable[int]) -> None:
+        cur = self.conn.cursor()
+        try:
+            cur.execute("DELETE FROM request_lsh WHERE request_id = ?", (request_id,))
+            cur.execute(
+                "INSERT OR REPLACE INTO request_minhash (request_id, signature) VALUES (?, ?)",
+                (request_id, signature),
+            )
+            cur.executemany(
+                "INSERT OR IGNORE INTO request_lsh (bucket, request_id) VALUES (?, ?)",
+                [(bucket, request_id) for bucket in buckets],
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def remove(self, request_ids: List[int]) -> None:
+        if not request_ids:
+            return
+        marks = ",".join("?" * len(request_ids))
+        cur = self.conn.cursor()
+        try:
+            cur.execute(f"DELETE FROM request_lsh WHERE request_id IN ({marks})", request_ids)
+            cur.execute(f"DELETE FROM request_minhash WHERE request_id IN ({marks})", request_ids)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    # Requests sharing at least one bucket, most shared buckets first (the
+    # few bucket members are counted here rather than sorted in a temp B-tree)
+    def candidates(self, buckets: List[int], exclude_id: int, limit: int) -> List[int]:
+        marks = ",".join("?" * len(buckets))
+        cur = self.conn.cursor()
+        cur.execute(
+            f"SELECT request_id FROM request_lsh WHERE bucket IN ({marks}) AND request_id != ?",
+            (*buckets, exclude_id),
+        )
+        shared = Counter(r[0] for r in cur.fetchall())
+        return [rid for rid, _ in sorted(shared.items(), key=lambda kv: (-kv[1], -kv[0]))[:limit]]
+
+    def signatures(self, request_ids: List[int]) -> Dict[int, bytes]:
+        if not request_ids:
+            return {}
+        marks = ",".join("?" * len(request_ids))
+        cur = self.conn.cursor()
+        cur.execute(f"SELECT request_id, signature FROM request_minhash WHERE request_id IN ({marks})", request_ids)
+        return {r[0]: r[1] for r in cur.fetchall()}
+
+    def indexed_ids(self) -> Set[int]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT request_id FROM request_minhash")
+        return {r[0] for r in cur.fetchall()}
+
+    # Buckets holding more than one request (the batch report's candidate groups)
+    def colliding_buckets(self) -> List[List[int]]:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT group_concat(request_id) FROM request_lsh GROUP BY bucket HAVING COUNT(*) > 1"
+        )
+        return [[int(x) for x in r[0].split(",")] for r in cur.fetchall()]
+
+    def clear(self) -> None:
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM request_lsh")
+        cur.execute("DELETE FROM request_minhash")
+        self.conn.commit()
@@ -0,0 +1,9 @@
+"""PostgreSQL implementations of the storage interface (requires psycopg 3)."""
+from backend.repositories.postgres.accounts_repository import PgAccountsRepository
+from backend.repositories.postgres.categories_repository import PgCategoriesRepository
+from backend.repositories.postgres.companies_repository import PgCompaniesRepository
+from backend.repositories.postgres.references_repository import PgReferencesRepository
+from backend.repositories.postgres.requests_repository import PgRequestsRepository
+
+__all__ = ["PgAccountsRepository", "PgCategoriesRepository", "PgCompaniesRepository", "PgReferencesRepository",
+           "PgRequestsRepository"]
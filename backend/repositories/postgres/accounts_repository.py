@@ -0,0 +1,80 @@
+class PgAccountsRepository:
+    """AccountsRepository on PostgreSQL (conn from the pool, rows as dicts)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # Create
+    def create_account(self, email, password, name, phone, role, status, company_id=None):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO accounts (email, password, name, phone, role, status, company_id) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id",
+                (email, password, name, phone, role, status, company_id),
+            )
+            account_id = cur.fetchone()["id"]
+        self.conn.commit()
+        return {"id": account_id, "email": email, "password": password, "name": name, "phone": phone, "role": role, "status": status, "company_id": company_id}
+
+    # Retrieve one
+    def get_account_by_id(self, account_id):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM accounts WHERE id = %s", (account_id,))
+            return cur.fetchone()
+
+    def get_account_by_email(self, email):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM accounts WHERE email = %s", (email,))
+            return cur.fetchone()
+
+    # Retrieve all
+    def list_accounts(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM accounts ORDER BY id ASC")
+            return cur.fetchall()
+
+    def list_accounts_for_company(self, company_id):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM accounts WHERE company_id = %s ORDER BY id ASC", (company_id,))
+            return cur.fetchall()
+
+    def list_csr_ids_for_company(self, company_id):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id FROM accounts WHERE company_id = %s AND role = 'CSR' ORDER BY id ASC", (company_id,))
+            return [r["id"] for r in cur.fetchall()]
+
+    # Update
+    def update_account(self, account_id, **updates):
+        allowed = {"email", "password", "name", "phone", "role", "status", "company_id"}
+        keys = [k for k in updates.keys() if k in allowed]
+        if not keys:
+            raise ValueError("No valid fields to update")
+
+        values = [updates[k] for k in keys]
+        set_clause = ", ".join(f"{k} = %s" for k in keys)
+        values.append(account_id)
+
+        with self.conn.cursor() as cur:
+            cur.execute(f"UPDATE accounts SET {set_clause} WHERE id = %s", values)
+        self.conn.commit()
+        return {"updated_id": account_id}
+
+    # Delete
+    def delete_account(self, account_id):
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM accounts WHERE id = %s", (account_id,))
+            deleted = cur.rowcount
+        self.conn.commit()
+        if deleted <= 0:
+            raise ValueError("Account not found")
+        return {"deleted_id": account_id}
+
+    # Search
+    def search_accounts_by_name(self, name, partial=True):
+        """Return list of accounts matching the name (case-insensitive, like SQLite NOCASE)."""
+        with self.conn.cursor() as cur:
+            if partial:
+                cur.execute("SELECT * FROM accounts WHERE name ILIKE %s ORDER BY id ASC", (f"%{name}%",))
+            else:
+                cur.execute("SELECT * FROM accounts WHERE lower(name) = lower(%s) ORDER BY id ASC", (name,))
+            return cur.fetchall()
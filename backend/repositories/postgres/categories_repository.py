@@ -0,0 +1,57 @@
+class PgCategoriesRepository:
+    """CategoriesRepository on PostgreSQL (conn from the pool, rows as dicts)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # Create
+    def create_category(self, name, description=None):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO categories (name, description) VALUES (%s, %s) RETURNING id",
+                (name, description),
+            )
+            category_id = cur.fetchone()["id"]
+        self.conn.commit()
+        return {"id": category_id, "name": name, "description": description}
+
+    # Retrieve all
+    def list_categories(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM categories ORDER BY id ASC")
+            return cur.fetchall()
+
+    # Retrieve one
+    def get_category_by_id(self, category_id):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM categories WHERE id = %s", (category_id,))
+            return cur.fetchone()
+
+    # Update
+    def update_category(self, category_id, **updates):
+        if not updates:
+            raise ValueError("No fields to update")
+
+        allowed = {"name", "description"}
+        keys = [k for k in updates.keys() if k in allowed]
+        if not keys:
+            raise ValueError("No valid fields to update")
+
+        values = [updates[k] for k in keys]
+        set_clause = ", ".join(f"{k} = %s" for k in keys)
+        values.append(category_id)
+
+        with self.conn.cursor() as cur:
+            cur.execute(f"UPDATE categories SET {set_clause} WHERE id = %s", values)
+        self.conn.commit()
+        return {"updated_id": category_id}
+
+    # Delete
+    def delete_category(self, category_id):
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM categories WHERE id = %s", (category_id,))
+            deleted = cur.rowcount
+        self.conn.commit()
+        if deleted <= 0:
+            raise ValueError("Category not found")
+        return {"deleted_id": category_id}
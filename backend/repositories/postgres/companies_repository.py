@@ -0,0 +1,26 @@
+from typing import Any, Dict, List, Optional
+
+
+class PgCompaniesRepository:
+    """CompaniesRepository on PostgreSQL (conn from the pool, rows as dicts)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # Retrieve one
+    def get_company_by_id(self, company_id: int) -> Optional[Dict[str, Any]]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM companies WHERE id = %s", (company_id,))
+            return cur.fetchone()
+
+    # Retrieve the company's volunteers
+    def list_volunteers_for_company(self, company_id: int) -> List[Dict[str, Any]]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM volunteers WHERE company_id = %s ORDER BY id ASC", (company_id,))
+            return cur.fetchall()
+
+    # Retrieve volunteers by id (one query for the whole set)
+    def list_volunteers_by_ids(self, volunteer_ids: List[int]) -> List[Dict[str, Any]]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM volunteers WHERE id = ANY(%s) ORDER BY id ASC", (list(volunteer_ids),))
+            return cur.fetchall()
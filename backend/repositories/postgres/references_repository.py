@@ -0,0 +1,31 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class PgReferencesRepository:
+    """ReferencesRepository on PostgreSQL (one = ANY(array) query per table)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # id -> {"role", "company_id"} for the accounts that exist
+    def accounts(self, ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id, role, company_id FROM accounts WHERE id = ANY(%s)", (list(ids),))
+            return {r["id"]: {"role": r["role"], "company_id": r["company_id"]} for r in cur.fetchall()}
+
+    # id -> company_id for the volunteers that exist
+    def volunteers(self, ids: Iterable[int]) -> Dict[int, Optional[int]]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id, company_id FROM volunteers WHERE id = ANY(%s)", (list(ids),))
+            return {r["id"]: r["company_id"] for r in cur.fetchall()}
+
+    # Every id of the small reference tables (cached by the validator)
+    def category_ids(self) -> List[int]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id FROM categories")
+            return [r["id"] for r in cur.fetchall()]
+
+    def district_ids(self) -> List[int]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id FROM districts")
+            return [r["id"] for r in cur.fetchall()]
@@ -0,0 +1,211 @@
+import heapq
+import json
+from typing import Any, Dict, List, Optional
+
+from backend.repositories.requests_repository import RequestsRepository
+
+
+def _text(value):
+    """Timestamps are TEXT columns: store datetimes the way sqlite3 adapts them."""
+    return value.isoformat(" ") if hasattr(value, "isoformat") else value
+
+
+class PgRequestsRepository:
+    """
+    RequestsRepository on PostgreSQL (conn from the pool, rows as dicts).
+    volunteers is jsonb: it is written from JSON text with ::jsonb and read
+    back as a list by psycopg, so callers see the same shapes as on SQLite.
+    """
+
+    COLUMNS = RequestsRepository.COLUMNS
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # Same as on SQLite: R-tree there, GiST expression index here
+    ACTIVE_RANGE = "int8range(start_ts, GREATEST(COALESCE(end_ts, start_ts), start_ts), '[]')"
+
+    @staticmethod
+    def _where(filters: Dict[str, Any]):
+        where = " WHERE TRUE"
+        params: List[Any] = []
+        for key in ("status", "pin_id", "csr_id", "category_id", "district_id", "region_id"):
+            if key in filters:
+                where += f" AND {key} = %s"
+                params.append(filters[key])
+        if "csr_ids" in filters:
+            where += " AND csr_id = ANY(%s)"
+            params.append(list(filters["csr_ids"]))
+        if "start_after" in filters:
+            where += " AND start_ts >= %s"
+            params.append(filters["start_after"])
+        if "start_before" in filters:
+            where += " AND start_ts < %s"
+            params.append(filters["start_before"])
+        if "active_at" in filters:
+            where += f" AND start_ts IS NOT NULL AND {PgRequestsRepository.ACTIVE_RANGE} @> %s::bigint"
+            params.append(filters["active_at"])
+        return where, params
+
+    def list_requests(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        where, params = self._where(filters)
+        windowed = RequestsRepository.is_windowed(filters)
+        order = "start_ts, id" if windowed else "created_ts DESC, id DESC"
+        with self.conn.cursor() as cur:
+            if not filters.get("include_archived"):
+                cur.execute(f"SELECT {self.COLUMNS} FROM requests{where} ORDER BY {order}", params)
+                return cur.fetchall()
+            # Same shape as the SQLite repository: every row carries archived_at (NULL when live)
+            cur.execute(f"SELECT {self.COLUMNS}, NULL AS archived_at FROM requests{where} ORDER BY {order}", params)
+            rows = cur.fetchall()
+            cur.execute(f"SELECT {self.COLUMNS}, archived_at FROM requests_archive{where} ORDER BY {order}", params)
+            archived = cur.fetchall()
+        key, reverse = RequestsRepository.order_key(filters)
+        return list(heapq.merge(rows, archived, key=key, reverse=reverse))
+
+    def list_requests_for_csrs(self, csr_ids: List[int], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Requests handled by any of csr_ids, in list_requests() order (one csr_id = ANY(...) query)."""
+        filters = {k: v for k, v in filters.items() if k != "csr_id"}
+        return self.list_requests({**filters, "csr_ids": csr_ids})
+
+    def list_nearby(
+        self, district_id: int, radius_km: float, status: str, limit: int, offset: int
+    ) -> List[Dict[str, Any]]:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT r.*, ROUND(dd.km::numeric, 3)::float8 AS distance_km
+                FROM district_distances dd
+                JOIN requests r ON r.district_id = dd.to_id
+                WHERE dd.from_id = %s AND dd.km <= %s AND r.status = %s
+                ORDER BY dd.km, dd.to_id, r.start_ts
+                LIMIT %s OFFSET %s
+                """,
+                (district_id, radius_km, status, limit, offset),
+            )
+            return cur.fetchall()
+
+    def get_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM requests WHERE id = %s", (req_id,))
+            return cur.fetchone()
+
+    def get_archived_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]:
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT * FROM requests_archive WHERE id = %s", (req_id,))
+            return cur.fetchone()
+
+    def archive_batch(self, cutoff: int, statuses, batch_size: int) -> int:
+        """
+        Move up to batch_size finished requests created before cutoff (epoch
+        seconds) in one statement. SKIP LOCKED leaves rows that a concurrent writer holds.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"""
+                WITH picked AS (
+                    SELECT id FROM requests
+                    WHERE status = ANY(%s) AND created_ts < %s
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ), moved AS (
+                    DELETE FROM requests r USING picked p WHERE r.id = p.id
+                    RETURNING r.*
+                )
+                INSERT INTO requests_archive ({self.COLUMNS}) SELECT {self.COLUMNS} FROM moved
+                """,
+                (list(statuses), cutoff, batch_size),
+            )
+            moved = cur.rowcount
+        self.conn.commit()
+        return moved
+
+    def create_request(
+        self,
+        *,
+        pin_id: int,
+        csr_id: Optional[int],
+        category_id: int,
+        district_id: int,
+        title: str,
+        description: Optional[str],
+        status: str,
+        start_at,
+        end_at,
+        created_at,
+        volunteers: str,  # JSON text
+    ) -> Dict[str, Any]:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO requests
+                    (pin_id, csr_id, category_id, district_id, title, description,
+                     status, start_at, end_at, created_at, volunteers)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb)
+                RETURNING id
+                """,
+                (pin_id, csr_id, category_id, district_id, title, description,
+                 status, _text(start_at), _text(end_at), _text(created_at), volunteers),
+            )
+            req_id = cur.fetchone()["id"]
+        self.conn.commit()
+        return {"id": req_id}
+
+    def update_request(self, req_id: int, **data) -> Dict[str, Any]:
+        if not data:
+            return {"updated_id": req_id}
+
+        fields = []
+        params = []
+        for k, v in data.items():
+            fields.append(f"{k} = %s::jsonb" if k == "volunteers" else f"{k} = %s")
+            params.append(_text(v))
+        params.append(req_id)
+
+        with self.conn.cursor() as cur:
+            cur.execute(f"UPDATE requests SET {', '.join(fields)} WHERE id = %s", params)
+            updated = cur.rowcount
+        if updated == 0:
+            self.conn.rollback()
+            raise ValueError("Request not found")
+        self.conn.commit()
+        return {"updated_id": req_id}
+
+    def apply_status_transitions(self, transitions: List[Dict[str, Any]], check) -> List[Any]:
+        """
+        Same contract as the SQLite version: one transaction for the batch,
+        one savepoint per item (a failing item is rolled back and returned as
+        its exception), None for a missing id.
+        """
+        results: List[Any] = []
+        with self.conn.transaction():
+            for item in transitions:
+                try:
+                    with self.conn.transaction(), self.conn.cursor() as cur:  # SAVEPOINT
+                        cur.execute(
+                            "SELECT * FROM requests WHERE id = %s FOR UPDATE",
+                            (item["id"],),
+                        )
+                        row = cur.fetchone()
+                        if row is None:
+                            results.append(None)
+                            continue
+                        status, csr_id, volunteers = check(row, item)
+                        cur.execute(
+                            "UPDATE requests SET status = %s, csr_id = %s, volunteers = %s::jsonb WHERE id = %s",
+                            (status, csr_id, json.dumps(volunteers), item["id"]),
+                        )
+                    results.append({"id": item["id"], "status": status, "csr_id": csr_id, "volunteers": volunteers})
+                except Exception as e:  # per-item failure (invalid transition, CHECK constraint)
+                    results.append(e)
+        self.conn.commit()  # no-op unless an implicit transaction was already open
+        return results
+
+    def delete_request(self, req_id: int) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute("DELETE FROM requests WHERE id = %s", (req_id,))
+            deleted = cur.rowcount
+        if deleted == 0:
+            self.conn.rollback()
+            raise ValueError("Request not found")
+        self.conn.commit()
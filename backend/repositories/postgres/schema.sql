@@ -0,0 +1,232 @@
+-- PostgreSQL schema for STORAGE_BACKEND=postgres.
+-- Mirrors backend/db.sql for the tables served by the storage interface
+-- (accounts, categories, requests and their parents). Timestamps stay TEXT
+-- (ISO-8601) so API payloads are identical across backends, with epoch
+-- *_ts columns alongside for filtering and sorting. volunteers is
+-- jsonb with a GIN index, so "requests with volunteer X" is an index probe.
+-- Every statement is idempotent (IF NOT EXISTS).
+
+CREATE TABLE IF NOT EXISTS companies (
+  id   BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS accounts (
+  id         BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  email      TEXT NOT NULL UNIQUE,
+  password   TEXT NOT NULL,
+  name       TEXT,
+  phone      TEXT,
+  role       TEXT NOT NULL CHECK (role IN ('UserAdmin','CSR','PIN','PlatformManager')),
+  status     TEXT NOT NULL DEFAULT 'active' CHECK (status IN ('active','inactive','blocked')),
+  company_id BIGINT REFERENCES companies(id),
+  CHECK (
+    (role = 'CSR' AND company_id IS NOT NULL) OR
+    (role <> 'CSR' AND company_id IS NULL)
+  )
+);
+
+CREATE TABLE IF NOT EXISTS volunteers (
+  id         BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  name       TEXT,
+  email      TEXT,
+  phone      TEXT,
+  company_id BIGINT REFERENCES companies(id)
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+  id          BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  name        TEXT NOT NULL UNIQUE,
+  description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS regions (
+  id   BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS districts (
+  id        BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  region_id BIGINT NOT NULL REFERENCES regions(id) ON DELETE RESTRICT,
+  name      TEXT NOT NULL,
+  UNIQUE (region_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS district_geo (
+  district_id BIGINT PRIMARY KEY REFERENCES districts(id) ON DELETE CASCADE,
+  lat         DOUBLE PRECISION NOT NULL,
+  lng         DOUBLE PRECISION NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS district_distances (
+  from_id     BIGINT NOT NULL REFERENCES districts(id) ON DELETE CASCADE,
+  to_id       BIGINT NOT NULL REFERENCES districts(id) ON DELETE CASCADE,
+  km          DOUBLE PRECISION NOT NULL,
+  same_region SMALLINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (from_id, to_id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_district_distances_km ON district_distances(from_id, km, to_id);
+
+CREATE TABLE IF NOT EXISTS requests (
+  id          BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  pin_id      BIGINT NOT NULL REFERENCES accounts(id) ON DELETE RESTRICT,
+  csr_id      BIGINT REFERENCES accounts(id) ON DELETE RESTRICT,
+  category_id BIGINT NOT NULL REFERENCES categories(id) ON DELETE RESTRICT,
+  district_id BIGINT NOT NULL REFERENCES districts(id) ON DELETE RESTRICT,
+  title       TEXT NOT NULL,
+  description TEXT,
+  status      TEXT NOT NULL CHECK (status IN ('pending','accepted','completed','expired')),
+  start_at    TEXT,
+  end_at      TEXT,
+  created_at  TEXT NOT NULL DEFAULT to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS'),
+  volunteers  JSONB NOT NULL DEFAULT '[]'::jsonb,
+  CHECK (jsonb_typeof(volunteers) = 'array'),
+  CHECK (
+    (status IN ('pending','expired') AND csr_id IS NULL AND jsonb_array_length(volunteers) = 0)
+    OR
+    (status IN ('accepted','completed') AND csr_id IS NOT NULL AND jsonb_array_length(volunteers) >= 1)
+  )
+);
+
+CREATE TABLE IF NOT EXISTS requests_archive (
+  id          BIGINT PRIMARY KEY,
+  pin_id      BIGINT NOT NULL,
+  csr_id      BIGINT,
+  category_id BIGINT NOT NULL,
+  district_id BIGINT NOT NULL,
+  title       TEXT NOT NULL,
+  description TEXT,
+  status      TEXT NOT NULL,
+  start_at    TEXT,
+  end_at      TEXT,
+  created_at  TEXT NOT NULL,
+  volunteers  JSONB NOT NULL DEFAULT '[]'::jsonb,
+  archived_at TEXT NOT NULL DEFAULT to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS')
+);
+
+CREATE INDEX IF NOT EXISTS idx_accounts_company           ON accounts(company_id);
+CREATE INDEX IF NOT EXISTS idx_accounts_name_lower        ON accounts(lower(name));
+CREATE INDEX IF NOT EXISTS idx_volunteers_company         ON volunteers(company_id);
+CREATE INDEX IF NOT EXISTS idx_requests_volunteers        ON requests USING GIN (volunteers jsonb_path_ops);
+
+-- Epoch timestamps, as on SQLite: start_at/end_at/created_at stay TEXT for
+-- the API, the *_ts columns hold the same instants as UTC epoch seconds and
+-- are what queries filter and sort on. epoch_utc() reads text without an
+-- offset as UTC (its own TimeZone setting), whatever the session's zone.
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS start_ts   BIGINT;
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS end_ts     BIGINT;
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS created_ts BIGINT;
+ALTER TABLE requests_archive ADD COLUMN IF NOT EXISTS start_ts   BIGINT;
+ALTER TABLE requests_archive ADD COLUMN IF NOT EXISTS end_ts     BIGINT;
+ALTER TABLE requests_archive ADD COLUMN IF NOT EXISTS created_ts BIGINT;
+ALTER TABLE requests ADD COLUMN IF NOT EXISTS region_id BIGINT;
+ALTER TABLE requests_archive ADD COLUMN IF NOT EXISTS region_id BIGINT;
+
+CREATE OR REPLACE FUNCTION epoch_utc(value TEXT) RETURNS BIGINT
+LANGUAGE sql STABLE SET TimeZone = 'UTC'
+AS $$ SELECT extract(epoch FROM value::timestamptz)::bigint $$;
+
+CREATE OR REPLACE FUNCTION requests_set_ts() RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.start_ts   := epoch_utc(NEW.start_at);
+  NEW.end_ts     := epoch_utc(NEW.end_at);
+  NEW.created_ts := epoch_utc(NEW.created_at);
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_requests_ts ON requests;
+CREATE TRIGGER trg_requests_ts
+  BEFORE INSERT OR UPDATE OF start_at, end_at, created_at ON requests
+  FOR EACH ROW EXECUTE FUNCTION requests_set_ts();
+
+-- archive_batch copies the *_ts columns, other writers get them computed
+DROP TRIGGER IF EXISTS trg_requests_archive_ts ON requests_archive;
+CREATE TRIGGER trg_requests_archive_ts
+  BEFORE INSERT ON requests_archive
+  FOR EACH ROW WHEN (NEW.created_ts IS NULL) EXECUTE FUNCTION requests_set_ts();
+
+-- Backfill rows written before the *_ts columns existed
+UPDATE requests SET created_at = created_at WHERE created_ts IS NULL;
+UPDATE requests_archive SET
+  start_ts = epoch_utc(start_at), end_ts = epoch_utc(end_at), created_ts = epoch_utc(created_at)
+WHERE created_ts IS NULL;
+
+-- region_id is districts.region_id copied onto each request, as on SQLite
+CREATE OR REPLACE FUNCTION requests_set_region() RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.region_id := (SELECT region_id FROM districts WHERE id = NEW.district_id);
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_requests_region ON requests;
+CREATE TRIGGER trg_requests_region
+  BEFORE INSERT OR UPDATE OF district_id ON requests
+  FOR EACH ROW EXECUTE FUNCTION requests_set_region();
+
+DROP TRIGGER IF EXISTS trg_requests_archive_region ON requests_archive;
+CREATE TRIGGER trg_requests_archive_region
+  BEFORE INSERT ON requests_archive
+  FOR EACH ROW WHEN (NEW.region_id IS NULL) EXECUTE FUNCTION requests_set_region();
+
+CREATE OR REPLACE FUNCTION districts_move_requests() RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  UPDATE requests SET region_id = NEW.region_id WHERE district_id = NEW.id;
+  UPDATE requests_archive SET region_id = NEW.region_id WHERE district_id = NEW.id;
+  RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_districts_region ON districts;
+CREATE TRIGGER trg_districts_region
+  AFTER UPDATE OF region_id ON districts
+  FOR EACH ROW WHEN (OLD.region_id IS DISTINCT FROM NEW.region_id)
+  EXECUTE FUNCTION districts_move_requests();
+
+UPDATE requests r SET region_id = d.region_id
+FROM districts d WHERE d.id = r.district_id AND r.region_id IS NULL;
+UPDATE requests_archive r SET region_id = d.region_id
+FROM districts d WHERE d.id = r.district_id AND r.region_id IS NULL;
+
+-- list_requests sorts by (created_ts DESC, id DESC), time windows by
+-- (start_ts, id): the id tie-break is part of each index.
+DROP INDEX IF EXISTS idx_requests_created;
+DROP INDEX IF EXISTS idx_requests_status_created;
+DROP INDEX IF EXISTS idx_requests_pin_created;
+DROP INDEX IF EXISTS idx_requests_csr_created;
+DROP INDEX IF EXISTS idx_requests_category_created;
+DROP INDEX IF EXISTS idx_requests_district_created;
+DROP INDEX IF EXISTS idx_requests_status_district_start;
+DROP INDEX IF EXISTS idx_requests_archive_created;
+DROP INDEX IF EXISTS idx_requests_archive_pin_created;
+DROP INDEX IF EXISTS idx_requests_archive_csr_created;
+CREATE INDEX IF NOT EXISTS idx_requests_created_ts           ON requests(created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_status_created_ts    ON requests(status, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_pin_created_ts       ON requests(pin_id, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_csr_created_ts       ON requests(csr_id, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_category_created_ts  ON requests(category_id, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_district_created_ts  ON requests(district_id, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_start_ts             ON requests(start_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_status_start_ts      ON requests(status, start_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_status_district_start_ts ON requests(status, district_id, start_ts);
+CREATE INDEX IF NOT EXISTS idx_requests_region_created_ts    ON requests(region_id, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_status_region_ts     ON requests(status, region_id, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_status_region_start_ts ON requests(status, region_id, start_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_created_ts   ON requests_archive(created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_pin_created_ts ON requests_archive(pin_id, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_csr_created_ts ON requests_archive(csr_id, created_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_start_ts     ON requests_archive(start_ts, id);
+CREATE INDEX IF NOT EXISTS idx_requests_archive_region_created_ts ON requests_archive(region_id, created_ts, id);
+
+-- active_at=T: a GiST index over each request's [start_ts, end_ts] range
+-- (end defaults to start), the counterpart of SQLite's request_windows R-tree
+CREATE INDEX IF NOT EXISTS idx_requests_active_window ON requests
+  USING GIST (int8range(start_ts, GREATEST(COALESCE(end_ts, start_ts), start_ts), '[]'))
+  WHERE start_ts IS NOT NULL;
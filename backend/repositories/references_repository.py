@@ -0,0 +1,42 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class ReferencesRepository:
+    """
+    Set-based lookups for referential validation: one query per table for
+    any number of ids (passed as one JSON array and expanded by json_each,
+    so the statement text and its cached plan do not depend on the count).
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # id -> {"role", "company_id"} for the accounts that exist
+    def accounts(self, ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT id, role, company_id FROM accounts WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(ids)),),
+        )
+        return {r["id"]: {"role": r["role"], "company_id": r["company_id"]} for r in cur.fetchall()}
+
+    # id -> company_id for the volunteers that exist
+    def volunteers(self, ids: Iterable[int]) -> Dict[int, Optional[int]]:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT id, company_id FROM volunteers WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(ids)),),
+        )
+        return {r["id"]: r["company_id"] for r in cur.fetchall()}
+
+    # Every id of the small reference tables (cached by the validator)
+    def category_ids(self) -> List[int]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT id FROM categories")
+        return [r[0] for r in cur.fetchall()]
+
+    def district_ids(self) -> List[int]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT id FROM districts")
+        return [r[0] for r in cur.fetchall()]
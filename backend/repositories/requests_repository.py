@@ -1,5 +1,6 @@
+import heapq
 import json
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from sqlite3 import Row
 
 class RequestsRepository:
@@ -18,32 +19,142 @@ class RequestsRepository:
         return d
 
 
-    def list_requests(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        sql = "SELECT * FROM requests WHERE 1=1"
+    # Columns shared by requests and requests_archive
+    COLUMNS = (
+        "id, pin_id, csr_id, category_id, district_id, title, description, "
+        "status, start_at, end_at, created_at, volunteers, start_ts, end_ts, created_ts, region_id"
+    )
+
+    @staticmethod
+    def _where(filters: Dict[str, Any], prefix: str = ""):
+        where = " WHERE 1=1"
         params: List[Any] = []
 
         if "status" in filters:
-            sql += " AND status = ?"
+            where += f" AND {prefix}status = ?"
             params.append(filters["status"])
         if "pin_id" in filters:
-            sql += " AND pin_id = ?"
+            where += f" AND {prefix}pin_id = ?"
             params.append(filters["pin_id"])
         if "csr_id" in filters:
-            sql += " AND csr_id = ?"
+            where += f" AND {prefix}csr_id = ?"
             params.append(filters["csr_id"])
+        # Any of several CSRs: one JSON array, so the statement does not depend on the count
+        if "csr_ids" in filters:
+            where += f" AND {prefix}csr_id IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(list(filters["csr_ids"])))
         if "category_id" in filters:
-            sql += " AND category_id = ?"
+            where += f" AND {prefix}category_id = ?"
             params.append(filters["category_id"])
         if "district_id" in filters:
-            sql += " AND district_id = ?"
+            where += f" AND {prefix}district_id = ?"
             params.append(filters["district_id"])
+        if "region_id" in filters:
+            where += f" AND {prefix}region_id = ?"
+            params.append(filters["region_id"])
+        # Time window on the start time (epoch seconds): [start_after, start_before)
+        if "start_after" in filters:
+            where += f" AND {prefix}start_ts >= ?"
+            params.append(filters["start_after"])
+        if "start_before" in filters:
+            where += f" AND {prefix}start_ts < ?"
+            params.append(filters["start_before"])
+        return where, params
+
+    @staticmethod
+    def is_windowed(filters: Dict[str, Any]) -> bool:
+        """Time-window queries come back in start order, everything else newest first."""
+        return any(k in filters for k in ("start_after", "start_before", "active_at"))
 
-        sql += " ORDER BY created_at DESC"
+    @classmethod
+    def order_key(cls, filters: Dict[str, Any]):
+        """(key, reverse) that list_requests() results are sorted by, for merging them."""
+        if cls.is_windowed(filters):
+            return (lambda r: (r["start_ts"], r["id"])), False
+        return (lambda r: (r["created_ts"] or 0, r["id"])), True
+
+    def list_requests(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if "active_at" in filters:
+            return self._list_active(filters)
+        where, params = self._where(filters)
+        order = "start_ts, id" if self.is_windowed(filters) else "created_ts DESC, id DESC"
+        if "csr_ids" in filters:
+            # Unary + stops the planner from walking the whole created_ts/start_ts index
+            # to avoid the sort: one idx_requests_csr_created_ts range per CSR, sorted once
+            order = ", ".join("+" + term for term in order.split(", "))
 
         cur = self.conn.cursor()
-        cur.execute(sql, params)
+        if not filters.get("include_archived"):
+            cur.execute(f"SELECT {self.COLUMNS} FROM requests{where} ORDER BY {order}", params)
+            return [self._row_to_dict(r) for r in cur.fetchall()]
+
+        # Archive is queried separately (its own indexes, no sort)
+        # and the two already-ordered lists are merged. Both sides have the
+        # same keys: live rows carry archived_at as NULL.
+        cur.execute(f"SELECT {self.COLUMNS}, NULL AS archived_at FROM requests{where} ORDER BY {order}", params)
         rows = cur.fetchall()
-        return [self._row_to_dict(r) for r in rows]
+        cur.execute(f"SELECT {self.COLUMNS}, archived_at FROM requests_archive{where} ORDER BY {order}", params)
+        archived = cur.fetchall()
+        key, reverse = self.order_key(filters)
+        merged = heapq.merge(rows, archived, key=key, reverse=reverse)
+        return [self._row_to_dict(r) for r in merged]
+
+    def _list_active(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Requests whose [start_ts, end_ts] interval contains active_at, in start
+        order. The request_windows R-tree finds the candidates (bounds are
+        float32, rounded outwards), the exact bounds are re-checked on requests.
+        CROSS JOIN pins the R-tree as the outer loop: with statistics the
+        planner otherwise prefers scanning requests and probing the R-tree.
+        R-tree results are unordered: the (usually short) list is sorted here.
+        """
+        t = filters["active_at"]
+        where, params = self._where(filters, prefix="r.")
+        cur = self.conn.cursor()
+        cur.execute(
+            f"""
+            SELECT r.* FROM request_windows w CROSS JOIN requests r ON r.id = w.id{where}
+              AND w.min_ts <= ? AND w.max_ts >= ?
+              AND r.start_ts <= ? AND MAX(COALESCE(r.end_ts, r.start_ts), r.start_ts) >= ?
+            """,
+            (*params, t, t, t, t),
+        )
+        rows = [self._row_to_dict(r) for r in cur.fetchall()]
+        rows.sort(key=lambda r: (r["start_ts"], r["id"]))
+        return rows
+
+    def list_requests_for_csrs(self, csr_ids: List[int], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Requests handled by any of csr_ids (one tenant's CSRs), in
+        list_requests() order: one query that looks each CSR up in
+        idx_requests_csr_created_ts (csr_id IN json_each) and sorts the
+        tenant's rows once.
+        """
+        filters = {k: v for k, v in filters.items() if k != "csr_id"}
+        return self.list_requests({**filters, "csr_ids": csr_ids})
+
+    def list_nearby(
+        self, district_id: int, radius_km: float, status: str, limit: int, offset: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Requests in districts within radius_km of district_id, nearest first,
+        then by start time. The (from_id, km, to_id) distance index and the
+        (status, district_id, start_ts) request index deliver this order
+        directly, so a page costs LIMIT+OFFSET index steps and no sort.
+        """
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT r.*, ROUND(dd.km, 3) AS distance_km
+            FROM district_distances dd
+            JOIN requests r ON r.district_id = dd.to_id
+            WHERE dd.from_id = ? AND dd.km <= ? AND r.status = ?
+            ORDER BY dd.km, dd.to_id, r.start_ts
+            LIMIT ? OFFSET ?
+            """,
+            (district_id, radius_km, status, limit, offset),
+        )
+        return [self._row_to_dict(r) for r in cur.fetchall()]
 
     def get_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]:
         cur = self.conn.cursor()
@@ -51,6 +162,47 @@ class RequestsRepository:
         row = cur.fetchone()
         return self._row_to_dict(row) if row else None
 
+    def get_archived_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]:
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM requests_archive WHERE id = ?", (req_id,))
+        row = cur.fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def archive_batch(self, cutoff: int, statuses, batch_size: int) -> int:
+        """
+        Move up to batch_size requests with a status in `statuses` and
+        created_ts < cutoff (epoch seconds) into requests_archive, in one short transaction.
+        Returns the number of rows moved (0 when nothing is left).
+        """
+        statuses = list(statuses)
+        marks = ", ".join("?" for _ in statuses)
+        cur = self.conn.cursor()
+        cur.execute(
+            f"SELECT id FROM requests WHERE status IN ({marks}) AND created_ts < ? LIMIT ?",
+            (*statuses, cutoff, batch_size),
+        )
+        ids = [r[0] for r in cur.fetchall()]
+        if not ids:
+            return 0
+
+        # Re-check the conditions inside the write transaction: a row may have
+        # changed status since it was selected.
+        id_marks = ", ".join("?" for _ in ids)
+        cond = f"id IN ({id_marks}) AND status IN ({marks}) AND created_ts < ?"
+        args = (*ids, *statuses, cutoff)
+        try:
+            cur.execute(
+                f"INSERT INTO requests_archive ({self.COLUMNS}) SELECT {self.COLUMNS} FROM requests WHERE {cond}",
+                args,
+            )
+            cur.execute(f"DELETE FROM requests WHERE {cond}", args)
+            moved = cur.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return moved
+
     def create_request(
         self,
         *,
@@ -65,7 +217,10 @@ class RequestsRepository:
         end_at,
         created_at,
         volunteers: str,  # JSON text
+        on_created: Optional[Callable[[int], Any]] = None,
     ) -> Dict[str, Any]:
+        # on_created(new_id) runs after the INSERT, before the COMMIT, on this
+        # connection: rows it writes (queued jobs) commit together with the request
         cur = self.conn.cursor()
         cur.execute(
             """
@@ -88,8 +243,15 @@ class RequestsRepository:
                 volunteers,
             ),
         )
+        req_id = cur.lastrowid
+        if on_created is not None:
+            try:
+                on_created(req_id)
+            except Exception:
+                self.conn.rollback()
+                raise
         self.conn.commit()
-        return {"id": cur.lastrowid}
+        return {"id": req_id}
 
     def update_request(self, req_id: int, **data) -> Dict[str, Any]:
         if not data:
@@ -110,6 +272,50 @@ class RequestsRepository:
         self.conn.commit()
         return {"updated_id": req_id}
 
+    def apply_status_transitions(self, transitions: List[Dict[str, Any]], check, on_applied=None) -> List[Any]:
+        """
+        Apply a batch of status transitions in ONE write transaction (group commit).
+        Each item is {"id", "status", "csr_id", "volunteers"}; `check(current, item)`
+        returns the new (status, csr_id, volunteers) or raises ValueError.
+        Every item runs in its own SAVEPOINT, so one bad item does not undo the
+        rest. Returns, per item: the new row fields, None (not found) or the exception.
+        on_applied(current, result), if given, runs inside the item's SAVEPOINT
+        after its UPDATE, so what it writes (queued jobs) commits with the change.
+        The connection must be in autocommit mode (isolation_level=None).
+        """
+        results: List[Any] = []
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            for item in transitions:
+                cur.execute("SAVEPOINT item")
+                try:
+                    cur.execute("SELECT * FROM requests WHERE id = ?", (item["id"],))
+                    row = cur.fetchone()
+                    if row is None:
+                        results.append(None)
+                    else:
+                        current = self._row_to_dict(row)
+                        status, csr_id, volunteers = check(current, item)
+                        cur.execute(
+                            "UPDATE requests SET status = ?, csr_id = ?, volunteers = ? WHERE id = ?",
+                            (status, csr_id, json.dumps(volunteers), item["id"]),
+                        )
+                        result = {"id": item["id"], "status": status, "csr_id": csr_id, "volunteers": volunteers}
+                        if on_applied is not None:
+                            on_applied(current, result)
+                        results.append(result)
+                    cur.execute("RELEASE item")
+                except Exception as e:  # per-item failure (invalid transition, CHECK constraint)
+                    cur.execute("ROLLBACK TO item")
+                    cur.execute("RELEASE item")
+                    results.append(e)
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        return results
+
     def delete_request(self, req_id: int) -> None:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM requests WHERE id = ?", (req_id,))
@@ -0,0 +1,197 @@
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.repositories.requests_repository import RequestsRepository
+from backend.sharding import first_id, region_of_id
+
+# Shared by all requests in the process: sqlite3 releases the GIL while a
+# query runs, so shards are read concurrently
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _fan_out(repos: List[RequestsRepository], call: Callable[[RequestsRepository], Any]) -> List[Any]:
+    """call(repo) for every shard, concurrently when there is more than one."""
+    global _executor
+    if len(repos) < 2:
+        return [call(r) for r in repos]
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="shard-fanout")
+    return list(_executor.map(call, repos))
+
+
+class ShardedRequestsRepository:
+    """
+    RequestsRepository over per-region shard files (see backend.sharding).
+
+    `conn` is the main database (districts, regions: routing only); `connect`
+    opens a shard file, e.g. db_session.get_shard_db. Queries pinned to one
+    region (region_id, or district_id via its region) go to that shard only.
+    Other lists run on every shard in parallel and the already-ordered
+    results are merged, as list_requests() merges requests and the archive.
+    Writes touch one shard, so they only wait for writers of the same shard.
+    """
+
+    COLUMNS = RequestsRepository.COLUMNS
+
+    def __init__(self, conn, shards, connect: Callable):
+        self.conn = conn
+        self.shards = shards
+        self.connect = connect
+
+    def _repo(self, region_id: int) -> RequestsRepository:
+        return RequestsRepository(self.connect(self.shards.path_for(region_id)))
+
+    def _all(self) -> List[RequestsRepository]:
+        return [RequestsRepository(self.connect(path)) for path in self.shards.paths(self.conn)]
+
+    def _region_of_district(self, district_id: int) -> Optional[int]:
+        row = self.conn.execute("SELECT region_id FROM districts WHERE id = ?", (district_id,)).fetchone()
+        return row[0] if row else None
+
+    def _targets(self, filters: Dict[str, Any]) -> List[RequestsRepository]:
+        """Shards that can hold rows matching filters."""
+        region = filters.get("region_id")
+        if "district_id" in filters:
+            district_region = self._region_of_district(filters["district_id"])
+            if district_region is None or (region is not None and region != district_region):
+                return []
+            region = district_region
+        return [self._repo(region)] if region is not None else self._all()
+
+    def _locate(self, req_id: int, get: Callable[[RequestsRepository], Any]):
+        """(shard repo, row) for req_id, or (None, None). Ids from before sharding probe every shard."""
+        region = region_of_id(req_id)
+        for repo in [self._repo(region)] if region is not None else self._all():
+            row = get(repo)
+            if row is not None:
+                return repo, row
+        return None, None
+
+    def list_requests(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        per_shard = _fan_out(self._targets(filters), lambda repo: repo.list_requests(filters))
+        if len(per_shard) == 1:
+            return per_shard[0]
+        key, reverse = RequestsRepository.order_key(filters)
+        return list(heapq.merge(*per_shard, key=key, reverse=reverse))
+
+    def list_requests_for_csrs(self, csr_ids: List[int], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        per_shard = _fan_out(self._targets(filters), lambda repo: repo.list_requests_for_csrs(csr_ids, filters))
+        key, reverse = RequestsRepository.order_key(filters)
+        return list(heapq.merge(*per_shard, key=key, reverse=reverse))
+
+    def list_nearby(
+        self, district_id: int, radius_km: float, status: str, limit: int, offset: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Same order as RequestsRepository.list_nearby: districts by distance
+        (from the main DB), then each district's requests by start time from
+        its shard, stopping once limit+offset rows are collected.
+        """
+        cur = self.conn.execute(
+            """
+            SELECT dd.to_id, dd.km, d.region_id
+            FROM district_distances dd JOIN districts d ON d.id = dd.to_id
+            WHERE dd.from_id = ? AND dd.km <= ?
+            ORDER BY dd.km, dd.to_id
+            """,
+            (district_id, radius_km),
+        )
+        wanted = limit + offset
+        rows: List[Dict[str, Any]] = []
+        for to_id, km, region_id in cur.fetchall():
+            if len(rows) >= wanted:
+                break
+            shard = self._repo(region_id).conn.execute(
+                "SELECT * FROM requests WHERE status = ? AND district_id = ? ORDER BY start_ts LIMIT ?",
+                (status, to_id, wanted - len(rows)),
+            )
+            rows += [{**RequestsRepository._row_to_dict(r), "distance_km": round(km, 3)} for r in shard.fetchall()]
+        return rows[offset:wanted]
+
+    def get_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]:
+        return self._locate(req_id, lambda repo: repo.get_request_by_id(req_id))[1]
+
+    def get_archived_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]:
+        return self._locate(req_id, lambda repo: repo.get_archived_request_by_id(req_id))[1]
+
+    def archive_batch(self, cutoff: int, statuses, batch_size: int) -> int:
+        """One batch per shard (in parallel); returns the total moved."""
+        statuses = list(statuses)
+        return sum(_fan_out(self._all(), lambda repo: repo.archive_batch(cutoff, statuses, batch_size)))
+
+    def create_request(
+        self,
+        *,
+        pin_id: int,
+        csr_id: Optional[int],
+        category_id: int,
+        district_id: int,
+        title: str,
+        description: Optional[str],
+        status: str,
+        start_at,
+        end_at,
+        created_at,
+        volunteers: str,  # JSON text
+    ) -> Dict[str, Any]:
+        region_id = self._region_of_district(district_id)
+        if region_id is None:
+            raise ValueError(f"Unknown district_id {district_id}.")
+        conn = self._repo(region_id).conn
+        cur = conn.cursor()
+        try:
+            # Next id of the region's range, in the same write transaction as the insert
+            cur.execute(
+                "INSERT INTO shard_sequences (region_id, seq) VALUES (?, ?) "
+                "ON CONFLICT (region_id) DO UPDATE SET seq = seq + 1 RETURNING seq",
+                (region_id, first_id(region_id)),
+            )
+            req_id = cur.fetchone()[0]
+            cur.execute(
+                """
+                INSERT INTO requests
+                    (id, pin_id, csr_id, category_id, district_id, region_id, title, description,
+                     status, start_at, end_at, created_at, volunteers)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (req_id, pin_id, csr_id, category_id, district_id, region_id, title, description,
+                 status, start_at, end_at, created_at, volunteers),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return {"id": req_id}
+
+    def update_request(self, req_id: int, **data) -> Dict[str, Any]:
+        repo, current = self._locate(req_id, lambda r: r.get_request_by_id(req_id))
+        if repo is None:
+            raise ValueError("Request not found")
+        if "district_id" in data and data["district_id"] != current["district_id"]:
+            if self._region_of_district(data["district_id"]) != current["region_id"]:
+                raise ValueError("A request cannot move to a district of another region (sharded storage).")
+        return repo.update_request(req_id, **data)
+
+    def apply_status_transitions(self, transitions: List[Dict[str, Any]], check) -> List[Any]:
+        """Each shard's transitions in one transaction on that shard; results in input order."""
+        results: List[Any] = [None] * len(transitions)
+        groups: Dict[int, Any] = {}
+        for i, item in enumerate(transitions):
+            repo, _ = self._locate(item["id"], lambda r: r.get_request_by_id(item["id"]))
+            if repo is not None:
+                groups.setdefault(id(repo.conn), (repo, []))[1].append(i)
+        for repo, indexes in groups.values():
+            applied = repo.apply_status_transitions([transitions[i] for i in indexes], check)
+            for i, result in zip(indexes, applied):
+                results[i] = result
+        return results
+
+    def delete_request(self, req_id: int) -> None:
+        repo, _ = self._locate(req_id, lambda r: r.get_request_by_id(req_id))
+        if repo is None:
+            raise ValueError("Request not found")
+        repo.delete_request(req_id)
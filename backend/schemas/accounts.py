@@ -15,8 +15,18 @@ class Account(BaseModel):
     @model_validator(mode="after")
     def _company_rule(self):
         """CSR must have company_id; non-CSR must not have company_id."""
-        if self.role == AccountRole.CSR and self.company_id is None:
-            raise ValueError("CSR accounts must have a company_id.")
-        if self.role != AccountRole.CSR and self.company_id is not None:
-            raise ValueError("Only CSR accounts can have company_id.")
+        check_company_rule(self.role, self.company_id)
         return self
+
+
+def check_company_rule(role: AccountRole, company_id: Optional[int]) -> None:
+    if role == AccountRole.CSR and company_id is None:
+        raise ValueError("CSR accounts must have a company_id.")
+    if role != AccountRole.CSR and company_id is not None:
+        raise ValueError("Only CSR accounts can have company_id.")
+
+
+# Which fields each cross-field invariant depends on (see schemas/partial.py)
+UPDATE_INVARIANTS = (
+    (frozenset({"role", "company_id"}), check_company_rule),
+)
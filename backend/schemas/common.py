@@ -16,3 +16,12 @@ class RequestStatus(str, Enum):
     accepted = "accepted"
     completed = "completed"
     expired = "expired"
+
+# Allowed status transitions (state machine used by the status endpoint).
+# accepted -> pending releases a request back to the pool (clears CSR/volunteers).
+REQUEST_STATUS_TRANSITIONS = {
+    RequestStatus.pending: {RequestStatus.accepted, RequestStatus.expired},
+    RequestStatus.accepted: {RequestStatus.completed, RequestStatus.pending},
+    RequestStatus.completed: set(),
+    RequestStatus.expired: set(),
+}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Optional, List, Annotated
-from datetime import datetime
+from datetime import datetime, timezone
 from pydantic import BaseModel, field_validator, model_validator, StringConstraints
 from .common import RequestStatus  # pending/accepted/completed/expired 등 Enum
 
@@ -41,8 +41,7 @@ class Request(BaseModel):
     @model_validator(mode="after")
     def _check_time_order(self):
         """Ensure end_at is not earlier than start_at."""
-        if self.end_at and self.start_at and self.end_at < self.start_at:
-            raise ValueError("end_at cannot be earlier than start_at.")
+        check_time_order(self.start_at, self.end_at)
         return self
 
     @model_validator(mode="after")
@@ -52,15 +51,38 @@ class Request(BaseModel):
         - pending/expired: csr_id must be None, volunteers must be empty.
         - accepted/completed: csr_id required, at least 1 volunteer.
         """
-        vols = self.volunteers or []
-        if self.status in (RequestStatus.pending, RequestStatus.expired):
-            if self.csr_id is not None:
-                raise ValueError("csr_id must be NULL for pending/expired requests.")
-            if len(vols) != 0:
-                raise ValueError("volunteers must be empty for pending/expired requests.")
-        elif self.status in (RequestStatus.accepted, RequestStatus.completed):
-            if self.csr_id is None:
-                raise ValueError("csr_id is required for accepted/completed requests.")
-            if len(vols) < 1:
-                raise ValueError("At least one volunteer is required for accepted/completed requests.")
+        check_status_constraints(self.status, self.csr_id, self.volunteers)
         return self
+
+
+# --- Invariants shared by the model and the partial (update) validation path ---
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive times are stored and read as UTC (see the *_ts columns in db.sql)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def check_time_order(start_at: Optional[datetime], end_at: Optional[datetime]) -> None:
+    if end_at and start_at and _as_utc(end_at) < _as_utc(start_at):
+        raise ValueError("end_at cannot be earlier than start_at.")
+
+
+def check_status_constraints(status: RequestStatus, csr_id: Optional[int], volunteers: Optional[List[int]]) -> None:
+    vols = volunteers or []
+    if status in (RequestStatus.pending, RequestStatus.expired):
+        if csr_id is not None:
+            raise ValueError("csr_id must be NULL for pending/expired requests.")
+        if len(vols) != 0:
+            raise ValueError("volunteers must be empty for pending/expired requests.")
+    elif status in (RequestStatus.accepted, RequestStatus.completed):
+        if csr_id is None:
+            raise ValueError("csr_id is required for accepted/completed requests.")
+        if len(vols) < 1:
+            raise ValueError("At least one volunteer is required for accepted/completed requests.")
+
+
+# Which fields each cross-field invariant depends on (see schemas/partial.py)
+UPDATE_INVARIANTS = (
+    (frozenset({"start_at", "end_at"}), check_time_order),
+    (frozenset({"status", "csr_id", "volunteers"}), check_status_constraints),
+)
@@ -1,12 +1,27 @@
 from typing import Dict, Any, Optional, List
 from werkzeug.security import generate_password_hash
 from backend.schemas.accounts import Account
+from backend.schemas.accounts import UPDATE_INVARIANTS as ACCOUNT_UPDATE_INVARIANTS
+from backend.schemas.partial import validate_partial
 
 class AccountService:
     """Business logic for accounts."""
 
-    def __init__(self, repository):
+    CACHE_NAMESPACE = "accounts"
+
+    def __init__(self, repository, cache=None):
         self.repository = repository
+        # Optional backend.cache.Cache for by-id/list reads (passwords stripped before caching)
+        self.cache = cache
+
+    def _cached(self, key: str, load):
+        if self.cache is None:
+            return load()
+        return self.cache.get_or_load(self.CACHE_NAMESPACE, key, load)
+
+    def _invalidate(self) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(self.CACHE_NAMESPACE)
 
     @staticmethod
     def _strip_password(record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -51,15 +66,16 @@ class AccountService:
 
         # Return freshly-read row without password to avoid leaking hash
         created_fresh = self.repository.get_account_by_id(created["id"])
+        self._invalidate()
         return self._strip_password(created_fresh)
 
     def get_account_by_id(self, account_id: int) -> Optional[Dict[str, Any]]:
-        found = self.repository.get_account_by_id(account_id)
-        return self._strip_password(found)
+        return self._cached(
+            f"id:{account_id}", lambda: self._strip_password(self.repository.get_account_by_id(account_id))
+        )
 
     def list_accounts(self):
-        rows = self.repository.list_accounts()
-        return self._strip_password_list(rows)
+        return self._cached("list", lambda: self._strip_password_list(self.repository.list_accounts()))
 
     def update_account(self, account_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         current = self.repository.get_account_by_id(account_id)
@@ -76,12 +92,12 @@ class AccountService:
             if other and other.get("id") != account_id:
                 raise ValueError("Email already registered.")
 
-        # Merge to validate business rules (role/company_id etc.) via schema
-        merged = {**current, **data}
-        Account(**merged)  # validation only; repository returns the persisted row
+        # Validate only the changed fields; the role/company_id rule runs only if either changed
+        validate_partial(Account, current, data, ACCOUNT_UPDATE_INVARIANTS)
 
         # Perform update (repo returns {"updated_id": ...} per current implementation)
         self.repository.update_account(account_id, **data)  # :contentReference[oaicite:3]{index=3}
+        self._invalidate()
 
         # Read back the updated row to return as payload (common REST pattern)
         updated = self.repository.get_account_by_id(account_id)
@@ -90,6 +106,7 @@ class AccountService:
     def delete_account(self, account_id):
         try:
             self.repository.delete_account(account_id)  # raises ValueError if not found
+            self._invalidate()
             return True
         except ValueError:
             # Normalize to boolean for controller -> 404
@@ -0,0 +1,55 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from backend.schemas.common import RequestStatus
+
+ARCHIVABLE_STATUSES = (RequestStatus.completed.value, RequestStatus.expired.value)
+
+
+class ArchiveService:
+    """Moves finished requests out of the hot `requests` table in bounded batches."""
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    @staticmethod
+    def cutoff_for(older_than_days: float, now: Optional[datetime] = None) -> datetime:
+        """created_ts cutoff as an aware UTC datetime."""
+        now = now or datetime.now(timezone.utc)
+        return now - timedelta(days=older_than_days)
+
+    def archive(
+        self,
+        older_than_days: float = 90,
+        batch_size: int = 500,
+        max_batches: Optional[int] = None,
+        pause_s: float = 0.0,
+        statuses: Iterable[str] = ARCHIVABLE_STATUSES,
+    ) -> Dict[str, Any]:
+        """
+        Archive completed/expired requests created more than older_than_days ago.
+        Each batch is its own short write transaction; pause_s between batches
+        leaves room for other writers on a busy database.
+        """
+        if older_than_days < 0 or batch_size < 1:
+            raise ValueError("older_than_days must be >= 0 and batch_size >= 1.")
+        cutoff = self.cutoff_for(older_than_days)
+        cutoff_ts = int(cutoff.timestamp())
+        statuses = tuple(statuses)
+        moved = batches = 0
+        started = time.perf_counter()
+        while max_batches is None or batches < max_batches:
+            n = self.repository.archive_batch(cutoff_ts, statuses, batch_size)
+            if n == 0:
+                break
+            moved += n
+            batches += 1
+            if pause_s:
+                time.sleep(pause_s)
+        return {
+            "cutoff": cutoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "archived": moved,
+            "batches": batches,
+            "duration_s": round(time.perf_counter() - started, 3),
+        }
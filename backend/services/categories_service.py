@@ -1,11 +1,25 @@
 from typing import Dict, Any, Optional, List
 from backend.schemas.categories import Category 
+from backend.schemas.partial import validate_partial
 
 class CategoriesService:
     """Business logic for categories."""
 
-    def __init__(self, repository):
+    CACHE_NAMESPACE = "categories"
+
+    def __init__(self, repository, cache=None):
         self.repository = repository
+        # Optional backend.cache.Cache for by-id/list reads
+        self.cache = cache
+
+    def _cached(self, key: str, load):
+        if self.cache is None:
+            return load()
+        return self.cache.get_or_load(self.CACHE_NAMESPACE, key, load)
+
+    def _invalidate(self) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(self.CACHE_NAMESPACE)
 
     def create_category(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate payload and create a category, returning the created row."""
@@ -20,28 +34,29 @@ class CategoriesService:
 
         # Read back to ensure consistent shape (if repository returns only partial)
         fresh = self.repository.get_category_by_id(created["id"])
+        self._invalidate()
         return fresh or created
 
     def get_category_by_id(self, category_id: int) -> Optional[Dict[str, Any]]:
         """Return a single category or None."""
-        return self.repository.get_category_by_id(category_id)
+        return self._cached(f"id:{category_id}", lambda: self.repository.get_category_by_id(category_id))
 
     def list_categories(self) -> List[Dict[str, Any]]:
         """Return all categories."""
-        return self.repository.list_categories()
+        return self._cached("list", self.repository.list_categories)
 
     def update_category(self, category_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Apply updates after schema re-validation on a merged view."""
+        """Apply updates after validating only the changed fields."""
         current = self.repository.get_category_by_id(category_id)
         if not current:
             return None
 
-        # Merge and validate (keeps invariants: name not empty, etc.)
-        merged = {**current, **(data or {})}
-        Category(**merged)  # validation only
+        # Validate only the changed fields (keeps invariants: name not empty, etc.)
+        validate_partial(Category, current, data or {})
 
         # Persist updates
         self.repository.update_category(category_id, **(data or {}))
+        self._invalidate()
 
         # Read back and return the latest state
         return self.repository.get_category_by_id(category_id)
@@ -50,6 +65,7 @@ class CategoriesService:
         """Delete the category; return True if deleted, False if missing."""
         try:
             self.repository.delete_category(category_id)
+            self._invalidate()
             return True
         except ValueError:
             # Repository raises ValueError when row not found
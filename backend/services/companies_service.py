@@ -0,0 +1,34 @@
+from typing import Any, Dict, List, Optional
+
+
+class CompaniesService:
+    """
+    Company (tenant) scoped reads for CSR dashboards. Every method returns
+    None when the company does not exist, so the controller can answer 404.
+    """
+
+    def __init__(self, companies, accounts, requests):
+        self.companies = companies
+        self.accounts = accounts
+        self.requests = requests
+
+    def _exists(self, company_id: int) -> bool:
+        return self.companies.get_company_by_id(company_id) is not None
+
+    def list_accounts(self, company_id: int) -> Optional[List[Dict[str, Any]]]:
+        if not self._exists(company_id):
+            return None
+        rows = self.accounts.list_accounts_for_company(company_id)
+        return [{k: v for k, v in r.items() if k != "password"} for r in rows]
+
+    def list_volunteers(self, company_id: int) -> Optional[List[Dict[str, Any]]]:
+        if not self._exists(company_id):
+            return None
+        return self.companies.list_volunteers_for_company(company_id)
+
+    def list_requests(self, company_id: int, filters: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Requests handled by the company's CSRs (same filters as /api/requests/)."""
+        if not self._exists(company_id):
+            return None
+        csr_ids = self.accounts.list_csr_ids_for_company(company_id)
+        return self.requests.list_requests_for_csrs(csr_ids, filters or {})
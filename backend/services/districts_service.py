@@ -0,0 +1,79 @@
+import math
+from typing import Any, Dict, List, Optional
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+# Expanding search windows (km) used when a point falls outside every bounding box
+SEARCH_RADII_KM = (1.0, 2.5, 5.0, 10.0)
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in kilometres."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class DistrictsService:
+    """Business logic for districts and location -> district resolution."""
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    def list_districts(self) -> List[Dict[str, Any]]:
+        return self.repository.list_districts()
+
+    def get_district_by_id(self, district_id: int) -> Optional[Dict[str, Any]]:
+        return self.repository.get_district_by_id(district_id)
+
+    @staticmethod
+    def _closest(candidates: List[Dict[str, Any]], lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        best = None
+        for c in candidates:
+            dist = haversine_km(lat, lng, c["lat"], c["lng"])
+            if best is None or dist < best["distance_km"]:
+                best = {**c, "distance_km": round(dist, 3)}
+        return best
+
+    def nearest_district(self, lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a coordinate to a district.
+        Bounding boxes are approximate and may overlap, so among the boxes that
+        contain the point the one with the closest centroid wins. Points outside
+        every box (coastline, islands) fall back to widening R-tree windows.
+        """
+        if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+            raise ValueError("lat/lng out of range.")
+
+        found = self._closest(self.repository.find_in_window(lat, lng), lat, lng)
+        if found:
+            return found
+
+        for radius in SEARCH_RADII_KM:
+            d_lat = radius / KM_PER_DEG_LAT
+            d_lng = d_lat / max(math.cos(math.radians(lat)), 1e-6)
+            found = self._closest(self.repository.find_in_window(lat, lng, d_lat, d_lng), lat, lng)
+            if found:
+                return found
+        return None
+
+    def district_for_postal_code(self, postal_code: str) -> Optional[Dict[str, Any]]:
+        """Resolve a 6-digit Singapore postal code via its 2-digit postal sector."""
+        code = str(postal_code).strip()
+        if len(code) != 6 or not code.isdigit():
+            raise ValueError("postal_code must be a 6-digit Singapore postal code.")
+        return self.repository.get_district_by_postal_sector(code[:2])
+
+    def resolve_location(self, data: Dict[str, Any]) -> Optional[int]:
+        """Return a district_id from lat/lng or postal_code in a payload, if present."""
+        if data.get("lat") is not None and data.get("lng") is not None:
+            found = self.nearest_district(float(data["lat"]), float(data["lng"]))
+        elif data.get("postal_code"):
+            found = self.district_for_postal_code(data["postal_code"])
+        else:
+            return None
+        if not found:
+            raise ValueError("Could not resolve a district from the given location.")
+        return found["id"]
@@ -0,0 +1,105 @@
+from typing import Any, Dict, List, Optional, Set
+
+
+class ReferenceValidationError(ValueError):
+    """Unknown or mismatched ids; errors() lists them in pydantic's error shape (answered with 400)."""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__("; ".join(e["msg"] for e in errors))
+        self._errors = errors
+
+    def errors(self) -> List[Dict[str, Any]]:
+        return self._errors
+
+
+class ReferenceValidator:
+    """
+    Checks the ids a request write refers to, for one item or a batch, before
+    anything is written. Lookups are set-based: the accounts behind every
+    pin_id and csr_id in one query, every volunteer in another, and the small
+    category and district tables as cached id sets. Roles are checked from the
+    same rows: pin_id must be a PIN, csr_id a CSR, and every volunteer must
+    work for the CSR's company.
+
+    The id sets are only cached on a shared cache backend, which every
+    worker's category writes invalidate. An id missing from the cached set is
+    looked up again before it is rejected, so a category created a moment
+    ago is never refused.
+    """
+
+    # field -> (cache namespace, repository method) of the cached id sets.
+    # CategoriesService drops the "categories" namespace on every write;
+    # districts are reference data and only expire.
+    ID_SETS = {"category_id": ("categories", "category_ids"), "district_id": ("districts", "district_ids")}
+    ROLES = {"pin_id": "PIN", "csr_id": "CSR"}
+
+    def __init__(self, repository, cache=None):
+        self.repository = repository
+        # Optional backend.cache.Cache for the id sets (ignored unless its backend is shared)
+        self.cache = cache if cache is not None and getattr(cache.backend, "shared", False) else None
+
+    def _id_set(self, field: str, wanted: Set[int]) -> Set[int]:
+        namespace, method = self.ID_SETS[field]
+        load = getattr(self.repository, method)
+        if self.cache is None:
+            return set(load())
+        ids = set(self.cache.get_or_load(namespace, "ids", load))
+        return ids if wanted <= ids else set(load())
+
+    def check(self, items: List[Dict[str, Any]],
+              current: Optional[List[Optional[Dict[str, Any]]]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Errors for each item (empty when valid). An item holds the fields to
+        check: pin_id, csr_id, category_id, district_id, volunteers. When an
+        item has volunteers but no csr_id, the csr_id of its current row
+        (same position in `current`) decides their company.
+        """
+        current = current or [None] * len(items)
+        csr_of = [item.get("csr_id") if item.get("csr_id") is not None else (row or {}).get("csr_id")
+                  for item, row in zip(items, current)]
+        account_ids = {item[f] for item in items for f in self.ROLES if item.get(f) is not None}
+        account_ids.update(c for c, item in zip(csr_of, items) if c is not None and item.get("volunteers"))
+        volunteer_ids = {v for item in items for v in item.get("volunteers") or []}
+
+        accounts = self.repository.accounts(account_ids) if account_ids else {}
+        volunteers = self.repository.volunteers(volunteer_ids) if volunteer_ids else {}
+        wanted = {f: {item[f] for item in items if item.get(f) is not None} for f in self.ID_SETS}
+        id_sets = {f: self._id_set(f, ids) for f, ids in wanted.items() if ids}
+        return [self._errors(item, csr_id, accounts, volunteers, id_sets) for item, csr_id in zip(items, csr_of)]
+
+    def validate(self, item: Dict[str, Any], current: Optional[Dict[str, Any]] = None) -> None:
+        """check() for one item; raises ReferenceValidationError."""
+        errors = self.check([item], [current])[0]
+        if errors:
+            raise ReferenceValidationError(errors)
+
+    def _errors(self, item, csr_id, accounts, volunteers, id_sets) -> List[Dict[str, Any]]:
+        errors: List[Dict[str, Any]] = []
+
+        def error(loc, kind: str, msg: str, value) -> None:
+            errors.append({"loc": list(loc), "type": f"reference.{kind}", "msg": msg, "input": value})
+
+        for field, role in self.ROLES.items():
+            account_id = item.get(field)
+            if account_id is None:
+                continue
+            account = accounts.get(account_id)
+            if account is None:
+                error((field,), "not_found", f"Unknown {field} {account_id}.", account_id)
+            elif account["role"] != role:
+                error((field,), "role", f"{field} {account_id} is a {account['role']} account, not a {role}.",
+                      account_id)
+        for field, ids in id_sets.items():
+            value = item.get(field)
+            if value is not None and value not in ids:
+                error((field,), "not_found", f"Unknown {field} {value}.", value)
+
+        csr = accounts.get(csr_id)
+        company = csr["company_id"] if csr is not None and csr["role"] == "CSR" else None
+        for i, volunteer_id in enumerate(item.get("volunteers") or []):
+            if volunteer_id not in volunteers:
+                error(("volunteers", i), "not_found", f"Unknown volunteer {volunteer_id}.", volunteer_id)
+            elif company is not None and volunteers[volunteer_id] != company:
+                error(("volunteers", i), "company",
+                      f"Volunteer {volunteer_id} is not with company {company} of CSR {csr_id}.", volunteer_id)
+        return errors
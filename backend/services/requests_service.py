@@ -1,14 +1,128 @@
+from collections import Counter
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import json
 from backend.schemas.requests import Request  # Pydantic schema with business validators
+from backend.schemas.requests import UPDATE_INVARIANTS as REQUEST_UPDATE_INVARIANTS
+from backend.schemas.partial import validate_partial
+from backend.schemas.common import RequestStatus
+from backend.services.status_batcher import recording_check
+from backend.dedupe import OPEN_STATUSES as OPEN_DUPLICATE_STATUSES
+from backend.jobs import status_jobs
+
+
+def to_epoch(value, tz: tzinfo = timezone.utc) -> int:
+    """
+    Epoch seconds from a number, a digit string or ISO-8601 text
+    ('2025-11-08', '2025-11-08T17:00:00Z', '2025-11-08 17:00+08:00').
+    Text without an offset is read in `tz`.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    text = str(value).strip()
+    if text.lstrip("-").isdigit():
+        return int(text)
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r}: use ISO-8601 or epoch seconds.") from None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz)
+    return int(dt.timestamp())
+
+
+def _zone(name: str) -> tzinfo:
+    if name.upper() in ("UTC", "Z"):
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone {name!r}.") from None
+
 
 class RequestsService:
     """Business logic for requests."""
 
-    def __init__(self, repository): 
+    # Location fields accepted in place of district_id (resolved via DistrictsService)
+    LOCATION_FIELDS = ("lat", "lng", "postal_code")
+    MAX_PAGE_SIZE = 100
+    # Time filters on the start time; values are normalised to epoch seconds
+    WINDOW_FILTERS = ("start_after", "start_before", "active_at")
+    CALENDAR_MAX_DAYS = 92
+    # Opt-in facet counts over a list's rows: response key -> row field
+    FACETS = {"regions": "region_id", "districts": "district_id"}
+    # Fields that change a request's duplicate-index entry (text and PIN/district scope)
+    DUPLICATE_FIELDS = frozenset(("title", "description", "pin_id", "district_id"))
+    # Ids checked against their tables (and roles) before a write, with volunteers
+    REFERENCE_FIELDS = ("pin_id", "csr_id", "category_id", "district_id")
+
+    def __init__(self, repository, districts=None, status_batcher=None, list_cache=None, jobs=None, duplicates=None,
+                 references=None, jobs_share_db: bool = False):
         self.repository = repository
+        self.districts = districts
+        self.status_batcher = status_batcher
+        # Optional RequestListCache; every write below reports the rows it changed
+        self.list_cache = list_cache
+        # Optional backend.jobs.JobQueue for side effects of writes (notifications);
+        # jobs_share_db: its connection is the repository's, so jobs commit with the write
+        self.jobs = jobs
+        self.jobs_share_db = jobs_share_db
+        # Optional backend.dedupe.DuplicateDetector (MinHash/LSH index of titles + descriptions)
+        self.duplicates = duplicates
+        # Optional ReferenceValidator: ids checked against their tables before a write
+        self.references = references
+
+    def _invalidate(self, *rows) -> None:
+        if self.list_cache is not None:
+            self.list_cache.invalidate_rows(*rows)
+
+    def _check_references(self, fields: Dict[str, Any], current: Optional[Dict[str, Any]] = None) -> None:
+        """Raise ReferenceValidationError (400) for unknown ids or wrong roles/companies."""
+        if self.references is not None:
+            self.references.validate(fields, current)
+
+    def _hold_jobs(self, req_id: int, old_status: Optional[str], new_status: Optional[str]) -> List[int]:
+        """
+        Queue the jobs of a status change before it is written in its own commit:
+        held until _settle_jobs, or until jobs.hold_s passes after a crash.
+        """
+        if self.jobs is None:
+            return []
+        return [self.jobs.hold(kind, payload) for kind, payload in status_jobs(req_id, old_status, new_status)]
+
+    def _settle_jobs(self, held: List[int], applied: bool) -> None:
+        """Release held jobs once their status change committed, cancel them otherwise."""
+        if held:
+            if applied:
+                self.jobs.release(held)
+            else:
+                self.jobs.cancel(held)
+
+    def possible_duplicates(self, row: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Open requests of the same PIN and district whose text is near-identical to row's."""
+        if self.duplicates is None:
+            return []
+        out = []
+        for other_id, score in self.duplicates.find(row):
+            other = self.repository.get_request_by_id(other_id)
+            # Index entries of deleted or archived requests are pruned by `python -m backend.dedupe`
+            if other is not None and other["status"] in OPEN_DUPLICATE_STATUSES:
+                out.append({"id": other_id, "title": other["title"], "status": other["status"], "similarity": score})
+        return out
 
+    @staticmethod
+    def _best_effort(what: str, fn, *args):
+        """
+        Run duplicate-index upkeep after the write has committed; it commits on its
+        own and can hit "database is locked". A failure is logged and gives None,
+        never a 500 for a row that exists (`python -m backend.dedupe` catches up).
+        """
+        try:
+            return fn(*args)
+        except Exception as e:
+            print(f"⚠️  {what} failed: {e}")
+            return None
 
     @staticmethod
     def _serialize_volunteers(vols):
@@ -29,35 +143,131 @@ class RequestsService:
         data = dict(payload)
         data["volunteers"] = self._serialize_volunteers(payload.get("volunteers"))
 
+        # Resolve district from lat/lng or postal_code when district_id is not given
+        location = {k: data.pop(k) for k in self.LOCATION_FIELDS if k in data}
+        if data.get("district_id") is None and location and self.districts is not None:
+            data["district_id"] = self.districts.resolve_location(location)
+
         # Validate against Pydantic schema (status/CSR/volunteers constraints, dates, etc.)
         req = Request(**data)
+        self._check_references({
+            "pin_id": req.pin_id, "csr_id": req.csr_id, "category_id": req.category_id,
+            "district_id": req.district_id, "volunteers": req.volunteers,
+        })
 
-        created = self.repository.create_request(
+        status = req.status.value if hasattr(req.status, "value") else req.status  # enum-safe
+        fields = dict(
             pin_id=req.pin_id,
             csr_id=req.csr_id,
             category_id=req.category_id,
             district_id=req.district_id,
             title=req.title,
             description=req.description,
-            status=req.status.value if hasattr(req.status, "value") else req.status,  # enum-safe
+            status=status,
             start_at=req.start_at,
             end_at=req.end_at,
             created_at=req.created_at or datetime.utcnow(),
             volunteers=json.dumps(req.volunteers or []),  # store as JSON text
         )
+        if self.jobs is not None and self.jobs_share_db:
+            # Jobs are queued in the INSERT's transaction
+            def on_created(new_id: int) -> None:
+                for kind, payload in status_jobs(new_id, None, status):
+                    self.jobs.add(kind, payload)
+            fields["on_created"] = on_created
+        created = self.repository.create_request(**fields)
+        if self.jobs is not None and not self.jobs_share_db:
+            # PostgreSQL / shards: the id (the payload) is only known once the insert committed
+            for kind, payload in status_jobs(created["id"], None, status):
+                self.jobs.enqueue(kind, payload)
 
         # Return fresh row for consistent shape
         fresh = self.repository.get_request_by_id(created["id"])
-        return fresh or created
+        self._invalidate(fresh)
+        if fresh is None:
+            return created
+        if self.duplicates is not None:
+            duplicates = self._best_effort("duplicate lookup", self.possible_duplicates, fresh)
+            self._best_effort("duplicate indexing", self.duplicates.index, fresh)
+            if duplicates is not None:
+                return {**fresh, "possible_duplicates": duplicates}
+        return fresh
 
-    def get_request_by_id(self, req_id: int) -> Optional[Dict[str, Any]]:
+    def get_request_by_id(self, req_id: int, include_archived: bool = False) -> Optional[Dict[str, Any]]:
         row = self.repository.get_request_by_id(req_id)
+        if row is None and include_archived:
+            row = self.repository.get_archived_request_by_id(req_id)
         return row
 
     def list_requests(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        rows = self.repository.list_requests(filters or {})
+        """
+        Requests matching the equality filters, newest first. With
+        start_after/start_before (a [from, to) window on the start time) or
+        active_at (start <= T <= end) they come back in start order instead.
+        """
+        filters = dict(filters or {})
+        for key in self.WINDOW_FILTERS:
+            if key in filters:
+                filters[key] = to_epoch(filters[key])
+        if "active_at" in filters and filters.get("include_archived"):
+            raise ValueError("active_at cannot be combined with include_archived.")
+        if self.list_cache is not None:
+            return self.list_cache.get_or_load(filters, lambda: self.repository.list_requests(filters))
+        rows = self.repository.list_requests(filters)
         return rows
 
+    @classmethod
+    def facets(cls, rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Per-region and per-district counts of `rows`, largest first (no extra query)."""
+        result = {}
+        for name, field in cls.FACETS.items():
+            counts = Counter(row[field] for row in rows)
+            result[name] = [{field: value, "count": n} for value, n in counts.most_common()]
+        return result
+
+    def calendar(self, start, end, tz: str = "UTC", filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Requests starting in [start, end), grouped by day in time zone `tz`
+        (one start_ts range scan). start/end are dates, ISO-8601 times or
+        epoch seconds; values without an offset are read in `tz`.
+        """
+        zone = _zone(tz)
+        start_ts, end_ts = to_epoch(start, zone), to_epoch(end, zone)
+        if end_ts <= start_ts:
+            raise ValueError("'to' must be after 'from'.")
+        if end_ts - start_ts > self.CALENDAR_MAX_DAYS * 86400:
+            raise ValueError(f"Calendar range is limited to {self.CALENDAR_MAX_DAYS} days.")
+
+        rows = self.list_requests({**(filters or {}), "start_after": start_ts, "start_before": end_ts})
+        days: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:  # already in start order
+            day = datetime.fromtimestamp(row["start_ts"], zone).date().isoformat()
+            days.setdefault(day, []).append(row)
+        return {
+            "from": datetime.fromtimestamp(start_ts, zone).isoformat(),
+            "to": datetime.fromtimestamp(end_ts, zone).isoformat(),
+            "tz": tz,
+            "days": [{"date": day, "requests": items} for day, items in days.items()],
+        }
+
+    def list_nearby(
+        self,
+        district_id: int,
+        radius_km: float = 5.0,
+        status: str = "pending",
+        page: int = 1,
+        page_size: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Proximity-ranked requests around a district (nearest district, then start time)."""
+        if radius_km < 0:
+            raise ValueError("radius must be >= 0 (km).")
+        if page < 1 or not (1 <= page_size <= self.MAX_PAGE_SIZE):
+            raise ValueError(f"page must be >= 1 and page_size between 1 and {self.MAX_PAGE_SIZE}.")
+        status = RequestStatus(status).value  # raises ValueError on unknown status
+        return self.repository.list_nearby(
+            district_id, radius_km, status, limit=page_size, offset=(page - 1) * page_size
+        )
+
     def update_request(self, req_id: int, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         current = self.repository.get_request_by_id(req_id)
         if not current:
@@ -67,25 +277,74 @@ class RequestsService:
         if "volunteers" in data:
             data["volunteers"] = self._serialize_volunteers(data.get("volunteers"))
 
-        # Merge → re-validate to enforce invariants from schema
-        merged = {**current, **data}
-        # Convert volunteers TEXT->list if repository returned JSON string
-        if isinstance(merged.get("volunteers"), str):
-            try:
-                merged["volunteers"] = json.loads(merged["volunteers"])
-            except Exception:
-                merged["volunteers"] = []
-        Request(**merged)  # validation only
+        # Field-aware validation: only the changed fields, plus the invariants
+        # that depend on them (time order, status/csr_id/volunteers)
+        validate_partial(Request, current, data, REQUEST_UPDATE_INVARIANTS)
+        # Only the changed ids; volunteers again whenever their CSR (and so company) may change
+        refs = {k: int(data[k]) for k in self.REFERENCE_FIELDS if data.get(k) is not None}
+        if "csr_id" in data or "volunteers" in data:
+            vols = data["volunteers"] if "volunteers" in data else current.get("volunteers")
+            refs["volunteers"] = [int(v) for v in vols or []]
+        self._check_references(refs, current)
 
-        # Persist
-        self.repository.update_request(req_id, **data)
+        # Persist (volunteers column is JSON text)
+        if "volunteers" in data:
+            data["volunteers"] = json.dumps(data["volunteers"])
+        held, applied = self._hold_jobs(req_id, current["status"], data.get("status")), False
+        try:
+            self.repository.update_request(req_id, **data)
+            # Return updated row
+            updated = self.repository.get_request_by_id(req_id)
+            applied = updated is not None and bool(status_jobs(req_id, current["status"], updated["status"]))
+        finally:
+            self._settle_jobs(held, applied)
+        self._invalidate(current, updated)
+        if updated is not None:
+            if self.duplicates is not None and self.DUPLICATE_FIELDS.intersection(data):
+                self._best_effort("duplicate indexing", self.duplicates.index, updated)
+        return updated
 
-        # Return updated row
-        return self.repository.get_request_by_id(req_id)
+    def transition_status(self, req_id: int, payload: Dict[str, Any], timeout: float = 10.0) -> Optional[Dict[str, Any]]:
+        """
+        Change a request's status through the batched writer. Blocks until the
+        batch containing this transition has committed; None if not found.
+        Without a batcher the transition is applied directly as a batch of one.
+        """
+        if "status" not in payload:
+            raise ValueError("status is required.")
+        status = RequestStatus(payload["status"]).value
+        volunteers = payload.get("volunteers")
+        if volunteers is not None:
+            volunteers = self._serialize_volunteers(volunteers)
+        csr_id = int(payload["csr_id"]) if payload.get("csr_id") is not None else None
+        if status == RequestStatus.accepted.value:
+            # Other transitions release the CSR and volunteers
+            self._check_references({"csr_id": csr_id, "volunteers": volunteers})
+        if self.status_batcher is None:
+            item = {"id": req_id, "status": status, "csr_id": csr_id, "volunteers": volunteers}
+            before: Dict[int, Dict[str, Any]] = {}
+            held, applied = self._hold_jobs(req_id, None, status), False
+            try:
+                result = self.repository.apply_status_transitions([item], recording_check(before))[0]
+                applied = isinstance(result, dict) and bool(status_jobs(req_id, before[req_id]["status"], status))
+            finally:
+                self._settle_jobs(held, applied)
+            if isinstance(result, Exception):
+                raise result
+            if result is not None:
+                self._invalidate(before[req_id], {**before[req_id], **result})
+            return result
+        # The batcher queues the jobs in the transition's own transaction
+        fut = self.status_batcher.submit(req_id, status, csr_id, volunteers)
+        return fut.result(timeout=timeout)
 
     def delete_request(self, req_id: int) -> bool:
+        current = self.repository.get_request_by_id(req_id) if self.list_cache is not None else None
         try:
             self.repository.delete_request(req_id)
-            return True
         except ValueError:
             return False
+        self._invalidate(current)
+        if self.duplicates is not None:
+            self._best_effort("duplicate index removal", self.duplicates.remove, req_id)
+        return True
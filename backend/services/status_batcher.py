@@ -0,0 +1,140 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.jobs import JobQueue, status_jobs
+from backend.repositories.jobs_repository import JobsRepository
+from backend.repositories.requests_repository import RequestsRepository
+from backend.schemas.common import REQUEST_STATUS_TRANSITIONS, RequestStatus
+
+
+def check_transition(current: Dict[str, Any], item: Dict[str, Any]) -> Tuple[str, Optional[int], List[int]]:
+    """
+    Validate one status transition against the state-machine table and return
+    the new (status, csr_id, volunteers). Only the fields the transition touches
+    are checked, without rebuilding a full Request model.
+    """
+    old = RequestStatus(current["status"])
+    new = RequestStatus(item["status"])
+    if new not in REQUEST_STATUS_TRANSITIONS[old]:
+        raise ValueError(f"Cannot change status from '{old.value}' to '{new.value}'.")
+
+    if new == RequestStatus.accepted:
+        csr_id = item.get("csr_id") if item.get("csr_id") is not None else current.get("csr_id")
+        volunteers = item.get("volunteers") if item.get("volunteers") is not None else (current.get("volunteers") or [])
+        if csr_id is None:
+            raise ValueError("csr_id is required for accepted/completed requests.")
+        if len(volunteers) < 1:
+            raise ValueError("At least one volunteer is required for accepted/completed requests.")
+        return new.value, csr_id, volunteers
+    if new == RequestStatus.completed:
+        return new.value, current.get("csr_id"), current.get("volunteers") or []
+    # pending / expired: release CSR and volunteers
+    return new.value, None, []
+
+
+def recording_check(before: Dict[int, Dict[str, Any]]):
+    """check_transition that also records each current row (by id) into `before`."""
+    def check(current: Dict[str, Any], item: Dict[str, Any]):
+        before[item["id"]] = current
+        return check_transition(current, item)
+    return check
+
+
+class StatusBatcher:
+    """
+    Write-behind queue for status transitions with group commit.
+
+    Callers submit() a transition and get a Future. A single writer thread
+    (with its own connection) drains the queue, collecting up to `max_items`
+    transitions or waiting at most `max_wait_ms` after the first one. It applies
+    them in one transaction and resolves the futures only after COMMIT, so an
+    acknowledged transition is durable.
+
+    on_commit, if given, is called after each COMMIT (before the futures
+    resolve) with the (before, after) row pairs of the applied transitions.
+
+    With job_attempts set, the jobs of each applied transition
+    (backend.jobs.status_jobs) are queued in the same transaction, so a
+    committed transition always has its notification queued.
+    """
+
+    def __init__(self, db_path, max_items: int = 64, max_wait_ms: float = 5.0,
+                 on_commit: Optional[Callable[[List[Tuple[Dict[str, Any], Dict[str, Any]]]], Any]] = None,
+                 job_attempts: Optional[int] = None):
+        self.db_path = str(db_path)
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000.0
+        self.on_commit = on_commit
+        self.job_attempts = job_attempts
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="status-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, req_id: int, status: str, csr_id: Optional[int] = None,
+               volunteers: Optional[List[int]] = None) -> Future:
+        self._ensure_started()
+        fut: Future = Future()
+        self._queue.put(({"id": req_id, "status": status, "csr_id": csr_id, "volunteers": volunteers}, fut))
+        return fut
+
+    def _collect(self) -> List[Tuple[Dict[str, Any], Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+        repo = RequestsRepository(conn)
+        on_applied = None
+        if self.job_attempts is not None:
+            jobs = JobQueue(JobsRepository(conn), self.job_attempts)
+
+            def on_applied(current: Dict[str, Any], result: Dict[str, Any]) -> None:
+                for kind, payload in status_jobs(result["id"], current["status"], result["status"]):
+                    jobs.add(kind, payload)
+        while True:
+            batch = self._collect()
+            before: Dict[int, Dict[str, Any]] = {}
+            try:
+                results = repo.apply_status_transitions([item for item, _ in batch], recording_check(before),
+                                                        on_applied)
+            except Exception as e:  # whole batch failed (e.g. database locked)
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            if self.on_commit is not None:
+                changes = [(before[r["id"]], {**before[r["id"]], **r}) for r in results if isinstance(r, dict)]
+                if changes:
+                    try:
+                        self.on_commit(changes)
+                    except Exception as e:  # never leave the futures unresolved
+                        print(f"⚠️  status batcher on_commit failed: {e}")
+            for (_, fut), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    fut.set_exception(result)
+                else:
+                    fut.set_result(result)
@@ -0,0 +1,189 @@
+# backend/sharding.py
+"""
+Optional per-region sharding of request storage (REQUEST_SHARDS=region).
+
+Requests of each region (districts.region_id) live in their own SQLite
+file under SHARD_DIR, so writers in different regions take different write
+locks instead of queueing on surething.db's. SHARD_MAP can route several
+regions to one file ("1:north.db,2:north.db,3:south.db"); unmapped regions
+get region_<id>.db. Everything else (accounts, districts, idempotency keys,
+...) stays in surething.db, which the router reads to map districts to
+regions.
+
+Shard files get their schema from surething.db itself: the requests and
+requests_archive tables, request_windows and their indexes and triggers
+are copied from sqlite_master (new columns and indexes follow on the next
+start), minus the triggers that look up districts. The router sets
+region_id itself. Foreign keys are not enforced across files.
+
+Ids: new requests get (region_id << ID_BITS) + n from the shard's
+shard_sequences row, so an id names its shard. Rows already in
+surething.db when sharding is switched on keep their ids and are moved to
+their shards at startup; lookups of those older ids probe every shard.
+
+`python -m backend.archive` archives every shard file along with
+surething.db; maintenance runs on a shard file with --db.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent
+DEFAULT_SHARD_DIR = BACKEND_DIR / "shards"
+
+MODES = ("none", "region")
+ID_BITS = 40
+SHARDED_TABLES = ("requests", "requests_archive", "request_windows")
+# Need districts, which shard files do not have
+SKIPPED_TRIGGERS = ("trg_requests_region_insert", "trg_requests_region_update", "trg_requests_archive_region_insert")
+
+SHARD_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shard_sequences (
+    region_id INTEGER PRIMARY KEY,
+    seq       INTEGER NOT NULL
+);
+"""
+
+
+def parse_shard_map(value) -> Dict[int, str]:
+    """SHARD_MAP as a dict, or from "region:file,region:file" text."""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return {int(k): str(v) for k, v in value.items()}
+    mapping = {}
+    for part in str(value).split(","):
+        region, sep, name = part.partition(":")
+        if not sep or not region.strip().isdigit() or not name.strip():
+            raise RuntimeError(f"Invalid SHARD_MAP entry {part!r} (expected region_id:file.db).")
+        mapping[int(region)] = name.strip()
+    return mapping
+
+
+def region_of_id(req_id: int) -> Optional[int]:
+    """The region encoded in a sharded id, or None for ids from before sharding."""
+    return (req_id >> ID_BITS) or None
+
+
+def first_id(region_id: int) -> int:
+    return (region_id << ID_BITS) + 1
+
+
+def sync_schema(main: sqlite3.Connection, shard: sqlite3.Connection) -> None:
+    """Create (or extend) the requests tables, indexes and triggers in a shard from main's schema."""
+    shard.executescript(SHARD_SCHEMA)
+    existing = {name for (name,) in shard.execute("SELECT name FROM sqlite_master")}
+    marks = ", ".join("?" for _ in SHARDED_TABLES)
+    objects = main.execute(
+        f"SELECT type, name, tbl_name, sql FROM sqlite_master "
+        f"WHERE tbl_name IN ({marks}) AND sql IS NOT NULL "
+        f"ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END",
+        SHARDED_TABLES,
+    ).fetchall()
+    for kind, name, table, sql in objects:
+        if kind == "trigger" and name in SKIPPED_TRIGGERS:
+            continue
+        if name not in existing:
+            shard.execute(sql)
+        elif kind == "table" and table != "request_windows":
+            have = {r[1] for r in shard.execute(f"PRAGMA table_info({table})")}
+            for _, col, col_type, _, default, _ in main.execute(f"PRAGMA table_info({table})"):
+                if col not in have:
+                    dflt = f" DEFAULT {default}" if default is not None else ""
+                    shard.execute(f"ALTER TABLE {table} ADD COLUMN {col} {col_type}{dflt}")
+    shard.commit()
+
+
+class ShardMap:
+    """Region -> shard file routing, and shard file setup."""
+
+    def __init__(self, main_path, shard_dir=DEFAULT_SHARD_DIR, mapping: Optional[Dict[int, str]] = None):
+        self.main_path = Path(main_path)
+        self.shard_dir = Path(shard_dir)
+        self.mapping = dict(mapping or {})
+        self._ready: set = set()
+        self._lock = threading.Lock()
+
+    def path_for(self, region_id: int) -> Path:
+        """The region's shard file (created with the current schema on first use)."""
+        path = self.shard_dir / self.mapping.get(region_id, f"region_{region_id}.db")
+        if path not in self._ready:
+            self._ensure(path)
+        return path
+
+    def paths(self, main: sqlite3.Connection) -> List[Path]:
+        """Every shard file of a region in main's regions table (one entry per file)."""
+        regions = [r for (r,) in main.execute("SELECT id FROM regions ORDER BY id")]
+        return list(dict.fromkeys(self.path_for(r) for r in regions))
+
+    def _ensure(self, path: Path) -> None:
+        with self._lock:
+            if path in self._ready:
+                return
+            self.shard_dir.mkdir(parents=True, exist_ok=True)
+            main = sqlite3.connect(str(self.main_path), timeout=5.0)
+            shard = sqlite3.connect(str(path), timeout=5.0)
+            try:
+                shard.execute("PRAGMA journal_mode = WAL;")
+                sync_schema(main, shard)
+            finally:
+                shard.close()
+                main.close()
+            self._ready.add(path)
+
+    def migrate(self) -> Dict[str, int]:
+        """
+        Move rows still in surething.db's requests/requests_archive into their
+        shards (same ids). Copy first, then delete, so a crash in between
+        leaves duplicates that the next run skips (INSERT OR IGNORE).
+        """
+        moved: Dict[str, int] = {}
+        main = sqlite3.connect(str(self.main_path), timeout=5.0)
+        try:
+            for table in ("requests", "requests_archive"):
+                regions = [r for (r,) in main.execute(f"SELECT DISTINCT region_id FROM {table}")]
+                for region in regions:
+                    if region is None:
+                        continue
+                    path = self.path_for(region)
+                    main.execute("ATTACH DATABASE ? AS shard", (str(path),))
+                    try:
+                        cols = ", ".join(r[1] for r in main.execute(f"PRAGMA main.table_info({table})"))
+                        with main:
+                            main.execute(
+                                f"INSERT OR IGNORE INTO shard.{table} ({cols}) "
+                                f"SELECT {cols} FROM main.{table} WHERE region_id = ?",
+                                (region,),
+                            )
+                            n = main.execute(f"DELETE FROM main.{table} WHERE region_id = ?", (region,)).rowcount
+                    finally:
+                        main.execute("DETACH DATABASE shard")
+                    moved[table] = moved.get(table, 0) + n
+        finally:
+            main.close()
+        return moved
+
+
+def bootstrap_shards(config, main_path) -> Optional[ShardMap]:
+    """The ShardMap for REQUEST_SHARDS (None when off), with existing rows moved into the shards."""
+    mode = config.get("REQUEST_SHARDS", "none")
+    if mode not in MODES:
+        raise RuntimeError(f"Unknown REQUEST_SHARDS {mode!r} (expected one of: {', '.join(MODES)})")
+    if mode == "none":
+        return None
+    if config.get("STORAGE_BACKEND", "sqlite") != "sqlite":
+        raise RuntimeError("REQUEST_SHARDS=region requires STORAGE_BACKEND=sqlite.")
+    shards = ShardMap(main_path, config.get("SHARD_DIR") or DEFAULT_SHARD_DIR,
+                      parse_shard_map(config.get("SHARD_MAP")))
+    moved = shards.migrate()
+    if any(moved.values()):
+        print(f"🧩 moved into region shards: {moved}")
+    main = sqlite3.connect(str(main_path), timeout=5.0)
+    try:
+        shards.paths(main)  # every known region's file exists before the first read-only open
+    finally:
+        main.close()
+    return shards
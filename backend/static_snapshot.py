@@ -0,0 +1,197 @@
+# backend/static_snapshot.py
+"""
+Static JSON snapshots of the read-only API, for the frontend's static mode
+(GitHub Pages, a CDN: see STATIC_MAP in frontend/static/js/api.js).
+
+Like backend.export, rows are read from a point-in-time copy of
+surething.db (with the request shard files merged in when
+REQUEST_SHARDS=region; STORAGE_BACKEND=postgres is refused) and streamed in
+id order, so memory stays flat. Each collection
+is cut into pages of PAGE_SIZE ids (page k holds ids k*PAGE_SIZE ..
+(k+1)*PAGE_SIZE-1), so a new or changed row only changes its own page:
+
+  <out>/manifest.json                         collections, pages, id ranges, hashes
+  <out>/<collection>/<k>-<sha256[:16]>.json   one page: a JSON array of rows
+  <out>/<collection>/<k>-<sha256[:16]>.json.gz   the same, gzip (for gzip_static / CDNs)
+
+  accounts     without passwords
+  categories   as stored
+  requests     summaries joined with the PIN's email and name and the
+               category, district and region names
+
+Page files are named by their content hash, so they can be cached forever.
+Only the short-lived manifest.json changes between builds. A rebuild only
+writes pages whose content changed. The manifest is replaced last, so
+readers never see a manifest that points at missing files. Files
+referenced by neither the new nor the previous manifest are deleted, so a
+client holding the previous manifest can still load its pages.
+
+Usage:
+  python -m backend.static_snapshot                       # -> frontend/data/
+  python -m backend.static_snapshot --out site/data --page-size 1000 --force
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BACKEND_DIR.parent
+DEFAULT_OUT = PROJECT_ROOT / "frontend" / "data"
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.export import DB_PATH, request_shards, snapshot  # noqa: E402
+
+PAGE_SIZE = 500
+FETCH_SIZE = 2000
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+# collection -> SELECT in id order (never include accounts.password)
+SNAPSHOT_QUERIES: Dict[str, str] = {
+    "accounts": "SELECT id, email, name, phone, role, status, company_id FROM accounts ORDER BY id",
+    "categories": "SELECT id, name, description FROM categories ORDER BY id",
+    "requests": """
+        SELECT r.id, r.title, r.description, r.status,
+               r.pin_id, a.email AS pin_email, a.name AS pin_name, r.csr_id,
+               r.category_id, c.name AS category_name,
+               r.district_id, d.name AS district_name, r.region_id, g.name AS region_name,
+               r.start_at, r.end_at, r.created_at, r.volunteers
+        FROM requests r
+        LEFT JOIN accounts a ON a.id = r.pin_id
+        LEFT JOIN categories c ON c.id = r.category_id
+        LEFT JOIN districts d ON d.id = r.district_id
+        LEFT JOIN regions g ON g.id = r.region_id
+        ORDER BY r.id
+    """,
+}
+JSON_COLUMNS = {"requests": ("volunteers",)}
+
+
+def iter_pages(conn, collection: str, page_size: int = PAGE_SIZE) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Yield (page key, rows) for a collection, rows in id order, pages by id range."""
+    json_cols = JSON_COLUMNS.get(collection, ())
+    cur = conn.execute(SNAPSHOT_QUERIES[collection])
+    key: Optional[int] = None
+    page: List[Dict[str, Any]] = []
+    while True:
+        rows = cur.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            d = dict(row)
+            for col in json_cols:
+                d[col] = json.loads(d[col]) if d[col] else []
+            row_key = d["id"] // page_size
+            if row_key != key and page:
+                yield key, page
+                page = []
+            key = row_key
+            page.append(d)
+    if page:
+        yield key, page
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _load_manifest(out_dir: Path) -> Dict[str, Any]:
+    try:
+        return json.loads((out_dir / MANIFEST).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _files(manifest: Dict[str, Any]) -> set:
+    return {
+        name
+        for coll in manifest.get("collections", {}).values()
+        for page in coll.get("pages", [])
+        for name in (page["file"], page["file"] + ".gz")
+    }
+
+
+def build(out_dir: Path = DEFAULT_OUT, db_path: Path = DB_PATH, page_size: int = PAGE_SIZE,
+          force: bool = False, shards: Sequence[Path] = ()) -> Dict[str, Any]:
+    """Write or refresh the snapshot in out_dir; returns the new manifest plus write/skip/delete counts."""
+    if page_size < 1:
+        raise ValueError("page_size must be >= 1.")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = _load_manifest(out_dir)
+    counts = {"written": 0, "unchanged": 0, "deleted": 0}
+    collections: Dict[str, Any] = {}
+
+    with snapshot(db_path, shards=shards) as conn:
+        for collection in SNAPSHOT_QUERIES:
+            (out_dir / collection).mkdir(exist_ok=True)
+            pages, total = [], 0
+            for key, rows in iter_pages(conn, collection, page_size):
+                body = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                digest = hashlib.sha256(body).hexdigest()
+                name = f"{collection}/{key}-{digest[:16]}.json"
+                if force or not (out_dir / name).exists() or not (out_dir / f"{name}.gz").exists():
+                    _write_atomic(out_dir / name, body)
+                    # mtime=0: identical pages give identical .gz bytes (stable ETags)
+                    _write_atomic(out_dir / f"{name}.gz", gzip.compress(body, 9, mtime=0))
+                    counts["written"] += 1
+                else:
+                    counts["unchanged"] += 1
+                pages.append({"key": key, "first_id": rows[0]["id"], "last_id": rows[-1]["id"],
+                              "count": len(rows), "sha256": digest, "bytes": len(body), "file": name})
+                total += len(rows)
+            collections[collection] = {"count": total, "pages": pages}
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "page_size": page_size,
+        "collections": collections,
+    }
+    _write_atomic(out_dir / MANIFEST, json.dumps(manifest, indent=1).encode("utf-8"))
+
+    keep = _files(manifest) | _files(previous)
+    for collection in SNAPSHOT_QUERIES:
+        for path in (out_dir / collection).iterdir():
+            if f"{collection}/{path.name}" not in keep:
+                path.unlink()
+                counts["deleted"] += 1
+    return {**manifest, **counts}
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Build the static JSON snapshot for the frontend's static mode.")
+    p.add_argument("--out", type=Path, default=DEFAULT_OUT, help=f"Output directory (default: {DEFAULT_OUT})")
+    p.add_argument("--db", type=Path, default=DB_PATH, help="SQLite database to snapshot")
+    p.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Ids per page")
+    p.add_argument("--force", action="store_true", help="Rewrite every page")
+    args = p.parse_args(argv)
+
+    try:
+        result = build(args.out, args.db, args.page_size, args.force, request_shards(os.environ, args.db))
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    for name, coll in result["collections"].items():
+        print(f"📄 {name}: {coll['count']} rows in {len(coll['pages'])} page(s)")
+    print(f"✅ {result['written']} page(s) written, {result['unchanged']} unchanged, "
+          f"{result['deleted']} stale file(s) removed -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# backend/storage.py
+"""
+Storage backend selection.
+
+STORAGE_BACKEND chooses where accounts, categories, companies and requests
+live:
+
+  - "sqlite"   (default) the repositories in backend.repositories, on the
+               per-request connections from backend.db_session.
+  - "postgres" the implementations in backend.repositories.postgres, on a
+               pooled connection (DATABASE_URL). Requires psycopg 3.
+
+With REQUEST_SHARDS=region (SQLite only) requests are instead served by
+ShardedRequestsRepository from per-region files (backend.sharding).
+
+Both implement the interface in backend.repositories.interfaces, so services
+do not know which one they got. Reference data used only for lookups
+(district geometry and postal sectors), idempotency keys and the SQLite-only
+tools (export, query_plans) stay in the local SQLite file.
+"""
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+
+from flask import current_app
+
+from backend.db_session import get_db, get_pg, get_read_db, get_shard_db
+
+BACKENDS = ("sqlite", "postgres")
+PG_SCHEMA_SQL = Path(__file__).resolve().parent / "repositories" / "postgres" / "schema.sql"
+
+_SQLITE = {
+    "accounts": ("backend.repositories.accounts_repository", "AccountsRepository"),
+    "categories": ("backend.repositories.categories_repository", "CategoriesRepository"),
+    "companies": ("backend.repositories.companies_repository", "CompaniesRepository"),
+    "references": ("backend.repositories.references_repository", "ReferencesRepository"),
+    "requests": ("backend.repositories.requests_repository", "RequestsRepository"),
+}
+_POSTGRES = {
+    "accounts": "PgAccountsRepository",
+    "categories": "PgCategoriesRepository",
+    "companies": "PgCompaniesRepository",
+    "references": "PgReferencesRepository",
+    "requests": "PgRequestsRepository",
+}
+
+
+def backend_name() -> str:
+    name = current_app.config.get("STORAGE_BACKEND", "sqlite")
+    if name not in BACKENDS:
+        raise RuntimeError(f"Unknown STORAGE_BACKEND {name!r} (expected one of: {', '.join(BACKENDS)})")
+    return name
+
+
+def is_sqlite() -> bool:
+    return backend_name() == "sqlite"
+
+
+def is_sharded() -> bool:
+    return current_app.extensions.get("request_shards") is not None
+
+
+def repository(kind: str, read_only: bool = False, replica: bool = True):
+    """
+    Repository for `kind` (accounts/categories/companies/references/requests)
+    on the configured backend. read_only reads go to the SQLite read replica,
+    if configured, unless replica=False (cache fills, see backend.db_session).
+    """
+    if backend_name() == "postgres":
+        from backend.repositories import postgres
+        return getattr(postgres, _POSTGRES[kind])(get_pg())
+    if kind == "requests" and is_sharded():
+        from backend.repositories.sharded_requests_repository import ShardedRequestsRepository
+        return ShardedRequestsRepository(
+            get_read_db(replica) if read_only else get_db(),
+            current_app.extensions["request_shards"],
+            lambda path: get_shard_db(path, read_only),
+        )
+    module, cls = _SQLITE[kind]
+    return getattr(importlib.import_module(module), cls)(get_read_db(replica) if read_only else get_db())
+
+
+def bootstrap_postgres(dsn: str, fingerprint: str, seed_dir: Path) -> None:
+    """
+    Apply schema.sql and COPY-seed the PostgreSQL database, unless it was
+    already bootstrapped with the same fingerprint (app_meta), as on SQLite.
+    """
+    try:
+        import psycopg
+    except ImportError as e:
+        raise RuntimeError("STORAGE_BACKEND=postgres requires psycopg (pip install \"psycopg[binary,pool]\").") from e
+
+    with psycopg.connect(dsn) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS app_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = conn.execute("SELECT value FROM app_meta WHERE key = 'bootstrap'").fetchone()
+        if row is not None and row[0] == fingerprint:
+            return
+        conn.execute(PG_SCHEMA_SQL.read_text(encoding="utf-8"))
+        from seed import copy_to_postgres
+        copy_to_postgres.run_with_existing_conn(conn, seed_dir)
+        conn.execute(
+            "INSERT INTO app_meta (key, value) VALUES ('bootstrap', %s) "
+            "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value",
+            (fingerprint,),
+        )
@@ -0,0 +1,102 @@
+# benchmarks/bench_formats.py
+"""
+List response formats: payload size, encode and decode time for JSON,
+MessagePack and Arrow IPC (backend.formats).
+
+Rows are synthetic requests and accounts shaped like the list endpoints'.
+Encoding is what the server does per response, decoding what a consumer
+does with the body: json.loads, msgpack.unpackb (list of dicts), and
+pyarrow.ipc.open_stream().read_all() (a columnar Table, no per-row
+objects) plus, for comparison, Table.to_pylist() back into dicts.
+
+Usage:
+  python benchmarks/bench_formats.py [--rows 10000 50000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend import formats
+
+
+def request_rows(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    statuses = ["pending", "accepted", "completed", "expired"]
+    rows = []
+    for i in range(1, n + 1):
+        start = 1761955200 + rng.randrange(0, 90 * 86400)
+        rows.append({
+            "id": i, "pin_id": rng.randrange(1, 500), "csr_id": rng.choice([None, rng.randrange(1, 50)]),
+            "category_id": rng.randrange(1, 9), "district_id": rng.randrange(101, 143), "region_id": rng.randrange(1, 6),
+            "title": f"Request {i}: help with {rng.choice(['groceries', 'transport', 'homework', 'repairs'])}",
+            "description": "Details about what is needed and when. " * rng.randrange(1, 4),
+            "status": rng.choice(statuses),
+            "start_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(start)),
+            "end_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(start + 7200)),
+            "created_at": "2025-11-01 09:30:00", "created_ts": start - 86400,
+            "start_ts": start, "end_ts": start + 7200,
+            "volunteers": rng.sample(range(1, 200), rng.randrange(0, 4)),
+        })
+    return rows
+
+
+def account_rows(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [{
+        "id": i, "email": f"user{i}@example.com", "password": "pbkdf2:sha256:600000$salt$" + "ab" * 32,
+        "name": f"User {i}", "phone": f"9{rng.randrange(1000000, 9999999)}",
+        "role": rng.choice(["PIN", "CSR", "Admin"]), "status": "active", "company_id": rng.choice([None, 1, 2, 3]),
+    } for i in range(1, n + 1)]
+
+
+def best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    p.add_argument("--repeat", type=int, default=5, help="best of N timings")
+    args = p.parse_args(argv)
+
+    msgpack, pa = formats._msgpack(), formats._pyarrow()
+    cases = [("json", lambda rows: json.dumps(rows).encode(), json.loads)]
+    if msgpack is not None:
+        cases.append(("msgpack", formats.to_msgpack, msgpack.unpackb))
+    else:
+        print("(msgpack not installed: pip install msgpack)")
+    if pa is not None:
+        cases.append(("arrow", formats.to_arrow, lambda body: pa.ipc.open_stream(body).read_all()))
+        cases.append(("arrow->dicts", formats.to_arrow, lambda body: pa.ipc.open_stream(body).read_all().to_pylist()))
+    else:
+        print("(pyarrow not installed: pip install pyarrow)")
+
+    print(f"{'rows':<18}{'format':<14}{'bytes':>12}{'vs json':>9}{'encode ms':>11}{'decode ms':>11}")
+    for label, make in (("requests", request_rows), ("accounts", account_rows)):
+        for n in args.rows:
+            rows = make(n)
+            json_size = None
+            for name, encode, decode in cases:
+                body = encode(rows)
+                json_size = json_size or len(body)
+                enc = best_ms(lambda: encode(rows), args.repeat)
+                dec = best_ms(lambda: decode(body), args.repeat)
+                print(f"{label + ' ' + str(n):<18}{name:<14}{len(body):>12,}{len(body) / json_size:>8.2f}x"
+                      f"{enc:>11.1f}{dec:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
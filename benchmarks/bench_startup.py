@@ -0,0 +1,87 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start benchmark for create_app().
+
+Each run starts a fresh interpreter with `python -X importtime`, imports
+backend.app and calls create_app(), then serves one GET so that lazily loaded
+modules show up separately. Reported per run:
+  - import + create_app() wall time
+  - first request wall time (services/pydantic load here, on first use)
+and, from the importtime log of the last run, the slowest modules by
+cumulative import time.
+
+Usage:
+  python benchmarks/bench_startup.py [--runs 5] [--top 15]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+PROBE = r"""
+import time
+t0 = time.perf_counter()
+from backend.app import create_app
+app = create_app()
+t1 = time.perf_counter()
+with app.test_client() as c:
+    assert c.get("/api/categories/").status_code == 200
+t2 = time.perf_counter()
+print(f"RESULT {t1 - t0:.6f} {t2 - t1:.6f}")
+"""
+
+
+def run_once():
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("RESULT "))
+    _, startup, first_request = line.split()
+    return float(startup), float(first_request), proc.stderr
+
+
+def parse_importtime(stderr: str):
+    """Return [(cumulative_us, module)] for top-level imports in an importtime log."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, raw_name = line.split(":", 1)[1].split("|")
+        if raw_name[1:2] == " ":  # nested import (indented); its cost is in the parent
+            continue
+        rows.append((int(cumulative_us), raw_name.strip()))
+    return rows
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Measure create_app() cold start.")
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = p.parse_args(argv)
+
+    run_once()  # bootstrap the DB once so every measured run is a normal restart
+    startups, firsts, log = [], [], ""
+    for _ in range(args.runs):
+        startup, first, log = run_once()
+        startups.append(startup)
+        firsts.append(first)
+
+    print(f"create_app() incl. imports: median {statistics.median(startups) * 1000:.1f} ms "
+          f"(min {min(startups) * 1000:.1f}, max {max(startups) * 1000:.1f}) over {args.runs} runs")
+    print(f"first request:              median {statistics.median(firsts) * 1000:.1f} ms")
+    print(f"\nslowest imports (cumulative, last run):")
+    for cumulative_us, name in sorted(parse_importtime(log), reverse=True)[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
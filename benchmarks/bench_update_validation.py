@@ -0,0 +1,63 @@
+# benchmarks/bench_update_validation.py
+"""
+Per-update validation CPU: full model rebuild vs field-aware partial validation.
+
+Compares what the services used to do on PUT (merge current row + changes
+and construct the whole Pydantic model) with validate_partial(), for typical
+one-field and multi-field updates.
+
+Usage:
+  python benchmarks/bench_update_validation.py [--n 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.schemas.accounts import Account, UPDATE_INVARIANTS as ACCOUNT_INVARIANTS
+from backend.schemas.categories import Category
+from backend.schemas.partial import validate_partial
+from backend.schemas.requests import Request, UPDATE_INVARIANTS as REQUEST_INVARIANTS
+
+REQUEST_ROW = {
+    "id": 1, "pin_id": 1, "csr_id": 4, "category_id": 4, "district_id": 108,
+    "title": "Math homework help", "description": "Assist with algebra.",
+    "status": "accepted", "start_at": "2025-11-08T17:00:00Z", "end_at": "2025-11-08T18:00:00Z",
+    "created_at": "2025-11-05T10:00:00Z", "volunteers": [35, 40],
+}
+ACCOUNT_ROW = {
+    "id": 4, "email": "erin.robinson4@example.com", "password": "pbkdf2:sha256:600000$x$y",
+    "name": "Erin Robinson", "phone": "91234567", "role": "CSR", "status": "active", "company_id": 1,
+}
+CATEGORY_ROW = {"id": 1, "name": "Transport", "description": "Rides to appointments."}
+
+CASES = [
+    ("request: title", Request, REQUEST_ROW, {"title": "Algebra help"}, REQUEST_INVARIANTS),
+    ("request: dates", Request, REQUEST_ROW, {"end_at": "2025-11-08T19:00:00Z"}, REQUEST_INVARIANTS),
+    ("request: status", Request, REQUEST_ROW, {"status": "completed"}, REQUEST_INVARIANTS),
+    ("account: phone", Account, ACCOUNT_ROW, {"phone": "98765432"}, ACCOUNT_INVARIANTS),
+    ("account: email", Account, ACCOUNT_ROW, {"email": "erin.r@example.com"}, ACCOUNT_INVARIANTS),
+    ("category: description", Category, CATEGORY_ROW, {"description": "Rides."}, ()),
+]
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--n", type=int, default=20000, help="iterations per case")
+    args = p.parse_args(argv)
+
+    print(f"{'case':<24}{'full model µs':>15}{'partial µs':>13}{'speedup':>10}")
+    for label, model, current, changes, invariants in CASES:
+        full = timeit.timeit(lambda: model(**{**current, **changes}), number=args.n) / args.n * 1e6
+        validate_partial(model, current, changes, invariants)  # warm the adapter cache
+        part = timeit.timeit(lambda: validate_partial(model, current, changes, invariants), number=args.n) / args.n * 1e6
+        print(f"{label:<24}{full:>15.2f}{part:>13.2f}{full / part:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,25 +3,53 @@
   // 로컬 Flask 서버 주소
   const API_BASE = 'http://127.0.0.1:5000/api';
 
-  // GitHub Pages나 정적 서버(5500)에서 JSON으로 읽을 경로
+  // GitHub Pages나 정적 서버(5500)에서 읽을 스냅샷 컬렉션
+  // (python -m backend.static_snapshot 이 data/manifest.json 과 페이지 파일을 생성)
   const STATIC_MAP = {
-    '/accounts/':   'data/accounts.json',
-    '/categories/': 'data/categories.json',
-    '/requests/':   'data/requests.json',
+    '/accounts/':   'accounts',
+    '/categories/': 'categories',
+    '/requests/':   'requests',
   };
+  const STATIC_BASE = 'data/';
 
-  async function fetchJson(url) {
-    const r = await fetch(url);
+  async function fetchJson(url, init) {
+    const r = await fetch(url, init);
     if (!r.ok) throw new Error(await r.text());
     return r.json();
   }
 
+  // manifest 는 페이지당 한 번만 읽음 (페이지 파일 이름에 해시가 있어 캐시 가능)
+  let manifestPromise = null;
+  function staticManifest() {
+    if (!manifestPromise) {
+      manifestPromise = fetchJson(`${STATIC_BASE}manifest.json`, { cache: 'no-cache' });
+    }
+    return manifestPromise;
+  }
+
+  // '/requests/' -> 모든 페이지를 합친 배열, '/requests/12' -> id 범위로 찾은 페이지의 한 행
+  async function staticGet(path) {
+    const m = path.match(/^(\/[a-z]+\/)(\d+)?$/);
+    const collection = m && STATIC_MAP[m[1]];
+    if (!collection) throw new Error(`No static snapshot for ${path}`);
+    const { pages } = (await staticManifest()).collections[collection];
+    if (m[2] === undefined) {
+      const chunks = await Promise.all(pages.map(p => fetchJson(STATIC_BASE + p.file)));
+      return chunks.flat();
+    }
+    const id = Number(m[2]);
+    const page = pages.find(p => p.first_id <= id && id <= p.last_id);
+    const row = page && (await fetchJson(STATIC_BASE + page.file)).find(r => r.id === id);
+    if (!row) throw new Error('Not found');
+    return row;
+  }
+
   // 자동으로 JSON 폴백 기능 포함
   async function apiGet(path) {
     const isStatic = location.hostname.endsWith('github.io') || location.port === '5500';
     if (isStatic) {
-      // 정적 모드일 때는 data/*.json에서 바로 읽기
-      return fetchJson(STATIC_MAP[path]);
+      // 정적 모드일 때는 data/ 스냅샷에서 바로 읽기
+      return staticGet(path);
     } else {
       // 로컬 개발 모드일 때 Flask API 사용
       return fetchJson(`${API_BASE}${path}`);
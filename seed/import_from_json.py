@@ -162,6 +162,65 @@ def import_districts(conn: sqlite3.Connection, path: Path) -> int:
     sql = "INSERT OR IGNORE INTO districts (id, region_id, name) VALUES (?, ?, ?);"
     return insert_many(conn, sql, payload, "districts")
 
+def import_district_geometry(conn: sqlite3.Connection, path: Path) -> int:
+    """
+    Load district centroids, bounding boxes (R-tree) and postal sectors.
+    Each entry: {"district_id", "lat", "lng", "bbox": [min_lat, min_lng, max_lat, max_lng],
+                 "postal_sectors": ["56", ...]}
+    """
+    rows = load_json(path)
+    geo = [(r["district_id"], r["lat"], r["lng"]) for r in rows]
+    boxes = [(r["district_id"], r["bbox"][0], r["bbox"][2], r["bbox"][1], r["bbox"][3]) for r in rows]
+    sectors = [(s, r["district_id"]) for r in rows for s in r.get("postal_sectors", [])]
+
+    insert_many(conn, "INSERT OR IGNORE INTO district_geo (district_id, lat, lng) VALUES (?, ?, ?);",
+                geo, "district_geo")
+    # rtree virtual tables do not support OR IGNORE on conflicts; REPLACE keeps it idempotent
+    insert_many(conn, "INSERT OR REPLACE INTO district_rtree (id, min_lat, max_lat, min_lng, max_lng) "
+                      "VALUES (?, ?, ?, ?, ?);", boxes, "district_rtree")
+    insert_many(conn, "INSERT OR IGNORE INTO postal_sectors (sector, district_id) VALUES (?, ?);",
+                sectors, "postal_sectors")
+    return len(rows)
+
+def _ensure_math_functions(conn: sqlite3.Connection) -> None:
+    """Register Python fallbacks when SQLite was built without SQLITE_ENABLE_MATH_FUNCTIONS."""
+    try:
+        conn.execute("SELECT asin(sqrt(sin(radians(1))));")
+    except sqlite3.OperationalError:
+        import math
+        for name, fn in (("sin", math.sin), ("cos", math.cos), ("asin", math.asin),
+                         ("sqrt", math.sqrt), ("radians", math.radians)):
+            conn.create_function(name, 1, fn, deterministic=True)
+
+def build_district_distances(conn: sqlite3.Connection) -> int:
+    """
+    Rebuild the district_distances matrix (haversine km between centroids)
+    in one set-based INSERT ... SELECT over district_geo x district_geo.
+    """
+    _ensure_math_functions(conn)
+    cur = conn.cursor()
+    cur.execute("DELETE FROM district_distances;")
+    cur.execute(
+        """
+        INSERT INTO district_distances (from_id, to_id, km, same_region)
+        SELECT a.district_id, b.district_id,
+               CASE WHEN a.district_id = b.district_id THEN 0.0 ELSE
+                 2 * 6371.0088 * asin(sqrt(
+                     sin(radians(b.lat - a.lat) / 2) * sin(radians(b.lat - a.lat) / 2)
+                   + cos(radians(a.lat)) * cos(radians(b.lat))
+                   * sin(radians(b.lng - a.lng) / 2) * sin(radians(b.lng - a.lng) / 2)))
+               END,
+               da.region_id = db.region_id
+        FROM district_geo a
+        JOIN district_geo b
+        JOIN districts da ON da.id = a.district_id
+        JOIN districts db ON db.id = b.district_id;
+        """
+    )
+    conn.commit()
+    print(f"✅ district_distances: rebuilt {cur.rowcount} pairs")
+    return cur.rowcount
+
 def normalize_volunteers(value: Any) -> str:
     """
     Ensure volunteers are serialized as a JSON array string.
@@ -261,6 +320,8 @@ def main():
         import_categories(conn, data_dir / "categories.json")
         import_regions(conn, data_dir / "regions.json")
         import_districts(conn, data_dir / "districts.json")
+        import_district_geometry(conn, data_dir / "district_geometry.json")
+        build_district_distances(conn)
         import_requests(conn, data_dir / "requests.json")
     finally:
         conn.close()
@@ -281,6 +342,8 @@ def run_with_existing_conn(conn, data_dir):
     import_categories(conn, data_dir / "categories.json")
     import_regions(conn, data_dir / "regions.json")
     import_districts(conn, data_dir / "districts.json")
+    import_district_geometry(conn, data_dir / "district_geometry.json")
+    build_district_distances(conn)
     import_requests(conn, data_dir / "requests.json")
     conn.commit()
     print("✅ JSON seeding completed via existing connection.")